@@ -67,6 +67,14 @@ async def get_current_user_id(request: Request) -> str:
         logger.error(f"❌ Unexpected error in get_current_user_id: {str(e)}", exc_info=True)
         raise HTTPException(status_code=401, detail="Authentication error")
 
+def user_id_from_token(token: str) -> Optional[str]:
+    """The user ID in a valid JWT, or None (for callers that can't raise HTTP errors, e.g. WebSockets)."""
+    try:
+        payload = jwt.decode(token.removeprefix("Bearer ").strip(), SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("user_id")
+
 def create_jwt_token(data: dict) -> str:
     """Create a JWT token with the given data."""
     to_encode = data.copy()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from pyserver.api.dependencies import get_storage_context
+from pyserver.api.node.read.children import CHILD_FIELDS
+from pyserver.api.raw_json import raw_json_response
+from pyserver.schemas.batch_read import BatchReadRequest, BatchReadResponse, ReadOp
+from pyserver.schemas.type_properties import get_type_properties_registry
+from pyserver.storage.node_loader import NodeLoader
+from pyserver.storage.projection import parse_fields, project_raw
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+MAX_BATCH_READS = int(os.environ.get("URLIFE_MAX_BATCH_READS", 100))
+
+@lru_cache(maxsize=1)
+def _type_properties_json() -> str:
+    return json.dumps({
+        object_type: properties.model_dump(mode="json")
+        for object_type, properties in get_type_properties_registry().items()
+    })
+
+def _node_id(op: ReadOp) -> str:
+    if not op.node_id:
+        raise HTTPException(status_code=400, detail=f"{op.kind} reads need a node_id")
+    return op.node_id
+
+def _fields(op: ReadOp) -> Optional[frozenset]:
+    try:
+        return parse_fields(op.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _read_node(op: ReadOp, loader: NodeLoader) -> str:
+    fields = _fields(op)
+    raw = await loader.load(_node_id(op))
+    if raw is None:
+        raise HTTPException(status_code=404, detail=f"Node {op.node_id} not found")
+    return raw if fields is None else project_raw(raw, fields)
+
+async def _path_to_root(op: ReadOp, loader: NodeLoader, storage: StorageContext) -> str:
+    node = await loader.load_decoded(_node_id(op))
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Node {op.node_id} not found")
+    parent = node.get("parent")
+    if not parent:
+        return "[]"
+
+    # The whole chain of parent IDs is known up front, so it is fetched in one go
+    chain = await storage.node_storage.generations.chain(parent["parent_id"])
+    steps = []
+    for parent_id, raw in zip(chain, await loader.load_many(chain)):
+        if raw is None:
+            raise HTTPException(status_code=404, detail=f"Parent node {parent_id} not found")
+        steps.append('{"edge_label":' + json.dumps(parent["edge_label"]) + ',"node":' + raw + "}")
+        parent = (await loader.load_decoded(parent_id)).get("parent")
+    return "[" + ",".join(steps) + "]"
+
+async def _children(op: ReadOp, loader: NodeLoader) -> str:
+    if not op.edge_label:
+        raise HTTPException(status_code=400, detail="children reads need an edge_label")
+    fields = _fields(op) or CHILD_FIELDS
+    node = await loader.load_decoded(_node_id(op))
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Node {op.node_id} not found")
+    child_ids = [child["child_id"] for child in (node.get("children") or {}).get(op.edge_label, [])]
+    raw_children = await loader.load_many(child_ids)
+    return "[" + ",".join(project_raw(raw, fields) for raw in raw_children if raw) + "]"
+
+async def _resolve(op: ReadOp, loader: NodeLoader, storage: StorageContext) -> str:
+    if op.kind == "node":
+        return await _read_node(op, loader)
+    if op.kind == "path_to_root":
+        return await _path_to_root(op, loader, storage)
+    if op.kind == "children":
+        return await _children(op, loader)
+    return _type_properties_json()
+
+async def _result(index: int, op: ReadOp, loader: NodeLoader, storage: StorageContext) -> str:
+    op_id = json.dumps(op.id if op.id is not None else str(index))
+    try:
+        result = await _resolve(op, loader, storage)
+    except HTTPException as e:
+        return f'{{"id":{op_id},"status":{e.status_code},"result":null,"error":{json.dumps(str(e.detail))}}}'
+    except Exception as e:
+        logger.error(f"❌ Batch read {op.kind} failed: {str(e)}", exc_info=True)
+        return f'{{"id":{op_id},"status":500,"result":null,"error":{json.dumps(str(e))}}}'
+    return f'{{"id":{op_id},"status":200,"result":{result},"error":null}}'
+
+@router.post("", response_model=BatchReadResponse)
+async def batch_read(
+    request: BatchReadRequest,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Resolve several reads (node, path_to_root, children, type_properties) in
+    one request, e.g. everything a node view needs. Each result has the same
+    shape as the matching single-read endpoint's, with its own status; one
+    failing read doesn't fail the others.
+
+    The reads run concurrently behind one NodeLoader, so a node several reads
+    need is fetched once and independent fetches share round trips. Stored
+    documents are spliced into the response without being decoded.
+    """
+    if len(request.ops) > MAX_BATCH_READS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_READS} reads per batch")
+
+    loader = NodeLoader(storage.node_storage)
+    results: List[str] = await asyncio.gather(*[
+        _result(index, op, loader, storage) for index, op in enumerate(request.ops)
+    ])
+    logger.info(f"📦 Resolved {len(results)} batched reads with {loader.round_trips} node fetches")
+    return raw_json_response('{"results":[' + ",".join(results) + "]}")
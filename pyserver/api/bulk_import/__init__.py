@@ -0,0 +1,43 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_import import ImportProgress, ImportSummary
+from pyserver.storage.node_import import NodeImporter
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("", response_model=ImportSummary)
+async def import_nodes(
+    request: Request,
+    import_id: Optional[str] = Query(None, description="Resume an earlier import, keeping its temp IDs"),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Bulk-create nodes from an NDJSON body, one ImportRecord per line. Records
+    refer to their parent by an earlier record's temp_id or by an existing node
+    ID. Invalid records are skipped and reported; the rest are imported.
+    Progress can be polled at GET /api/import/{import_id} while the upload runs.
+    """
+    importer = NodeImporter(storage, import_id)
+    try:
+        return await importer.run(request.stream())
+    except Exception as e:
+        logger.error(f"❌ Import {importer.import_id} failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Import failed after {importer.summary.imported} nodes (import_id {importer.import_id})"
+        )
+
+@router.get("/{import_id}", response_model=ImportProgress)
+async def get_import_progress(
+    import_id: str,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    progress = await NodeImporter(storage, import_id).progress()
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return progress
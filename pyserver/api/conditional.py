@@ -0,0 +1,41 @@
+import hashlib
+from typing import AbstractSet, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def node_etag(version: Optional[int], raw: str) -> str:
+    """Strong ETag of a stored node: its version, or a digest for unversioned documents."""
+    if version is not None:
+        return f'"v{version}"'
+    return '"h' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def generation_etag(kind: str, generation: int) -> str:
+    return f'"{kind}{generation}"'
+
+
+def projected_etag(etag: str, fields: Optional[AbstractSet[str]]) -> str:
+    """
+    `etag` for a response cut down to `fields`: the same state projected
+    differently is a different body, so it gets a different tag.
+    """
+    if fields is None:
+        return etag
+    digest = hashlib.blake2b(",".join(sorted(fields)).encode(), digest_size=6).hexdigest()
+    return f'{etag[:-1]};f={digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names `etag` (weak comparison, per RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
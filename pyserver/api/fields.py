@@ -0,0 +1,17 @@
+from typing import FrozenSet, Optional
+
+from fastapi import HTTPException, Query
+
+from pyserver.storage.projection import parse_fields
+
+
+def node_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated node fields to return, e.g. caption,object_type (node_id is always included)"
+    )
+) -> Optional[FrozenSet[str]]:
+    """The `fields=` projection of a node-returning endpoint; None for whole nodes."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import FrozenSet, Optional
 import logging
 
+from pyserver.api.conditional import generation_etag, is_not_modified, not_modified, projected_etag
 from pyserver.api.dependencies import get_storage_context
+from pyserver.api.fields import node_fields
+from pyserver.api.raw_json import raw_json_array_response, raw_json_array_responses
+from pyserver.api.streaming import STREAM_BATCH_SIZE, ndjson_response
 from pyserver.storage.storage_context import StorageContext
 from pyserver.system.graph_node import GraphNode
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/list_direct/{folder_id}", response_model=List[GraphNode])
+@router.get(
+    "/list_direct/{folder_id}",
+    responses=raw_json_array_responses(GraphNode, "Stored node documents, trimmed to `fields` if given"),
+)
 async def list_folder_contents(
     folder_id: str,
+    request: Request,
+    fields: Optional[FrozenSet[str]] = Depends(node_fields),
     storage: StorageContext = Depends(get_storage_context)
 ):
     """
@@ -19,29 +28,61 @@ async def list_folder_contents(
 
     Args:
         folder_id (str): The ID of the folder to list contents for
+        fields (Optional[FrozenSet[str]]): Node fields to return, all of them if None
         storage (StorageContext): The storage context dependency
 
     Returns:
         List[GraphNode]: List of GraphNode objects directly contained in the folder
 
+    The ETag follows the folder's direct generation, so a matching If-None-Match
+    is answered with a 304 before any node is read. While the user has buffered
+    updates that aren't flushed yet, responses carry no ETag.
+
     Raises:
         HTTPException: If folder is not found or listing fails
     """
     try:
+        # Read before the listing, so the tag is never newer than the body
+        generation = await storage.node_storage.generations.direct(folder_id)
+        etag = projected_etag(generation_etag("d", generation), fields)
+        # Buffered updates show in the body before they move the generation
+        write_buffer = storage.node_storage.write_buffer
+        if not write_buffer.has_pending(storage.user_id) and is_not_modified(request, etag):
+            return not_modified(etag)
+
         logger.info(f"📁 Listing direct contents of folder: {folder_id}")
         node_ids = await storage.folder_tracker.list_direct(folder_id)
         logger.info(f"✅ Found {len(node_ids)} items in folder {folder_id}")
 
-        nodes: List[GraphNode] = []
-        for node_id in node_ids:
-            try:
-                node = await storage.node_storage.get_node(node_id)
-                nodes.append(node)
-            except Exception as node_error:
-                logger.warning(f"⚠️ Could not load node {node_id}: {str(node_error)}")
+        # Stored documents are spliced into the array without decoding
+        raw_nodes = [raw for raw in await storage.node_storage.read_raw_nodes(list(node_ids), fields) if raw]
+        if len(raw_nodes) < len(node_ids):
+            logger.warning(f"⚠️ Could not load {len(node_ids) - len(raw_nodes)} indexed nodes")
 
-        return nodes
+        response = raw_json_array_response(raw_nodes)
+        if not write_buffer.has_pending(storage.user_id):
+            response.headers["ETag"] = etag
+        return response
 
     except Exception as e:
         logger.error(f"❌ Error listing folder contents: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/list_direct/{folder_id}/stream")
+async def list_folder_contents_stream(
+    folder_id: str,
+    fields: Optional[FrozenSet[str]] = Depends(node_fields),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Stream the *direct* contents of a folder as NDJSON, one stored node
+    document (or its requested `fields`) per line, read and flushed in batches of URLIFE_STREAM_BATCH_SIZE.
+    """
+    try:
+        node_ids = sorted(await storage.folder_tracker.list_direct(folder_id))
+    except Exception as e:
+        logger.error(f"❌ Error listing folder contents: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(f"📤 Streaming {len(node_ids)} nodes from folder {folder_id}")
+    return ndjson_response(storage.node_storage.iter_raw_nodes(node_ids, STREAM_BATCH_SIZE, fields))
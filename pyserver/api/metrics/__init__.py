@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from pyserver.storage.cache.node_cache import node_cache
+from pyserver.storage.cache.search_cache import search_cache
+from pyserver.storage.write_buffer import write_buffer
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Report in-process cache metrics for this worker.
+    """
+    return {
+        "node_cache": node_cache.snapshot(),
+        "write_buffer": write_buffer.snapshot(),
+        "search_cache": search_cache.snapshot(),
+    }
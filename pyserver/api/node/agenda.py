@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from typing import List
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_agenda import AgendaItem, AgendaQuery
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+def _timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def _moment(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+@router.post("", response_model=List[AgendaItem])
+async def agenda(
+    query: AgendaQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Nodes due in a time window, plus spans (start/end) active during it,
+    ordered by time and optionally restricted to a subtree and type.
+    """
+    if query.end < query.start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+
+    try:
+        indexes = storage.node_storage.indexes
+        within_keys = []
+        if query.root_id:
+            within_keys.append(storage.folder_tracker.recursive.key(query.root_id))
+        if query.object_type:
+            within_keys.append(indexes.types.key(query.object_type))
+        start, end = _timestamp(query.start), _timestamp(query.end)
+
+        # (time, node_id, reason, until)
+        entries = []
+        for field in query.due_fields:
+            for node_id, at in await indexes.dates.between(field, start, end, query.limit, within_keys):
+                entries.append((at, node_id, field, None))
+        if query.start_field and query.end_field:
+            spans = await indexes.dates.active(
+                query.start_field, query.end_field, start, end, query.limit, within_keys
+            )
+            for node_id, began, finish in spans:
+                entries.append((began, node_id, "active", finish))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        entries = entries[:query.limit]
+
+        raw_nodes = await storage.node_storage.get_raw_nodes([entry[1] for entry in entries])
+        items = []
+        for (at, _, reason, until), raw in zip(entries, raw_nodes):
+            if not raw:
+                continue
+            node = GraphNode.model_validate_json(raw)
+            items.append(AgendaItem(
+                node_id=node.node_id,
+                caption=node.caption,
+                object_type=node.object_type,
+                reason=reason,
+                at=_moment(at),
+                until=_moment(until) if until is not None else None
+            ))
+        return items
+    except Exception as e:
+        logger.error(f"❌ Agenda query failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Agenda query failed: {str(e)}")
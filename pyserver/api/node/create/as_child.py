@@ -86,7 +86,7 @@ async def create_node_under_label(
             ChildRef(edge_label=req.edge_label, child_id=node_id)
         )
         parent_node.children = children
-        await node_storage.store_node(parent_node)
+        await node_storage.store_node(parent_node, changed_fields=["children"])
 
         logger.info(f"✅ Created node {node_id} under {req.parent_id} via edge '{req.edge_label}'")
 
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_facets import FacetResultNode, NodeFacetQuery, NodeFacetResult
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("", response_model=NodeFacetResult)
+async def filter_nodes(
+    query: NodeFacetQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Filter nodes of one type by checkbox/radio values, optionally under a folder,
+    and count the matches for every value of the type's facet fields.
+    """
+    indexes = storage.node_storage.indexes
+    base_keys = [indexes.types.key(query.object_type)]
+    if query.root_id:
+        base_keys.append(storage.folder_tracker.recursive.key(query.root_id))
+
+    try:
+        node_ids, facets = await indexes.facets.filter(query.object_type, query.filters, base_keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Only the requested page is loaded
+        page = node_ids[query.offset:query.offset + query.limit]
+        raw_nodes = await storage.node_storage.get_raw_nodes(page)
+        nodes = [GraphNode.model_validate_json(raw) for raw in raw_nodes if raw]
+
+        return NodeFacetResult(
+            total=len(node_ids),
+            nodes=[
+                FacetResultNode(
+                    node_id=node.node_id,
+                    caption=node.caption,
+                    object_type=node.object_type,
+                    creation_time=node.creation_time,
+                    extra_properties=node.extra_properties
+                )
+                for node in nodes
+            ],
+            facets=facets
+        )
+    except Exception as e:
+        logger.error(f"❌ Facet filter failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Facet filter failed: {str(e)}")
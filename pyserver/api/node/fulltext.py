@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+import json
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_fulltext import FullTextQuery, FullTextResult, PathEntry
+from pyserver.storage.index.bm25 import term_spans, tokenize
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+async def _paths_from(
+    root_id: Optional[str], nodes: List[GraphNode], storage: StorageContext
+) -> List[List[PathEntry]]:
+    """
+    The path from `root_id` (or the top) down to each node, root first. Parent
+    chains come from the cached folder generation chains, and every ancestor
+    of every node is read in one round trip.
+    """
+    chains = []
+    for node in nodes:
+        chain: List[str] = []
+        if node.parent and node.node_id != root_id:
+            chain = await storage.node_storage.generations.chain(node.parent.parent_id)
+            if root_id in chain:
+                chain = chain[:chain.index(root_id) + 1]
+        chains.append(chain)
+
+    ancestor_ids = list(dict.fromkeys(node_id for chain in chains for node_id in chain))
+    captions = {
+        node_id: json.loads(raw)["caption"]
+        for node_id, raw in zip(ancestor_ids, await storage.node_storage.get_raw_nodes(ancestor_ids))
+        if raw
+    }
+
+    paths = []
+    for node, chain in zip(nodes, chains):
+        path = [PathEntry(node_id=node.node_id, caption=node.caption)]
+        for parent_id in chain:
+            if parent_id not in captions:
+                break
+            path.append(PathEntry(node_id=parent_id, caption=captions[parent_id]))
+        paths.append(list(reversed(path)))
+    return paths
+
+@router.post("", response_model=List[FullTextResult])
+async def fulltext_search(
+    query: FullTextQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    BM25-ranked full-text search over node captions, optionally within a subtree.
+    """
+    try:
+        within_key = storage.folder_tracker.recursive.key(query.root_id) if query.root_id else None
+        ranked = await storage.node_storage.indexes.fulltext.search(query.query, query.limit, within_key)
+
+        raw_nodes = await storage.node_storage.get_raw_nodes([node_id for node_id, _ in ranked])
+        hits = [(GraphNode.model_validate_json(raw), score) for (_, score), raw in zip(ranked, raw_nodes) if raw]
+        paths = await _paths_from(query.root_id, [node for node, _ in hits], storage)
+        terms = set(tokenize(query.query))
+        return [
+            FullTextResult(
+                node_id=node.node_id,
+                caption=node.caption,
+                object_type=node.object_type,
+                score=score,
+                highlights=term_spans(node.caption, terms),
+                path=path
+            )
+            for (node, score), path in zip(hits, paths)
+        ]
+    except Exception as e:
+        logger.error(f"❌ Full-text search failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Full-text search failed: {str(e)}")
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.graph_pattern import BoundNode, GraphPattern, PatternMatchResult
+from pyserver.storage.query.pattern import PatternMatcher
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("", response_model=PatternMatchResult)
+async def match_pattern(
+    pattern: GraphPattern,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Multi-hop pattern match: node variables with type and property predicates,
+    joined by labeled edges, e.g. (d:DECISION)-[Options]->(p:PLAN)-[Outcomes]->(s:STATE).
+    Returns each match as variable -> node.
+    """
+    try:
+        bindings, truncated, trace = await PatternMatcher(storage.user_id).match(pattern)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Pattern match failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Pattern match failed: {str(e)}")
+
+    # Only the returned page is loaded in full
+    node_ids = sorted({node_id for binding in bindings for node_id in binding.values()})
+    raw_nodes = await storage.node_storage.get_raw_nodes(node_ids)
+    nodes = {
+        node_id: GraphNode.model_validate_json(raw)
+        for node_id, raw in zip(node_ids, raw_nodes) if raw
+    }
+
+    return PatternMatchResult(
+        matches=[
+            {
+                var: BoundNode(
+                    node_id=node_id,
+                    caption=nodes[node_id].caption,
+                    object_type=nodes[node_id].object_type
+                )
+                for var, node_id in binding.items()
+            }
+            for binding in bindings
+            if all(node_id in nodes for node_id in binding.values())
+        ],
+        truncated=truncated,
+        plan=trace.steps if pattern.explain else None,
+        round_trips=trace.round_trips if pattern.explain else None
+    )
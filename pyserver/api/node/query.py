@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_query import NodeQuery, NodeQueryResult, QueryResultNode
+from pyserver.storage.query.planner import QueryPlanner
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("", response_model=NodeQueryResult)
+async def query_nodes(
+    query: NodeQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Declarative node query (subtree, type, property predicates, caption, date
+    window, sort, page) run through the index planner. With `explain`, the chosen
+    plan and its round-trip count are returned alongside the results.
+    """
+    try:
+        nodes, total, trace = await QueryPlanner(storage.user_id).run(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Node query failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Node query failed: {str(e)}")
+
+    return NodeQueryResult(
+        nodes=[
+            QueryResultNode(
+                node_id=node.node_id,
+                caption=node.caption,
+                object_type=node.object_type,
+                creation_time=node.creation_time,
+                extra_properties=node.extra_properties
+            )
+            for node in nodes
+        ],
+        total=total,
+        plan=trace.steps if query.explain else None,
+        round_trips=trace.round_trips if query.explain else None
+    )
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_range import NodeRangeQuery, RangeResultNode
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("", response_model=List[RangeResultNode])
+async def range_nodes(
+    query: NodeRangeQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Top-K / range query over a number field (e.g. "attention >= 70"),
+    optionally restricted to a folder's subtree.
+    """
+    within_key = storage.folder_tracker.recursive.key(query.root_id) if query.root_id else None
+
+    try:
+        matches = await storage.node_storage.indexes.numbers.query(
+            query.object_type,
+            query.field,
+            min_value="-inf" if query.min_value is None else query.min_value,
+            max_value="+inf" if query.max_value is None else query.max_value,
+            limit=query.limit,
+            descending=query.descending,
+            within_key=within_key,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        raw_nodes = await storage.node_storage.get_raw_nodes([node_id for node_id, _ in matches])
+        results = []
+        for (_, value), raw in zip(matches, raw_nodes):
+            if not raw:
+                continue
+            node = GraphNode.model_validate_json(raw)
+            results.append(RangeResultNode(
+                node_id=node.node_id,
+                caption=node.caption,
+                object_type=node.object_type,
+                creation_time=node.creation_time,
+                value=value
+            ))
+        return results
+    except Exception as e:
+        logger.error(f"❌ Range query failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Range query failed: {str(e)}")
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from pydantic import BaseModel
+import json
 import logging
 
 from pyserver.storage.storage_context import StorageContext
 from pyserver.api.dependencies import get_storage_context
-from pyserver.storage.node_storage import GraphNode
+from pyserver.api.streaming import STREAM_BATCH_SIZE, ndjson_response
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,17 @@ class ChildNodeResponse(BaseModel):
     object_type: str
     creation_time: Optional[int] = None
 
+# Only these are read out of each child document
+CHILD_FIELDS = frozenset(ChildNodeResponse.model_fields)
+
+async def _child_ids(node_id: str, edge_label: str, storage: StorageContext) -> Optional[List[str]]:
+    """The parent's children under `edge_label`, None if it doesn't exist."""
+    raw, = await storage.node_storage.read_raw_nodes([node_id], fields=["children"])
+    if raw is None:
+        return None
+    children = json.loads(raw).get("children") or {}
+    return [child["child_id"] for child in children.get(edge_label, [])]
+
 @router.get("/{node_id}")
 async def get_children(
     node_id: str,
@@ -27,25 +39,32 @@ async def get_children(
     Get children of a node filtered by edge label.
     """
     try:
-        parent_node: GraphNode = await storage.node_storage.get_node(node_id)
-        if not parent_node:
+        child_ids = await _child_ids(node_id, edge_label, storage)
+        if child_ids is None:
             raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
 
-        children = parent_node.children or {}
-        edge_children = children.get(edge_label, [])
-        child_ids = [child.child_id for child in edge_children]
-
-        child_nodes = []
-        for child_id in child_ids:
-            child = await storage.node_storage.get_node(child_id)
-            if child:
-                child_nodes.append(ChildNodeResponse(
-                    node_id=child.node_id,
-                    caption=child.caption,
-                    object_type=child.object_type,
-                    creation_time=child.creation_time
-                ))
+        raw_children = await storage.node_storage.read_raw_nodes(child_ids, CHILD_FIELDS)
+        child_nodes = [ChildNodeResponse.model_validate_json(raw) for raw in raw_children if raw]
         return child_nodes
     except Exception as e:
         logger.error(f"Error getting children for node {node_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error getting children: {str(e)}")
+
+@router.get("/{node_id}/stream")
+async def get_children_stream(
+    node_id: str,
+    edge_label: str = Query(..., description="The edge label to filter children by"),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Stream the children of a node under one edge label as NDJSON, one
+    ChildNodeResponse per line, loaded in batches.
+    """
+    child_ids = await _child_ids(node_id, edge_label, storage)
+    if child_ids is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+    # Projected documents already have exactly the response's fields
+    return ndjson_response(
+        storage.node_storage.iter_raw_nodes(child_ids, STREAM_BATCH_SIZE, CHILD_FIELDS)
+    )
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
+from pyserver.api.conditional import is_not_modified, node_etag, not_modified, projected_etag
 from pyserver.api.dependencies import get_storage_context
+from pyserver.api.fields import node_fields
+from pyserver.api.raw_json import raw_json_response
+from pyserver.storage.node_storage import stored_version
+from pyserver.storage.projection import project_raw
 from pyserver.storage.storage_context import StorageContext
+from typing import FrozenSet, Optional
 import logging
 logger = logging.getLogger(__name__)
 
@@ -10,13 +15,31 @@ router = APIRouter()
 @router.get("/{node_id}")
 async def read_node(
     node_id: str,
+    request: Request,
+    fields: Optional[FrozenSet[str]] = Depends(node_fields),
     storage: StorageContext = Depends(get_storage_context)
 ):
+    """
+    Return the node's stored JSON as-is (or just the requested `fields`),
+    with an ETag from its version. A matching If-None-Match gets an empty 304.
+    No ETag is sent while buffered updates to the node are unflushed.
+    """
     try:
-        logger.info(f"Attempting to read node with ID: {node_id}")
-        node = await storage.node_storage.get_node(node_id)
-        logger.info(f"Successfully retrieved node: {node.dict()}")
-        return JSONResponse(content=node.dict())
+        logger.debug(f"Attempting to read node with ID: {node_id}")
+        raw, = await storage.node_storage.read_raw_nodes([node_id])
     except ValueError as e:
         logger.error(f"ValueError while reading node {node_id}: {str(e)}")
         raise HTTPException(status_code=404, detail=str(e))
+
+    if raw is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+    # Buffered updates are in the body but not yet in the version
+    buffered = storage.node_storage.write_buffer.has_pending(storage.user_id, node_id)
+    etag = projected_etag(node_etag(stored_version(raw), raw), fields)
+    if not buffered and is_not_modified(request, etag):
+        return not_modified(etag)
+    response = raw_json_response(raw if fields is None else project_raw(raw, fields))
+    if not buffered:
+        response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from typing import List
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.storage.index.related import RelatedNodeIndex
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+RELATED_EDGE_LABEL = "Related"
+
+class RelatedNodeSuggestion(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    score: float
+
+@router.get("/{node_id}", response_model=List[RelatedNodeSuggestion])
+async def suggest_related(
+    node_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Suggest nodes with similar captions as candidates for the `Related` edge,
+    leaving out the ones already linked.
+    """
+    node = await storage.node_storage.get_node(node_id)
+    if not node:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+    try:
+        linked = [child.child_id for child in (node.children or {}).get(RELATED_EDGE_LABEL, [])]
+        similar = await RelatedNodeIndex(storage.user_id).similar(node_id, limit, exclude=linked)
+
+        raw_nodes = await storage.node_storage.get_raw_nodes([other for other, _ in similar])
+        suggestions = []
+        for (_, score), raw in zip(similar, raw_nodes):
+            if not raw:
+                continue
+            other = GraphNode.model_validate_json(raw)
+            suggestions.append(RelatedNodeSuggestion(
+                node_id=other.node_id,
+                caption=other.caption,
+                object_type=other.object_type,
+                score=score
+            ))
+        return suggestions
+    except Exception as e:
+        logger.error(f"❌ Related-node suggestions failed for {node_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Related-node suggestions failed: {str(e)}")
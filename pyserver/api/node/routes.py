@@ -1,6 +1,14 @@
 from fastapi import APIRouter
 from .create import router as create_router
 from .search import router as search_router
+from .facets import router as facets_router
+from .range import router as range_router
+from .typeahead import router as typeahead_router
+from .fulltext import router as fulltext_router
+from .related import router as related_router
+from .agenda import router as agenda_router
+from .query import router as query_router
+from .match import router as match_router
 from .read import router as read_router
 from .read.children import router as children_router
 
@@ -8,3 +16,11 @@ router = APIRouter()
 router.include_router(read_router, prefix="/read", tags=["read"])
 router.include_router(create_router, prefix="/create", tags=["create"])
 router.include_router(search_router, prefix="/search", tags=["search"])
+router.include_router(facets_router, prefix="/facets", tags=["facets"])
+router.include_router(range_router, prefix="/range", tags=["range"])
+router.include_router(typeahead_router, prefix="/typeahead", tags=["typeahead"])
+router.include_router(fulltext_router, prefix="/fulltext", tags=["fulltext"])
+router.include_router(related_router, prefix="/related", tags=["related"])
+router.include_router(agenda_router, prefix="/agenda", tags=["agenda"])
+router.include_router(query_router, prefix="/query", tags=["query"])
+router.include_router(match_router, prefix="/match", tags=["match"])
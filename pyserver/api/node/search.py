@@ -1,49 +1,148 @@
-from fastapi import APIRouter, Depends
-from typing import List
-from rapidfuzz import fuzz
+from fastapi import APIRouter, Depends, HTTPException
+from typing import AsyncIterator, List, Optional, Tuple
 from pyserver.api.dependencies import get_storage_context
+from pyserver.api.streaming import STREAM_BATCH_SIZE, ndjson_response
 from pyserver.schemas.node_search import NodeSearchQuery, SearchResultNode
+from pyserver.storage.cache.search_cache import search_cache
+from pyserver.storage.index.trigram import SEARCH_CANDIDATE_LIMIT, normalize_caption
 from pyserver.storage.storage_context import StorageContext
+from pyserver.system.fuzzy_rank import DEFAULT_SCORER, rank_captions_async
+from pyserver.system.graph_node import GraphNode
 
 router = APIRouter()
 
+def _cache_key(query: NodeSearchQuery, storage: StorageContext) -> Tuple:
+    return (
+        storage.user_id, query.root_id, query.object_type, normalize_caption(query.query),
+        query.limit, query.scorer or DEFAULT_SCORER, query.score_cutoff,
+    )
+
+async def _candidate_ids(query: NodeSearchQuery, storage: StorageContext) -> List[str]:
+    """
+    Nodes of the requested type under the root that share the most caption
+    trigrams with the query, intersected server-side. Never fewer than the
+    requested limit are kept, so large limits aren't cut short by the cap.
+    """
+    indexes = storage.node_storage.indexes
+    constraint_keys = [
+        indexes.types.key(query.object_type),
+        storage.folder_tracker.recursive.key(query.root_id),
+    ]
+    limit = max(query.limit, SEARCH_CANDIDATE_LIMIT)
+    node_ids = await indexes.captions.candidates(normalize_caption(query.query), constraint_keys, limit)
+    if node_ids is None:
+        # Too short for trigrams: every node of the type under the root
+        conn = await storage.node_storage.redis_manager.get_connection()
+        node_ids = list(await conn.sinter(constraint_keys))
+    return node_ids
+
+async def _rank(
+    query: NodeSearchQuery, captions: List[str]
+) -> List[Tuple[int, int]]:
+    return await rank_captions_async(
+        normalize_caption(query.query),
+        captions,
+        query.limit,
+        scorer=query.scorer or DEFAULT_SCORER,
+        score_cutoff=query.score_cutoff,
+    )
+
 @router.post("", response_model=List[SearchResultNode])
 async def search_nodes(
     query: NodeSearchQuery,
     storage: StorageContext = Depends(get_storage_context)
 ):
     try:
-        # 1. Get all descendant node IDs from root folder
-        node_ids = await storage.folder_tracker.list_recursive(query.root_id)
-
-        # 2. Load and filter nodes by object_type
-        filtered = []
-        for node_id in node_ids:
-            node = await storage.node_storage.get_node(node_id)
-            if node and node.object_type == query.object_type:
-                filtered.append(node)
-
-        # 3. Fuzzy rank
-        ranked = sorted(
-            filtered,
-            key=lambda node: fuzz.partial_ratio(query.query.lower(), node.caption.lower()),
-            reverse=True
-        )
+        # 0. Repeat queries are served from cache until the user writes anything
+        cache_key = _cache_key(query, storage)
+        generation = await storage.change_stream.generation()
+        cached = search_cache.get(cache_key, generation)
+        if cached is not None:
+            return cached
+
+        # 1. Candidates by caption trigrams under the root
+        node_ids = await _candidate_ids(query, storage)
+
+        # 2. Load the candidates in one round trip
+        raw_nodes = await storage.node_storage.get_raw_nodes(node_ids)
+        candidates = [GraphNode.model_validate_json(raw) for raw in raw_nodes if raw]
+
+        # 3. Fuzzy rank in one batch, keeping only the top N
+        ranked = await _rank(query, [node.caption for node in candidates])
 
         # 4. Format and return top N results
         results = [
             SearchResultNode(
-                node_id=node.node_id,
-                caption=node.caption,
-                object_type=node.object_type,
-                creation_time=node.creation_time,
-                match_score=fuzz.partial_ratio(query.query.lower(), node.caption.lower())
+                node_id=candidates[position].node_id,
+                caption=candidates[position].caption,
+                object_type=candidates[position].object_type,
+                creation_time=candidates[position].creation_time,
+                match_score=score
             )
-            for node in ranked[:query.limit]
+            for position, score in ranked
         ]
 
+        search_cache.put(cache_key, generation, results)
         return results
 
     except Exception as e:
         # Optionally log error or re-raise
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+@router.post("/stream")
+async def search_nodes_stream(
+    query: NodeSearchQuery,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Same results as POST /search, as NDJSON. Candidates are read in batches
+    keeping only their captions, so large candidate sets and limits don't hold
+    every node in memory; the ranked results are then hydrated and flushed a
+    batch at a time.
+    """
+    try:
+        cache_key = _cache_key(query, storage)
+        generation = await storage.change_stream.generation()
+        cached: Optional[List[SearchResultNode]] = search_cache.get(cache_key, generation)
+        node_ids = [] if cached is not None else await _candidate_ids(query, storage)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+    async def batches() -> AsyncIterator[List[str]]:
+        if cached is not None:
+            for start in range(0, len(cached), STREAM_BATCH_SIZE):
+                yield [result.model_dump_json() for result in cached[start:start + STREAM_BATCH_SIZE]]
+            return
+
+        ids: List[str] = []
+        captions: List[str] = []
+        async for raw_nodes in storage.node_storage.iter_raw_nodes(node_ids, STREAM_BATCH_SIZE):
+            for raw in raw_nodes:
+                node = GraphNode.model_validate_json(raw)
+                ids.append(node.node_id)
+                captions.append(node.caption)
+        ranked = await _rank(query, captions)
+        del captions
+
+        results: List[SearchResultNode] = []
+        for start in range(0, len(ranked), STREAM_BATCH_SIZE):
+            page = ranked[start:start + STREAM_BATCH_SIZE]
+            raw_nodes = await storage.node_storage.get_raw_nodes([ids[position] for position, _ in page])
+            lines = []
+            for raw, (_, score) in zip(raw_nodes, page):
+                if not raw:
+                    continue
+                node = GraphNode.model_validate_json(raw)
+                result = SearchResultNode(
+                    node_id=node.node_id,
+                    caption=node.caption,
+                    object_type=node.object_type,
+                    creation_time=node.creation_time,
+                    match_score=score
+                )
+                results.append(result)
+                lines.append(result.model_dump_json())
+            yield lines
+        search_cache.put(cache_key, generation, results)
+
+    return ndjson_response(batches())
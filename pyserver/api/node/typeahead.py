@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from typing import List
+import logging
+from pyserver.api.dependencies import get_storage_context
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+class TypeaheadResult(BaseModel):
+    node_id: str
+    caption: str
+
+@router.get("", response_model=List[TypeaheadResult])
+async def typeahead(
+    prefix: str = Query("", description="Start of the caption, case-insensitive"),
+    type: str = Query(..., description="Object type to complete from"),
+    limit: int = Query(10, ge=1, le=100),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Autocomplete captions of one type from the prefix index, without loading nodes.
+    """
+    try:
+        matches = await storage.node_storage.indexes.prefixes.complete(type, prefix, limit)
+        return [TypeaheadResult(node_id=node_id, caption=caption) for node_id, caption in matches]
+    except Exception as e:
+        logger.error(f"❌ Typeahead failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Typeahead failed: {str(e)}")
@@ -3,6 +3,7 @@ from .caption import router as caption_router
 from .checkbox import router as checkbox_router
 from .number import router as number_router
 from .radio import router as radio_router
+from .batch import router as batch_router
 
 router = APIRouter()
 
@@ -10,3 +11,4 @@ router.include_router(caption_router, prefix="/caption", tags=["node-update-capt
 router.include_router(checkbox_router, prefix="/checkbox", tags=["node-update-checkbox"])
 router.include_router(number_router, prefix="/number", tags=["node-update-number"])
 router.include_router(radio_router, prefix="/radio", tags=["node-update-radio"])
+router.include_router(batch_router, prefix="/batch", tags=["node-update-batch"])
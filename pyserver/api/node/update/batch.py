@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+import logging
+import os
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.node_batch_update import BatchUpdateRequest, BatchUpdateResult, FieldEdit, FieldEditResult
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.field_edit import FieldEditChanger, validate_field_edit
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+MAX_BATCH_OPS = int(os.environ.get("URLIFE_MAX_BATCH_OPS", 1000))
+
+@router.post("", response_model=BatchUpdateResult)
+async def update_batch(
+    request: BatchUpdateRequest,
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Apply caption/checkbox/radio/number edits across many nodes. Every op is
+    validated against its node's type schema first; the ops for each node are
+    then folded into a single write and all writes go out in one transaction.
+    With `atomic`, one invalid op means nothing is written. Buffered updates
+    to the nodes are flushed before they are read.
+    """
+    if len(request.ops) > MAX_BATCH_OPS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_OPS} ops per batch")
+
+    try:
+        # Group by node, keeping each node's ops in request order
+        by_node: Dict[str, List[int]] = defaultdict(list)
+        for index, op in enumerate(request.ops):
+            by_node[op.node_id].append(index)
+
+        node_ids = list(by_node)
+        # Land buffered updates to these nodes first, so the batch edits (and wins over) them
+        write_buffer = storage.node_storage.write_buffer
+        for node_id in node_ids:
+            if write_buffer.has_pending(storage.user_id, node_id):
+                await write_buffer.flush((storage.user_id, node_id))
+        raw_nodes = await storage.node_storage.get_raw_nodes(node_ids)
+
+        errors: Dict[int, str] = {}
+        edits: Dict[str, List[Tuple[FieldEdit, Any]]] = {}
+        nodes: Dict[str, GraphNode] = {}
+        for node_id, raw in zip(node_ids, raw_nodes):
+            if not raw:
+                for index in by_node[node_id]:
+                    errors[index] = "Node not found"
+                continue
+            node = GraphNode.model_validate_json(raw)
+            for index in by_node[node_id]:
+                op = request.ops[index]
+                try:
+                    edits.setdefault(node_id, []).append((op, validate_field_edit(node.object_type, op)))
+                except ValueError as e:
+                    errors[index] = str(e)
+            if node_id in edits:
+                nodes[node_id] = node
+
+        writes = []
+        aborted = request.atomic and bool(errors)
+        if not aborted:
+            for node_id, node_edits in edits.items():
+                changer = FieldEditChanger(node_edits)
+                changer.change_node(nodes[node_id])
+                writes.append((nodes[node_id], changer.changed_fields()))
+            await storage.node_storage.store_nodes(writes)
+
+    except Exception as e:
+        logger.error(f"❌ Batch update failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Batch update failed")
+
+    if aborted:
+        for index in range(len(request.ops)):
+            errors.setdefault(index, "Not applied: another op in this atomic batch failed")
+    results = [
+        FieldEditResult(index=index, node_id=op.node_id, ok=index not in errors, error=errors.get(index))
+        for index, op in enumerate(request.ops)
+    ]
+    applied = sum(result.ok for result in results)
+    logger.info(f"✅ Batch update: {applied}/{len(results)} ops over {len(writes)} nodes")
+    return BatchUpdateResult(
+        applied=applied,
+        failed=len(results) - applied,
+        nodes_written=len(writes),
+        results=results
+    )
@@ -29,7 +29,7 @@ async def update_caption(
         node.caption = req.new_caption
         node.updated_at = datetime.utcnow().isoformat()
         # node.updated_at = int(time.time())
-        await storage.node_storage.store_node(node)
+        await storage.node_storage.store_node(node, changed_fields=["caption", "updated_at"])
 
         logger.info(f"✅ Caption updated for node: {req.node_id}")
         return {"message": "Caption updated successfully", "node_id": node.node_id}
@@ -5,8 +5,6 @@ from pyserver.storage.storage_context import StorageContext
 from pyserver.schemas.type_properties import get_extra_properties_for_type
 from pyserver.system.graph_node import GraphNode
 import logging
-import time
-from datetime import datetime
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -33,14 +31,8 @@ async def update_checkbox(
         if request.key_name not in valid_keys:
             raise HTTPException(status_code=400, detail=f"Invalid checkbox key: {request.key_name}")
 
-        # Step 3: Update extra_properties
-        if node.extra_properties is None:
-            node.extra_properties = {}
-        node.extra_properties[request.key_name] = request.value
-        node.updated_at = datetime.utcnow().isoformat()
-
-        # Step 4: Store updated node
-        await storage.node_storage.store_node(node)
+        # Step 3: Update extra_properties (coalesced when the write buffer is enabled)
+        await storage.node_storage.update_properties(node.node_id, {request.key_name: request.value})
         logger.info(f"✅ Updated checkbox field '{request.key_name}' for node {node.node_id}")
 
         return {"message": f"Checkbox '{request.key_name}' updated successfully", "node_id": node.node_id}
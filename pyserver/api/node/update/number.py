@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from datetime import datetime
 from pyserver.api.dependencies import get_storage_context
 from pyserver.schemas.type_properties import get_extra_properties_for_type
 from pyserver.storage.storage_context import StorageContext
@@ -34,10 +33,7 @@ async def update_number_field(
         if not (question.min_value <= payload.value <= question.max_value):
             raise HTTPException(status_code=400, detail=f"Value must be between {question.min_value} and {question.max_value}")
 
-        node.extra_properties[payload.field] = payload.value
-        node.updated_at = datetime.utcnow().isoformat()
-
-        await storage.node_storage.store_node(node)
+        await storage.node_storage.update_properties(node.node_id, {payload.field: payload.value})
         return {"status": "success", "message": f"Field '{payload.field}' updated"}
 
     except HTTPException:
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from datetime import datetime
 from pyserver.api.dependencies import get_storage_context
 from pyserver.schemas.type_properties import get_extra_properties_for_type
 from pyserver.storage.storage_context import StorageContext
@@ -51,15 +50,11 @@ async def update_radio_field(
                 detail=f"Invalid value '{payload.value}' for field '{payload.field}'. Valid options: {valid_options}"
             )
 
-        prev_value = node.extra_properties.get(payload.field)
-        node.extra_properties[payload.field] = payload.value
-        node.updated_at = datetime.utcnow().isoformat()
+        prev_value = (node.extra_properties or {}).get(payload.field)
+        logger.info(f"🔁 Updating field '{payload.field}': '{prev_value}' → '{payload.value}'")
 
-        logger.info(f"🔁 Updated field '{payload.field}': '{prev_value}' → '{payload.value}'")
-        logger.info(f"🕒 Updated 'updated_at' to: {node.updated_at}")
-
-        await storage.node_storage.store_node(node)
-        logger.info(f"💾 Node {node.node_id} stored successfully with updated radio value")
+        await storage.node_storage.update_properties(node.node_id, {payload.field: payload.value})
+        logger.info(f"💾 Node {node.node_id} updated with new radio value")
 
         return {
             "status": "success",
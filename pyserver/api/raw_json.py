@@ -0,0 +1,40 @@
+from typing import Any, Dict, Iterable, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def raw_json_response(document: str) -> Response:
+    """Serve an already encoded JSON document without decoding it."""
+    return Response(content=document, media_type=JSON_MEDIA_TYPE)
+
+
+def raw_json_array_response(documents: Iterable[str]) -> Response:
+    """Splice already encoded JSON documents into one JSON array body."""
+    return Response(content="[" + ",".join(documents) + "]", media_type=JSON_MEDIA_TYPE)
+
+
+def raw_json_array_responses(model: Type[BaseModel], description: str) -> Dict[int, Dict[str, Any]]:
+    """
+    OpenAPI `responses` for a raw_json_array_response of stored `model` documents.
+    Stored documents keep the model's field names, not its aliases, so the schema
+    is generated by name with nested models inlined.
+    """
+    schema = model.model_json_schema(by_alias=False)
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {200: {
+        "description": description,
+        "content": {JSON_MEDIA_TYPE: {"schema": {"type": "array", "items": inline(schema)}}},
+    }}
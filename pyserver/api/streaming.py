@@ -0,0 +1,34 @@
+import json
+import logging
+import os
+from typing import AsyncIterator, List
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Nodes read and flushed per chunk by the streaming endpoints
+STREAM_BATCH_SIZE = int(os.environ.get("URLIFE_STREAM_BATCH_SIZE", 500))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_response(batches: AsyncIterator[List[str]]) -> StreamingResponse:
+    """
+    Stream batches of JSON documents as NDJSON, one chunk per batch.
+
+    The next batch is only produced once the previous chunk has been handed to
+    the server, so a slow client holds the reads back instead of the server
+    buffering the listing. The status is sent before the first batch; a failure
+    mid-stream ends the body with an {"error": ...} line.
+    """
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for batch in batches:
+                if batch:
+                    yield "\n".join(batch) + "\n"
+        except Exception as e:
+            logger.error(f"❌ Stream aborted: {str(e)}", exc_info=True)
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
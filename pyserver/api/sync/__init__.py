@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from .changes import router as changes_router
+from .push import router as push_router
+
+router = APIRouter()
+
+router.include_router(changes_router, tags=["sync"])
+router.include_router(push_router, tags=["sync"])
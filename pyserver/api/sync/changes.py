@@ -0,0 +1,78 @@
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.sync import SyncChangesResponse
+from pyserver.storage.change_stream import ChangeOp, INITIAL_CURSOR, parse_cursor
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/cursor")
+async def get_sync_cursor(
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Return the newest change cursor. Read it *before* a full sync, then poll
+    /changes with it to pick up anything that happened since.
+    """
+    return {"cursor": await storage.change_stream.latest_cursor()}
+
+@router.get("/changes", response_model=SyncChangesResponse)
+async def get_changes_since(
+    since: str = Query(INITIAL_CURSOR, description="Cursor returned by the previous sync"),
+    limit: int = Query(500, ge=1, le=5000),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Return the node and folder index changes after `since`, plus the current
+    data of every node created or updated in this batch.
+
+    If the cursor is older than the retained history, `full_resync_required` is
+    set and the client must reload (e.g. via list_recursive) from the returned cursor.
+    """
+    try:
+        parse_cursor(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {since}")
+
+    try:
+        changes = storage.change_stream
+        if await changes.cursor_expired(since):
+            logger.info(f"⏪ Cursor {since} expired for user {storage.user_id}, full resync required")
+            return SyncChangesResponse(
+                cursor=await changes.latest_cursor(),
+                changes=[],
+                nodes={},
+                has_more=False,
+                full_resync_required=True,
+            )
+
+        records, has_more = await changes.read_since(since, limit)
+
+        # Hydrate each touched node once, with a single HMGET
+        upserted = list(dict.fromkeys(
+            r.node_id for r in records if r.op in (ChangeOp.CREATE, ChangeOp.UPDATE)
+        ))
+        raw_nodes = await storage.node_storage.get_raw_nodes(upserted)
+        nodes = {
+            node_id: json.loads(raw) if raw else None
+            for node_id, raw in zip(upserted, raw_nodes)
+        }
+
+        logger.info(f"🔄 Returning {len(records)} changes after {since} for user {storage.user_id}")
+        return SyncChangesResponse(
+            cursor=records[-1].cursor if records else since,
+            changes=records,
+            nodes=nodes,
+            has_more=has_more,
+            full_resync_required=False,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error reading change stream: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
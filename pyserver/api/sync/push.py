@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from pyserver.api.auth.auth import user_id_from_token
+from pyserver.api.dependencies import get_storage_context
+from pyserver.schemas.push import PushEvent
+from pyserver.storage.change_push import PushSubscription, change_push_hub
+from pyserver.storage.change_stream import parse_cursor
+from pyserver.storage.storage_context import StorageContext
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Comment lines sent on idle event streams so proxies don't time them out
+PUSH_KEEPALIVE_SECONDS = float(os.environ.get("URLIFE_PUSH_KEEPALIVE_SECONDS", 25))
+
+def _valid_cursor(cursor: Optional[str]) -> bool:
+    try:
+        cursor is None or parse_cursor(cursor)
+    except ValueError:
+        return False
+    return True
+
+def _sse(event: PushEvent) -> str:
+    name = "resync" if event.resync_required else "changes"
+    return f"id: {event.cursor}\nevent: {name}\ndata: {event.model_dump_json()}\n\n"
+
+@router.get("/events")
+async def push_events(
+    request: Request,
+    root: List[str] = Query([], description="Only push changes under these folders/nodes (repeatable)"),
+    since: Optional[str] = Query(None, description="Resume after this cursor; Last-Event-ID works too"),
+    storage: StorageContext = Depends(get_storage_context)
+):
+    """
+    Server-Sent Events stream of the user's node and folder changes: one
+    `changes` event per burst (see PushEvent), or a `resync` event when the
+    client fell too far behind and must catch up via /changes. Each event's
+    id is its cursor, so EventSource reconnects resume where they left off.
+    """
+    since = since or request.headers.get("last-event-id")
+    if not _valid_cursor(since):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {since}")
+    user_id = storage.user_id
+
+    async def body() -> AsyncIterator[str]:
+        subscription = await change_push_hub.subscribe(user_id, root, since)
+        try:
+            yield ": connected\n\n"
+            while True:
+                # The next event is only taken once the last one was sent, so a
+                # slow client's changes pile up (merged) in its subscription
+                event = await subscription.next_event(PUSH_KEEPALIVE_SECONDS)
+                if subscription.closed:
+                    return
+                yield ": keepalive\n\n" if event is None else _sse(event)
+        finally:
+            change_push_hub.unsubscribe(user_id, subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _close_on_disconnect(websocket: WebSocket, subscription: PushSubscription) -> None:
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        subscription.close()
+
+@router.websocket("/ws")
+async def push_websocket(
+    websocket: WebSocket,
+    root: List[str] = Query([]),
+    since: Optional[str] = Query(None),
+    token: Optional[str] = Query(None, description="JWT, for clients that can't send an Authorization header"),
+):
+    """
+    The same events as /events over a WebSocket, one PushEvent JSON per text
+    message. Messages from the client are ignored.
+    """
+    user_id = user_id_from_token(token or websocket.headers.get("authorization", ""))
+    if user_id is None or not _valid_cursor(since):
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    subscription = await change_push_hub.subscribe(user_id, root, since)
+    disconnect = asyncio.create_task(_close_on_disconnect(websocket, subscription))
+    try:
+        while (event := await subscription.next_event()) is not None:
+            await websocket.send_text(event.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnect.cancel()
+        change_push_hub.unsubscribe(user_id, subscription)
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from pyserver.storage.backend import LogBackend, MemoryBackend, SqliteBackend, use_backend
+
+# memory (default), sqlite, log, or redis to run the suite against a live Redis
+TEST_BACKEND = os.environ.get("URLIFE_TEST_BACKEND", "memory")
+
+
+@pytest.fixture(autouse=True)
+def storage_backend(tmp_path):
+    """Give every test a fresh embedded engine unless Redis was asked for."""
+    if TEST_BACKEND == "redis":
+        yield None
+        return
+    if TEST_BACKEND == "sqlite":
+        backend = SqliteBackend(str(tmp_path / "urlife.db"))
+    elif TEST_BACKEND == "log":
+        backend = LogBackend(str(tmp_path / "log-backend"), MemoryBackend())
+    else:
+        backend = MemoryBackend()
+    use_backend(backend)
+    yield backend
+    use_backend(None)
+    if isinstance(backend, (SqliteBackend, LogBackend)):
+        backend.shutdown()
@@ -10,6 +10,13 @@ from pyserver.api.node import router as node_router
 from pyserver.api.node.update import router as node_update_router
 from pyserver.api.schema import router as schema_router
 from pyserver.api.schema.type_properties import router as type_properties_router
+from pyserver.api.metrics import router as metrics_router
+from pyserver.api.sync import router as sync_router
+from pyserver.api.bulk_import import router as import_router
+from pyserver.api.batch import router as batch_router
+from pyserver.storage.cache.invalidation import CacheInvalidationListener
+from pyserver.storage.change_push import change_push_hub
+from pyserver.storage.write_buffer import write_buffer
 
 from pyserver.api.dependencies import get_storage_context  # ✅ this gets user_id from JWT
 
@@ -23,6 +30,26 @@ logger = logging.getLogger(__name__)
 # Initialize FastAPI app
 app = FastAPI(title="URLife API")
 
+cache_invalidation_listener = CacheInvalidationListener()
+
+@app.on_event("startup")
+async def start_node_cache():
+    await cache_invalidation_listener.start()
+
+@app.on_event("shutdown")
+async def stop_node_cache():
+    # Buffered writes must land before the process exits
+    await write_buffer.flush_all()
+    await cache_invalidation_listener.stop()
+
+@app.on_event("startup")
+async def start_change_push():
+    await change_push_hub.start()
+
+@app.on_event("shutdown")
+async def stop_change_push():
+    await change_push_hub.stop()
+
 @app.on_event("startup")
 async def print_routes():
     logger.info("📋 Registered Routes:")
@@ -47,3 +74,7 @@ app.include_router(node_router, prefix="/api/node", tags=["node"])
 app.include_router(node_update_router, prefix="/api/node/update", tags=["node-update"])
 app.include_router(schema_router, prefix="/api/schema", tags=["schema"])
 app.include_router(type_properties_router, prefix="/api", tags=["type_properties"])
+app.include_router(metrics_router, prefix="/api", tags=["metrics"])
+app.include_router(sync_router, prefix="/api/sync", tags=["sync"])
+app.include_router(import_router, prefix="/api/import", tags=["import"])
+app.include_router(batch_router, prefix="/api/batch", tags=["batch"])
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, List, Literal, Optional
+
+class ReadOp(BaseModel):
+    # Echoed back on the result; defaults to the op's position
+    id: Optional[str] = None
+    kind: Literal["node", "path_to_root", "children", "type_properties"]
+    # Required for every kind but type_properties
+    node_id: Optional[str] = None
+    # Required for children
+    edge_label: Optional[str] = None
+    # Comma-separated projection, as `fields=` on the read endpoints (node and children)
+    fields: Optional[str] = None
+
+class BatchReadRequest(BaseModel):
+    ops: List[ReadOp]
+
+class ReadResult(BaseModel):
+    id: str
+    status: int
+    # Same shape as the matching single-read endpoint's response
+    result: Any = None
+    error: Optional[str] = None
+
+class BatchReadResponse(BaseModel):
+    results: List[ReadResult]
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pyserver.schemas.node_query import PropertyPredicate, QueryPlanStep
+
+class PatternNode(BaseModel):
+    var: str
+    object_type: Optional[str] = None
+    where: List[PropertyPredicate] = []
+
+class PatternEdge(BaseModel):
+    # (source)-[label]->(target): target is in source's children under label
+    source: str
+    label: str
+    target: str
+
+class GraphPattern(BaseModel):
+    nodes: List[PatternNode]
+    edges: List[PatternEdge]
+    # Restrict every bound node to this folder's subtree
+    root_id: Optional[str] = None
+    limit: int = 50
+    explain: bool = False
+
+class BoundNode(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+
+class PatternMatchResult(BaseModel):
+    matches: List[Dict[str, BoundNode]]
+    truncated: bool = False
+    plan: Optional[List[QueryPlanStep]] = None
+    round_trips: Optional[int] = None
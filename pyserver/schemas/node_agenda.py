@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class AgendaQuery(BaseModel):
+    start: datetime
+    end: datetime
+    # Date fields whose value falls inside the window
+    due_fields: List[str] = ["due"]
+    # Start/end fields of spans that overlap the window; skipped when unset
+    start_field: Optional[str] = "start"
+    end_field: Optional[str] = "end"
+    # Restrict to nodes under this folder and/or of this type
+    root_id: Optional[str] = None
+    object_type: Optional[str] = None
+    limit: int = 100
+
+class AgendaItem(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    # The due field that matched, or "active" for an overlapping span
+    reason: str
+    at: datetime
+    until: Optional[datetime] = None
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, List, Literal, Optional
+
+class FieldEdit(BaseModel):
+    node_id: str
+    kind: Literal["caption", "checkbox", "radio", "number"]
+    # Property key; ignored for caption edits
+    field: Optional[str] = None
+    value: Any
+
+class BatchUpdateRequest(BaseModel):
+    ops: List[FieldEdit]
+    # Apply nothing if any op fails validation
+    atomic: bool = False
+
+class FieldEditResult(BaseModel):
+    index: int
+    node_id: str
+    ok: bool
+    error: Optional[str] = None
+
+class BatchUpdateResult(BaseModel):
+    applied: int
+    failed: int
+    nodes_written: int
+    results: List[FieldEditResult]
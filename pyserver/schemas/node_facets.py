@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Union
+
+class NodeFacetQuery(BaseModel):
+    object_type: str
+    # Restrict to nodes under this folder; all of the user's nodes when unset
+    root_id: Optional[str] = None
+    # Field -> required value (checkbox booleans or radio option values), ANDed
+    filters: Dict[str, Union[bool, str]] = {}
+    limit: int = 50
+    offset: int = 0
+
+class FacetResultNode(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    creation_time: Optional[int] = None
+    extra_properties: Optional[Dict] = None
+
+class NodeFacetResult(BaseModel):
+    total: int
+    nodes: List[FacetResultNode]
+    # Field -> value -> number of matching nodes that also have that value
+    facets: Dict[str, Dict[str, int]]
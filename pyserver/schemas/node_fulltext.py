@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional, Tuple
+
+class FullTextQuery(BaseModel):
+    query: str
+    # Restrict to nodes under this folder; all of the user's nodes when unset
+    root_id: Optional[str] = None
+    limit: int = 10
+
+class PathEntry(BaseModel):
+    node_id: str
+    caption: str
+
+class FullTextResult(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    score: float
+    # (start, end) character offsets of the matching terms in the caption
+    highlights: List[Tuple[int, int]]
+    # From the search root (or the top of the tree) down to the matching node
+    path: List[PathEntry]
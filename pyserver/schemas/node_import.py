@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class ImportRecord(BaseModel):
+    """One NDJSON line of an import."""
+    # Client-assigned ID, unique within the import
+    temp_id: str
+    object_type: str
+    caption: str
+    # temp_id of an earlier record, or the ID of an existing node
+    parent: str
+    # Required under non-folder parents; folders always use CHILDREN
+    edge_label: Optional[str] = None
+    extra_properties: Dict[str, Any] = {}
+    creation_time: Optional[int] = None
+
+class ImportRecordError(BaseModel):
+    line: int
+    temp_id: Optional[str] = None
+    error: str
+
+class ImportProgress(BaseModel):
+    import_id: str
+    status: str
+    received: int = 0
+    imported: int = 0
+    failed: int = 0
+
+class ImportSummary(ImportProgress):
+    # The first errors only; `failed` has the full count
+    errors: List[ImportRecordError] = []
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional, Union
+from datetime import datetime
+
+class PropertyPredicate(BaseModel):
+    field: str
+    # eq works on checkbox/radio/number fields; the rest on number fields
+    op: Literal["eq", "gt", "gte", "lt", "lte", "between"] = "eq"
+    value: Union[bool, float, str]
+    # Upper bound for "between"
+    value_to: Optional[float] = None
+
+class DateWindow(BaseModel):
+    field: str
+    start: datetime
+    end: datetime
+
+class QuerySort(BaseModel):
+    # A number field of the type or a date field
+    field: str
+    descending: bool = True
+
+class NodeQuery(BaseModel):
+    root_id: Optional[str] = None
+    object_type: Optional[str] = None
+    where: List[PropertyPredicate] = []
+    caption: Optional[str] = None
+    date: Optional[DateWindow] = None
+    sort: Optional[QuerySort] = None
+    limit: int = 50
+    offset: int = 0
+    explain: bool = False
+
+class QueryResultNode(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    creation_time: Optional[int] = None
+    extra_properties: Optional[Dict] = None
+
+class QueryPlanStep(BaseModel):
+    step: str
+    detail: Dict[str, Any] = {}
+
+class NodeQueryResult(BaseModel):
+    nodes: List[QueryResultNode]
+    # Known when the plan materialised every match, otherwise None
+    total: Optional[int] = None
+    plan: Optional[List[QueryPlanStep]] = None
+    round_trips: Optional[int] = None
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class NodeRangeQuery(BaseModel):
+    object_type: str
+    field: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    # Restrict to nodes under this folder; all of the user's nodes when unset
+    root_id: Optional[str] = None
+    limit: int = 20
+    descending: bool = True
+
+class RangeResultNode(BaseModel):
+    node_id: str
+    caption: str
+    object_type: str
+    creation_time: Optional[int] = None
+    value: float
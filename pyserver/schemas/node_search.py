@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 class NodeSearchQuery(BaseModel):
@@ -7,6 +7,10 @@ class NodeSearchQuery(BaseModel):
     object_type: str
     query: str
     limit: int = 10
+    # Server default (URLIFE_SEARCH_SCORER) when unset
+    scorer: Optional[Literal["partial_ratio", "token_set_ratio", "WRatio"]] = None
+    # Drop matches scoring below this (0-100)
+    score_cutoff: int = 0
 
 class SearchResultNode(BaseModel):
     node_id: str
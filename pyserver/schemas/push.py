@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List
+from pyserver.storage.change_stream import ChangeRecord
+
+class PushEvent(BaseModel):
+    # Resume point: pass it back as Last-Event-ID / `since` after a reconnect
+    cursor: str
+    # At most one entry per node (and per folder membership), bursts merged
+    changes: List[ChangeRecord]
+    # Changes were dropped; catch up via /api/sync/changes from the last cursor seen
+    resync_required: bool = False
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Any
+from pyserver.storage.change_stream import ChangeRecord
+
+class SyncChangesResponse(BaseModel):
+    cursor: str
+    changes: List[ChangeRecord]
+    nodes: Dict[str, Optional[Dict[str, Any]]]
+    has_more: bool
+    full_resync_required: bool
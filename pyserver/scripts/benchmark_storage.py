@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import asyncio
+import argparse
+import logging
+import time
+from typing import Awaitable, Callable, List
+
+from pyserver.storage.backend import LogBackend, MemoryBackend, SqliteBackend, use_backend
+from pyserver.storage.node_factory import create_node_under_folder
+from pyserver.storage.storage_context import StorageContext
+
+# Storage logs every operation at INFO, which would dominate the timings
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BENCHMARK_USER_ID = "benchmark_user"
+
+
+async def timed(label: str, count: int, step: Callable[[int], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    for i in range(count):
+        await step(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count:>7} ops  {elapsed:8.3f}s  {count / elapsed:10.0f} ops/s")
+
+
+async def run_benchmark(backend: str, nodes: int, folders: int, sqlite_path: str, log_dir: str):
+    if backend == "memory":
+        use_backend(MemoryBackend())
+    elif backend == "sqlite":
+        use_backend(SqliteBackend(sqlite_path))
+    elif backend == "log":
+        use_backend(LogBackend(log_dir, MemoryBackend()))
+
+    storage = StorageContext(user_id=BENCHMARK_USER_ID)
+    await storage.node_storage.clear_all_nodes()
+    await storage.folder_tracker.clear_all_indexes()
+
+    print(f"Backend: {backend}")
+    root_id = await storage.folder_storage.create_folder("benchmark_root")
+    folder_ids: List[str] = [root_id]
+
+    async def create_folder(i: int) -> None:
+        folder = await create_node_under_folder(storage, root_id, "FOLDER", f"Folder {i}")
+        folder_ids.append(folder.node_id)
+
+    node_ids: List[str] = []
+
+    async def create_node(i: int) -> None:
+        folder_id = folder_ids[i % len(folder_ids)]
+        node = await create_node_under_folder(storage, folder_id, "GOAL", f"Goal {i}")
+        node_ids.append(node.node_id)
+
+    async def read_node(i: int) -> None:
+        await storage.node_storage.get_node(node_ids[i % len(node_ids)])
+
+    async def update_node(i: int) -> None:
+        await storage.node_storage.update_properties(node_ids[i % len(node_ids)], {"attention": i})
+
+    async def list_recursive(i: int) -> None:
+        ids = await storage.folder_tracker.list_recursive(root_id)
+        await storage.node_storage.get_raw_nodes(list(ids))
+
+    async def read_all(i: int) -> None:
+        await storage.node_storage.get_all_nodes()
+
+    async def list_contents(i: int) -> None:
+        await storage.folder_storage.list_folder_contents(folder_ids[i % len(folder_ids)])
+
+    try:
+        await timed("create folder", folders, create_folder)
+        await timed("create node", nodes, create_node)
+        await timed("read node", nodes, read_node)
+        await timed("update property", nodes, update_node)
+        await timed("list recursive (root)", 10, list_recursive)
+        await timed("list folder contents", folders, list_contents)
+        await timed("get all nodes", 3, read_all)
+    finally:
+        await storage.node_storage.clear_all_nodes()
+        await storage.folder_tracker.clear_all_indexes()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark node storage against a storage backend.")
+    parser.add_argument("--backend", choices=["memory", "redis", "sqlite", "log"], default="memory", help="Storage engine")
+    parser.add_argument("--nodes", type=int, default=2000, help="Number of nodes to create")
+    parser.add_argument("--folders", type=int, default=20, help="Number of folders to spread nodes over")
+    parser.add_argument("--sqlite-path", default="benchmark.db", help="Database file for the sqlite engine")
+    parser.add_argument("--log-dir", default="benchmark-log", help="Segment directory for the log engine")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.backend, args.nodes, args.folders, args.sqlite_path, args.log_dir))
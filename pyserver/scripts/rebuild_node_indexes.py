@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+import asyncio
+import argparse
+import logging
+from pyserver.storage.storage_context import StorageContext
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run_rebuild_node_indexes(user_id: str):
+    try:
+        storage = StorageContext(user_id=user_id)
+        count = await storage.node_storage.rebuild_indexes()
+        logger.info(f"📦 Reindexed {count} nodes for user {user_id}")
+
+    except Exception as e:
+        logger.error(f"❌ Failed to rebuild node indexes: {e}", exc_info=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the secondary node indexes (type, caption trigrams) for a user.")
+    parser.add_argument("user_id", help="User ID whose indexes to rebuild")
+    args = parser.parse_args()
+
+    asyncio.run(run_rebuild_node_indexes(args.user_id))
@@ -0,0 +1,83 @@
+import logging
+import os
+from typing import Optional
+
+from pyserver.storage.backend.log import LogBackend, NodeLog
+from pyserver.storage.backend.memory import MemoryBackend
+from pyserver.storage.backend.protocol import Pipeline, PubSub, Script, StorageBackend, TreeQueries
+from pyserver.storage.backend.redis_backend import RedisBackend
+from pyserver.storage.backend.sqlite import SqliteBackend
+
+logger = logging.getLogger(__name__)
+
+# "redis" (default), or "memory" / "sqlite" / "log" for single-process deployments
+STORAGE_BACKEND = os.environ.get("URLIFE_STORAGE_BACKEND", "redis")
+SQLITE_PATH = os.environ.get("URLIFE_SQLITE_PATH", "urlife.db")
+LOG_DIR = os.environ.get("URLIFE_LOG_DIR", "urlife-log")
+# Where the log engine keeps everything but nodes
+LOG_BASE_BACKEND = os.environ.get("URLIFE_LOG_BASE_BACKEND", "redis")
+
+# In-process engines hold the data itself, so every caller must share one instance
+_shared_backend: Optional[StorageBackend] = None
+
+
+def _redis_client() -> RedisBackend:
+    return RedisBackend(
+        host='localhost',
+        port=6379,
+        db=0,
+        decode_responses=True  # Automatically returns str instead of bytes
+    )
+
+
+def _open_in_process(name: str) -> Optional[StorageBackend]:
+    if name == "memory":
+        logger.info("🧠 Using the in-memory storage backend")
+        return MemoryBackend()
+    if name == "sqlite":
+        return SqliteBackend(SQLITE_PATH)
+    if name == "log":
+        base = _open_in_process(LOG_BASE_BACKEND) or _redis_client()
+        return LogBackend(LOG_DIR, base)
+    return None
+
+
+def shared_backend() -> Optional[StorageBackend]:
+    """The process-wide backend, if an in-process engine is in use."""
+    global _shared_backend
+    if _shared_backend is None:
+        _shared_backend = _open_in_process(STORAGE_BACKEND)
+    return _shared_backend
+
+
+def use_backend(backend: Optional[StorageBackend]) -> None:
+    """Route every storage class to `backend`. None restores the configured engine."""
+    global _shared_backend
+    _shared_backend = backend
+
+
+def create_backend() -> StorageBackend:
+    """Return the backend a new RedisManager should talk to."""
+    backend = shared_backend()
+    if backend is not None:
+        return backend
+    if STORAGE_BACKEND != "redis":
+        raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND!r}")
+    return _redis_client()
+
+
+__all__ = [
+    "LogBackend",
+    "MemoryBackend",
+    "NodeLog",
+    "Pipeline",
+    "PubSub",
+    "RedisBackend",
+    "Script",
+    "SqliteBackend",
+    "StorageBackend",
+    "TreeQueries",
+    "create_backend",
+    "shared_backend",
+    "use_backend",
+]
@@ -0,0 +1,592 @@
+import asyncio
+import fcntl
+import fnmatch
+import logging
+import mmap
+import os
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from pyserver.storage.backend.protocol import Script, StorageBackend, is_node_hash
+
+logger = logging.getLogger(__name__)
+
+LOG_SEGMENT_BYTES = int(os.environ.get("URLIFE_LOG_SEGMENT_MB", 64)) * 1024 * 1024
+# Sealed segments with at least this share of superseded bytes get compacted
+LOG_COMPACTION_GARBAGE_RATIO = float(os.environ.get("URLIFE_LOG_COMPACTION_GARBAGE_RATIO", 0.5))
+# "interval" flushes dirty pages every LOG_FLUSH_INTERVAL_SECONDS; "always" after every write
+LOG_FSYNC = os.environ.get("URLIFE_LOG_FSYNC", "interval")
+LOG_FLUSH_INTERVAL_SECONDS = float(os.environ.get("URLIFE_LOG_FLUSH_INTERVAL_SECONDS", 1.0))
+
+# crc32, kind, key length, field length, value length; followed by key, field and value
+RECORD_HEADER = struct.Struct("<IBHHI")
+PUT, DELETE = 1, 2
+
+SEGMENT_NAME = re.compile(r"^segment-(\d{8})\.log$")
+# Held (flock) by the one process that has the directory open
+LOCK_NAME = "LOCK"
+
+# Index entry: (segment id, value offset, value length, record length)
+Location = Tuple[int, int, int, int]
+
+
+@dataclass
+class _Segment:
+    segment_id: int
+    path: str
+    file: Any
+    mm: mmap.mmap
+    end: int = 0
+    live_bytes: int = 0
+    # Tombstones that may still hide a value in an older segment
+    tombstone_bytes: int = 0
+    sealed: bool = False
+
+    @property
+    def size(self) -> int:
+        return len(self.mm)
+
+    def close(self) -> None:
+        self.mm.close()
+        self.file.close()
+
+
+@dataclass
+class _Record:
+    kind: int
+    key: str
+    field: str
+    offset: int
+    value_offset: int
+    value_length: int
+    length: int
+
+
+class NodeLog:
+    def __init__(self, directory: str, segment_bytes: int = LOG_SEGMENT_BYTES):
+        """
+        Append-only, memory-mapped log of node hash entries.
+
+        Every write appends a checksummed record to the active segment; an in-RAM
+        index maps (hash key, field) to the latest record. Reads slice the mapped
+        segment through a memoryview, so a node costs one decode and no syscalls.
+        Superseded records are reclaimed by compacting sealed segments in the
+        background. On open, segments are rescanned in order to rebuild the index;
+        a torn record at the tail ends the scan. Only one process can have a
+        directory open at a time.
+
+        Args:
+            directory: Where segment files live, created if missing
+            segment_bytes: Preallocated size of each segment file
+
+        Raises:
+            RuntimeError: If another process already has the directory open
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segments: Dict[int, _Segment] = {}
+        self.index: Dict[str, Dict[str, Location]] = {}
+        # (key, field) -> (segment id, offset, record length) of deleted fields' tombstones
+        self.tombstones: Dict[Tuple[str, str], Tuple[int, int, int]] = {}
+        self.active: Optional[_Segment] = None
+        self._dirty = False
+        self._worker: Optional[asyncio.Task] = None
+        os.makedirs(directory, exist_ok=True)
+        self._lock = self._lock_directory()
+        self._recover()
+
+    def _lock_directory(self) -> Any:
+        # Two processes appending to the same segments would corrupt each other's records
+        lock = open(os.path.join(self.directory, LOCK_NAME), "a+b")
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            raise RuntimeError(
+                f"Node log {self.directory} is already open in another process; "
+                "every worker needs its own URLIFE_LOG_DIR"
+            )
+        return lock
+
+    # Segments
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment_id:08d}.log")
+
+    def _open_segment(self, segment_id: int, size: Optional[int] = None) -> _Segment:
+        path = self._segment_path(segment_id)
+        file = open(path, "r+b" if size is None else "w+b")
+        if size is not None:
+            file.truncate(size)
+        segment = _Segment(segment_id, path, file, mmap.mmap(file.fileno(), 0))
+        self.segments[segment_id] = segment
+        return segment
+
+    def _roll(self, needed: int) -> None:
+        """Seal the active segment and start a new one with room for `needed` bytes."""
+        if self.active is not None:
+            self.active.mm.flush()
+            self.active.sealed = True
+        next_id = max(self.segments, default=0) + 1
+        self.active = self._open_segment(next_id, max(self.segment_bytes, needed))
+
+    def _records(self, segment: _Segment, stop: Optional[int] = None) -> Iterator[_Record]:
+        """Decode valid records from the start of a segment, stopping at the first bad one."""
+        offset, limit = 0, segment.size if stop is None else stop
+        mm = segment.mm
+        while offset + RECORD_HEADER.size <= limit:
+            crc, kind, key_length, field_length, value_length = RECORD_HEADER.unpack_from(mm, offset)
+            if kind not in (PUT, DELETE):
+                return
+            body = offset + RECORD_HEADER.size
+            value_offset = body + key_length + field_length
+            end = value_offset + value_length
+            if end > limit or zlib.crc32(mm[offset + 4:end]) != crc:
+                return
+            yield _Record(
+                kind=kind,
+                key=mm[body:body + key_length].decode(),
+                field=mm[body + key_length:value_offset].decode(),
+                offset=offset,
+                value_offset=value_offset,
+                value_length=value_length,
+                length=end - offset,
+            )
+            offset = end
+
+    def _recover(self) -> None:
+        segment_ids = sorted(
+            int(match.group(1))
+            for match in map(SEGMENT_NAME.match, os.listdir(self.directory))
+            if match
+        )
+        for segment_id in segment_ids:
+            segment = self._open_segment(segment_id)
+            segment.sealed = True
+            for record in self._records(segment):
+                self._apply(segment, record)
+                segment.end = record.offset + record.length
+
+        if segment_ids:
+            last = self.segments[segment_ids[-1]]
+            if last.end < last.size and last.mm[last.end] != 0:
+                # Torn write from a crash: clear it so the next scan stops cleanly
+                last.mm[last.end:] = bytes(last.size - last.end)
+                logger.warning(f"⚠️ Truncated torn record in {last.path} at offset {last.end}")
+            last.sealed = False
+            self.active = last
+        else:
+            self._roll(0)
+
+        logger.info(
+            f"📜 Recovered node log from {len(segment_ids)} segment(s) in {self.directory}: "
+            f"{sum(len(fields) for fields in self.index.values())} live entries"
+        )
+
+    def _apply(self, segment: _Segment, record: _Record) -> None:
+        """Update the index (and live byte counts) for a record at its position in the log."""
+        fields = self.index.setdefault(record.key, {})
+        previous = fields.pop(record.field, None)
+        if previous is not None:
+            self.segments[previous[0]].live_bytes -= previous[3]
+        tombstone = self.tombstones.pop((record.key, record.field), None)
+        if tombstone is not None and tombstone[0] in self.segments:
+            self.segments[tombstone[0]].tombstone_bytes -= tombstone[2]
+        if record.kind == PUT:
+            fields[record.field] = (
+                segment.segment_id, record.value_offset, record.value_length, record.length
+            )
+            segment.live_bytes += record.length
+        else:
+            self.tombstones[(record.key, record.field)] = (segment.segment_id, record.offset, record.length)
+            segment.tombstone_bytes += record.length
+            if not fields:
+                del self.index[record.key]
+
+    def _append(self, kind: int, key: str, field: str = "", value: bytes = b"") -> None:
+        key_bytes, field_bytes = key.encode(), field.encode()
+        body = key_bytes + field_bytes + value
+        length = RECORD_HEADER.size + len(body)
+        if self.active.end + length > self.active.size:
+            self._roll(length)
+
+        segment, offset = self.active, self.active.end
+        header = RECORD_HEADER.pack(0, kind, len(key_bytes), len(field_bytes), len(value))
+        crc = zlib.crc32(body, zlib.crc32(header[4:]))
+        segment.mm[offset:offset + length] = struct.pack("<I", crc) + header[4:] + body
+        segment.end += length
+        self._dirty = True
+
+        self._apply(segment, _Record(
+            kind=kind,
+            key=key,
+            field=field,
+            offset=offset,
+            value_offset=offset + RECORD_HEADER.size + len(key_bytes) + len(field_bytes),
+            value_length=len(value),
+            length=length,
+        ))
+        self._ensure_worker()
+
+    # Reads and writes
+
+    def _read(self, location: Location) -> str:
+        segment_id, offset, length, _ = location
+        with memoryview(self.segments[segment_id].mm)[offset:offset + length] as view:
+            return str(view, "utf-8")
+
+    def get(self, key: str, field: str) -> Optional[str]:
+        location = self.index.get(key, {}).get(field)
+        return self._read(location) if location else None
+
+    def put(self, key: str, field: str, value: str) -> bool:
+        """Store a value; True if the field is new."""
+        is_new = field not in self.index.get(key, {})
+        self._append(PUT, key, field, value.encode())
+        return is_new
+
+    def delete(self, key: str, field: str) -> bool:
+        if field not in self.index.get(key, {}):
+            return False
+        self._append(DELETE, key, field)
+        return True
+
+    def drop(self, key: str) -> bool:
+        # One tombstone per field: a whole-hash tombstone couldn't be moved by compaction
+        # without also deleting fields written after it
+        fields = self.fields(key)
+        for field in fields:
+            self._append(DELETE, key, field)
+        return bool(fields)
+
+    def fields(self, key: str) -> List[str]:
+        return list(self.index.get(key, {}))
+
+    def items(self, key: str) -> Iterator[Tuple[str, str]]:
+        """All entries of a hash in log order, so large reads stream sequentially from disk."""
+        entries = sorted(self.index.get(key, {}).items(), key=lambda item: item[1][:2])
+        for field, location in entries:
+            yield field, self._read(location)
+
+    def keys(self) -> List[str]:
+        return list(self.index)
+
+    def flush(self) -> None:
+        if self._dirty:
+            self.active.mm.flush()
+            self._dirty = False
+
+    def after_write(self) -> None:
+        if LOG_FSYNC == "always":
+            self.flush()
+
+    # Compaction
+
+    def compaction_candidates(self) -> List[int]:
+        # Tombstones are garbage only in the oldest segment, with nothing left for them to hide
+        oldest = min(self.segments, default=None)
+        return [
+            segment.segment_id
+            for segment in sorted(self.segments.values(), key=lambda s: s.segment_id)
+            if segment.sealed
+            and segment.end > 0
+            and 1 - (
+                segment.live_bytes + (segment.tombstone_bytes if segment.segment_id != oldest else 0)
+            ) / segment.end >= LOG_COMPACTION_GARBAGE_RATIO
+        ]
+
+    async def compact(self, segment_id: int, batch: int = 1000) -> None:
+        """
+        Copy a sealed segment's live records to the active segment, then delete it.
+
+        Runs on the event loop in batches, so writes interleave; a record is only
+        copied if the index still points at it when its turn comes.
+        """
+        segment = self.segments[segment_id]
+        oldest = segment_id == min(self.segments)
+        copied = 0
+
+        for i, record in enumerate(self._records(segment, stop=segment.end)):
+            fields = self.index.get(record.key, {})
+            if record.kind == PUT:
+                location = fields.get(record.field)
+                if location and location[:2] == (segment_id, record.value_offset):
+                    with memoryview(segment.mm)[record.value_offset:record.value_offset + record.value_length] as view:
+                        self._append(PUT, record.key, record.field, bytes(view))
+                    copied += 1
+            elif self.tombstones.get((record.key, record.field), (None, None))[:2] == (segment_id, record.offset):
+                if oldest:
+                    # Nothing older is left for it to hide
+                    self.tombstones.pop((record.key, record.field))
+                else:
+                    # Older segments may still hold the value this tombstone deletes.
+                    # It's still current, so the field hasn't been written since.
+                    self._append(DELETE, record.key, record.field)
+            if i % batch == batch - 1:
+                await asyncio.sleep(0)
+
+        # The copies must be durable before the originals disappear
+        self.active.mm.flush()
+        del self.segments[segment_id]
+        segment.close()
+        os.remove(segment.path)
+        logger.info(f"🧹 Compacted node log segment {segment_id}: {copied} live record(s) kept")
+
+    # Background work
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            try:
+                self._worker = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(LOG_FLUSH_INTERVAL_SECONDS)
+            try:
+                self.flush()
+                for segment_id in self.compaction_candidates():
+                    await self.compact(segment_id)
+            except Exception as e:
+                logger.error(f"❌ Node log maintenance failed: {e}", exc_info=True)
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+        self.flush()
+        for segment in self.segments.values():
+            segment.close()
+        self.segments.clear()
+        self._lock.close()
+
+
+# Hash commands the log answers for node hashes; everything else goes to the base engine
+NODE_COMMANDS = (
+    "hget", "hset", "hdel", "hmget", "hgetall", "hkeys", "hvals", "hlen", "hexists",
+)
+
+
+class LogPipeline:
+    def __init__(self, backend: "LogBackend", transaction: bool = True):
+        """
+        Splits queued commands between the node log and the base engine's pipeline.
+        Node writes are applied (in order) before the base pipeline executes.
+        """
+        self.backend = backend
+        self.transaction = transaction
+        self._commands: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args: Any, **kwargs: Any) -> "LogPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        commands, self._commands = self._commands, []
+        results: List[Any] = [None] * len(commands)
+        base = self.backend.base.pipeline(transaction=self.transaction)
+        slots: List[int] = []
+
+        for i, (name, args, kwargs) in enumerate(commands):
+            if name in NODE_COMMANDS and is_node_hash(args[0]):
+                results[i] = getattr(self.backend, f"_node_{name}")(*args, **kwargs)
+            elif name == "delete":
+                node_keys = [key for key in args if is_node_hash(key)]
+                results[i] = sum(self.backend.log.drop(key) for key in node_keys)
+                other_keys = [key for key in args if not is_node_hash(key)]
+                if other_keys:
+                    base.delete(*other_keys)
+                    slots.append(i)
+            else:
+                getattr(base, name)(*args, **kwargs)
+                slots.append(i)
+        self.backend.log.after_write()
+
+        if slots:
+            for i, result in zip(slots, await base.execute(raise_on_error=raise_on_error)):
+                results[i] = result + results[i] if isinstance(results[i], int) else result
+        return results
+
+    async def reset(self) -> None:
+        self._commands = []
+
+    async def __aenter__(self) -> "LogPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.reset()
+
+
+class LogBackend:
+    def __init__(self, directory: str, base: StorageBackend):
+        """
+        Keeps node hashes in a NodeLog on local disk and everything else (indexes,
+        change streams, users, pub/sub) in `base`. Node reads never leave the
+        process, so scanning millions of nodes is bound by disk bandwidth rather
+        than round trips.
+
+        Args:
+            directory: Segment directory for the node log
+            base: Engine for all non-node keys
+        """
+        self.log = NodeLog(directory)
+        self.base = base
+
+    def __getattr__(self, name: str):
+        return getattr(self.base, name)
+
+    # Node hash commands, synchronous so pipelines can apply them in place
+
+    def _node_hget(self, key: str, field: str) -> Optional[str]:
+        return self.log.get(key, field)
+
+    def _node_hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Mapping[str, Any]] = None,
+    ) -> int:
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        return sum(self.log.put(key, f, str(v)) for f, v in items.items())
+
+    def _node_hdel(self, key: str, *fields: str) -> int:
+        return sum(self.log.delete(key, f) for f in fields)
+
+    def _node_hmget(self, key: str, keys: Any, *args: str) -> List[Optional[str]]:
+        fields = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [self.log.get(key, f) for f in fields]
+
+    def _node_hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self.log.items(key))
+
+    def _node_hkeys(self, key: str) -> List[str]:
+        return self.log.fields(key)
+
+    def _node_hvals(self, key: str) -> List[str]:
+        return [value for _, value in self.log.items(key)]
+
+    def _node_hlen(self, key: str) -> int:
+        return len(self.log.index.get(key, {}))
+
+    def _node_hexists(self, key: str, field: str) -> bool:
+        return field in self.log.index.get(key, {})
+
+    # Routed commands
+
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        if is_node_hash(key):
+            return self._node_hget(key, field)
+        return await self.base.hget(key, field)
+
+    async def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Mapping[str, Any]] = None,
+    ) -> int:
+        if is_node_hash(key):
+            added = self._node_hset(key, field, value, mapping)
+            self.log.after_write()
+            return added
+        return await self.base.hset(key, field, value, mapping=mapping)
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        if is_node_hash(key):
+            removed = self._node_hdel(key, *fields)
+            self.log.after_write()
+            return removed
+        return await self.base.hdel(key, *fields)
+
+    async def hmget(self, key: str, keys: Any, *args: str) -> List[Optional[str]]:
+        if is_node_hash(key):
+            return self._node_hmget(key, keys, *args)
+        return await self.base.hmget(key, keys, *args)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        if is_node_hash(key):
+            return self._node_hgetall(key)
+        return await self.base.hgetall(key)
+
+    async def hkeys(self, key: str) -> List[str]:
+        if is_node_hash(key):
+            return self._node_hkeys(key)
+        return await self.base.hkeys(key)
+
+    async def hvals(self, key: str) -> List[str]:
+        if is_node_hash(key):
+            return self._node_hvals(key)
+        return await self.base.hvals(key)
+
+    async def hlen(self, key: str) -> int:
+        if is_node_hash(key):
+            return self._node_hlen(key)
+        return await self.base.hlen(key)
+
+    async def hexists(self, key: str, field: str) -> bool:
+        if is_node_hash(key):
+            return self._node_hexists(key, field)
+        return await self.base.hexists(key, field)
+
+    async def hscan_iter(
+        self, key: str, match: Optional[str] = None, count: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        if not is_node_hash(key):
+            async for item in self.base.hscan_iter(key, match=match, count=count):
+                yield item
+            return
+        for i, (field, value) in enumerate(self.log.items(key)):
+            if match is None or fnmatch.fnmatchcase(field, match):
+                yield field, value
+            if count and i % count == count - 1:
+                await asyncio.sleep(0)
+
+    async def delete(self, *keys: str) -> int:
+        removed = sum(self.log.drop(key) for key in keys if is_node_hash(key))
+        self.log.after_write()
+        others = [key for key in keys if not is_node_hash(key)]
+        return removed + (await self.base.delete(*others) if others else 0)
+
+    async def exists(self, *keys: str) -> int:
+        found = sum(1 for key in keys if is_node_hash(key) and key in self.log.index)
+        others = [key for key in keys if not is_node_hash(key)]
+        return found + (await self.base.exists(*others) if others else 0)
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        node_keys = [key for key in self.log.keys() if fnmatch.fnmatchcase(key, pattern)]
+        return node_keys + await self.base.keys(pattern)
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator[str]:
+        for key in self.log.keys():
+            if fnmatch.fnmatchcase(key, match or "*"):
+                yield key
+        async for key in self.base.scan_iter(match=match, count=count):
+            yield key
+
+    def pipeline(self, transaction: bool = True) -> LogPipeline:
+        return LogPipeline(self, transaction)
+
+    async def run_script(self, script: Script, keys: List[str], args: List[Any]) -> Any:
+        if any(is_node_hash(key) for key in keys):
+            # Node hashes aren't visible to server-side Lua; run the Python body here
+            return await script.python(self, keys, args)
+        return await self.base.run_script(script, keys, args)
+
+    async def close(self) -> None:
+        self.log.flush()
+
+    def shutdown(self) -> None:
+        """Flush and unmap every segment. The backend can't be used afterwards."""
+        self.log.close()
@@ -0,0 +1,721 @@
+import asyncio
+import bisect
+import fnmatch
+import logging
+import math
+import time
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union,
+)
+
+from redis.exceptions import ResponseError
+
+from pyserver.storage.backend.protocol import Number, ScoreBound, Script
+
+logger = logging.getLogger(__name__)
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+StreamId = Tuple[int, int]
+
+
+def _flatten(keys: Union[str, Iterable[str]], args: Tuple[str, ...]) -> List[str]:
+    """Accept redis-py's `(keys, *args)` calling convention."""
+    if isinstance(keys, str):
+        return [keys, *args]
+    return [*keys, *args]
+
+
+def _score_bound(bound: ScoreBound) -> Tuple[float, bool]:
+    """Parse a ZRANGEBYSCORE bound into (value, exclusive)."""
+    if isinstance(bound, (int, float)):
+        return float(bound), False
+    text = str(bound)
+    exclusive = text.startswith("(")
+    if exclusive:
+        text = text[1:]
+    return float(text), exclusive
+
+
+class _SortedSet:
+    """Members ordered by (score, member), mirroring Redis' skiplist order."""
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self.items: List[Tuple[float, str]] = []
+
+    def add(self, member: str, score: float) -> bool:
+        previous = self.scores.get(member)
+        if previous is not None:
+            if previous == score:
+                return False
+            self.items.pop(bisect.bisect_left(self.items, (previous, member)))
+        self.scores[member] = score
+        bisect.insort(self.items, (score, member))
+        return previous is None
+
+    def remove(self, member: str) -> bool:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return False
+        self.items.pop(bisect.bisect_left(self.items, (score, member)))
+        return True
+
+    def score_slice(self, min_bound: ScoreBound, max_bound: ScoreBound) -> Tuple[int, int]:
+        low, low_exclusive = _score_bound(min_bound)
+        high, high_exclusive = _score_bound(max_bound)
+
+        # ("", score) sorts before every member with that score
+        if low_exclusive:
+            low = math.nextafter(low, math.inf)
+        start = bisect.bisect_left(self.items, (low, ""))
+
+        if high == math.inf and not high_exclusive:
+            end = len(self.items)
+        else:
+            if not high_exclusive:
+                high = math.nextafter(high, math.inf)
+            end = bisect.bisect_left(self.items, (high, ""))
+        return start, max(start, end)
+
+    def lex_slice(self, min_bound: str, max_bound: str) -> Tuple[int, int]:
+        # Lex ranges are only meaningful when all members share a score
+        if not self.items:
+            return 0, 0
+        score = self.items[0][0]
+
+        if min_bound == "-":
+            start = 0
+        elif min_bound.startswith("["):
+            start = bisect.bisect_left(self.items, (score, min_bound[1:]))
+        elif min_bound.startswith("("):
+            start = bisect.bisect_right(self.items, (score, min_bound[1:]))
+        else:
+            raise ResponseError("min or max not valid string range item")
+
+        if max_bound == "+":
+            end = len(self.items)
+        elif max_bound.startswith("["):
+            end = bisect.bisect_right(self.items, (score, max_bound[1:]))
+        elif max_bound.startswith("("):
+            end = bisect.bisect_left(self.items, (score, max_bound[1:]))
+        else:
+            raise ResponseError("min or max not valid string range item")
+
+        return start, max(start, end)
+
+
+class _Stream:
+    def __init__(self):
+        self.entries: List[Tuple[StreamId, str, Dict[str, str]]] = []
+        self.last_id: StreamId = (0, 0)
+        self.max_deleted_id: StreamId = (0, 0)
+        self.entries_added = 0
+
+    def next_id(self) -> StreamId:
+        now = int(time.time() * 1000)
+        if now > self.last_id[0]:
+            return now, 0
+        return self.last_id[0], self.last_id[1] + 1
+
+    def trim(self, maxlen: int) -> int:
+        excess = len(self.entries) - maxlen
+        if excess <= 0:
+            return 0
+        self.max_deleted_id = self.entries[excess - 1][0]
+        del self.entries[:excess]
+        return excess
+
+
+def _parse_stream_id(text: str, default_seq: int) -> StreamId:
+    ms, _, seq = text.partition("-")
+    return int(ms), int(seq) if seq else default_seq
+
+
+def _format_stream_id(stream_id: StreamId) -> str:
+    return f"{stream_id[0]}-{stream_id[1]}"
+
+
+class MemoryPipeline:
+    def __init__(self, backend: "MemoryBackend", transaction: bool = True):
+        """
+        Queues commands and applies them in one go on `execute`. All queued commands
+        run without yielding to the event loop, so every batch is atomic.
+        """
+        self.backend = backend
+        self.transaction = transaction
+        self._commands: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        command = getattr(self.backend, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "MemoryPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        queue.__doc__ = command.__doc__
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        commands, self._commands = self._commands, []
+        results: List[Any] = []
+        for name, args, kwargs in commands:
+            try:
+                results.append(await getattr(self.backend, name)(*args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+    async def reset(self) -> None:
+        self._commands = []
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.reset()
+
+
+class MemoryPubSub:
+    def __init__(self, backend: "MemoryBackend"):
+        self.backend = backend
+        self.channels: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self.channels.add(channel)
+            self.backend._subscribers.setdefault(channel, set()).add(self)
+            self.queue.put_nowait({"type": "subscribe", "channel": channel, "data": len(self.channels)})
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or tuple(self.channels):
+            self.channels.discard(channel)
+            self.backend._subscribers.get(channel, set()).discard(self)
+            self.queue.put_nowait({"type": "unsubscribe", "channel": channel, "data": len(self.channels)})
+
+    async def listen(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            yield await self.queue.get()
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    message = await asyncio.wait_for(self.queue.get(), remaining)
+                else:
+                    message = self.queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                return None
+            if ignore_subscribe_messages and message["type"] in ("subscribe", "unsubscribe"):
+                continue
+            return message
+
+    async def aclose(self) -> None:
+        for channel in tuple(self.channels):
+            self.backend._subscribers.get(channel, set()).discard(self)
+        self.channels.clear()
+
+
+class MemoryBackend:
+    def __init__(self):
+        """
+        Pure-Python, single-process storage engine with Redis semantics.
+
+        Implements the StorageBackend protocol over plain dicts, sets and sorted
+        lists, including pipelines, streams, pub/sub and scripts. Commands never
+        yield to the event loop, so each command (and each pipeline) is atomic.
+        Data lives only as long as the process.
+        """
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[MemoryPubSub]] = {}
+
+    # Internals
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _lookup(self, key: str, kind: type) -> Any:
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise ResponseError(WRONGTYPE)
+        return value
+
+    def _create(self, key: str, kind: type) -> Any:
+        value = self._lookup(key, kind)
+        if value is None:
+            value = self._data[key] = kind()
+        return value
+
+    def _drop_if_empty(self, key: str) -> None:
+        # Redis deletes emptied collections, but keeps empty streams
+        value = self._data.get(key)
+        if isinstance(value, _SortedSet):
+            empty = not value.scores
+        elif isinstance(value, (dict, set, list)):
+            empty = not value
+        else:
+            return
+        if empty:
+            del self._data[key]
+            self._expires.pop(key, None)
+
+    # Keys
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    async def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._alive(key))
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator[str]:
+        for key in await self.keys(match or "*"):
+            yield key
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + seconds
+        return True
+
+    # Strings and counters
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._lookup(key, str)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._alive(key):
+            return None
+        self._data[key] = str(value)
+        self._expires.pop(key, None)
+        if ex is not None:
+            self._expires[key] = time.monotonic() + ex
+        return True
+
+    async def mget(self, keys: Iterable[str], *args: str) -> List[Optional[str]]:
+        results = []
+        for key in _flatten(keys, args):
+            value = self._data.get(key) if self._alive(key) else None
+            results.append(value if isinstance(value, str) else None)
+        return results
+
+    async def incrby(self, key: str, amount: int = 1) -> int:
+        current = self._lookup(key, str)
+        try:
+            value = int(current or 0) + amount
+        except ValueError:
+            raise ResponseError("value is not an integer or out of range")
+        self._data[key] = str(value)
+        return value
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self.incrby(key, amount)
+
+    # Hashes
+
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        mapping = self._lookup(key, dict)
+        return mapping.get(field) if mapping else None
+
+    async def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Mapping[str, Any]] = None,
+    ) -> int:
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        target = self._create(key, dict)
+        added = sum(1 for f in items if f not in target)
+        target.update({f: str(v) for f, v in items.items()})
+        return added
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        mapping = self._lookup(key, dict)
+        if not mapping:
+            return 0
+        removed = sum(1 for f in fields if mapping.pop(f, None) is not None)
+        self._drop_if_empty(key)
+        return removed
+
+    async def hmget(self, key: str, keys: Iterable[str], *args: str) -> List[Optional[str]]:
+        mapping = self._lookup(key, dict) or {}
+        return [mapping.get(f) for f in _flatten(keys, args)]
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self._lookup(key, dict) or {})
+
+    async def hkeys(self, key: str) -> List[str]:
+        return list(self._lookup(key, dict) or {})
+
+    async def hvals(self, key: str) -> List[str]:
+        return list((self._lookup(key, dict) or {}).values())
+
+    async def hlen(self, key: str) -> int:
+        return len(self._lookup(key, dict) or {})
+
+    async def hexists(self, key: str, field: str) -> bool:
+        return field in (self._lookup(key, dict) or {})
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        mapping = self._create(key, dict)
+        value = int(mapping.get(field, 0)) + amount
+        mapping[field] = str(value)
+        return value
+
+    async def hscan_iter(
+        self, key: str, match: Optional[str] = None, count: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        for field, value in list((self._lookup(key, dict) or {}).items()):
+            if match is None or fnmatch.fnmatchcase(field, match):
+                yield field, value
+
+    # Sets
+
+    async def sadd(self, key: str, *members: str) -> int:
+        target = self._create(key, set)
+        added = sum(1 for m in members if m not in target)
+        target.update(members)
+        return added
+
+    async def srem(self, key: str, *members: str) -> int:
+        target = self._lookup(key, set)
+        if not target:
+            return 0
+        removed = sum(1 for m in members if m in target)
+        target.difference_update(members)
+        self._drop_if_empty(key)
+        return removed
+
+    async def smembers(self, key: str) -> Set[str]:
+        return set(self._lookup(key, set) or ())
+
+    async def sismember(self, key: str, member: str) -> bool:
+        return member in (self._lookup(key, set) or ())
+
+    async def smismember(self, key: str, members: Iterable[str], *args: str) -> List[bool]:
+        target = self._lookup(key, set) or set()
+        return [m in target for m in _flatten(members, args)]
+
+    async def scard(self, key: str) -> int:
+        return len(self._lookup(key, set) or ())
+
+    def _sets(self, keys: List[str]) -> List[Set[str]]:
+        return [self._lookup(key, set) or set() for key in keys]
+
+    async def sinter(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]:
+        sets = sorted(self._sets(_flatten(keys, args)), key=len)
+        if not sets:
+            return set()
+        return set(sets[0]).intersection(*sets[1:])
+
+    async def sintercard(self, numkeys: int, keys: List[str], limit: int = 0) -> int:
+        count = len(await self.sinter(list(keys)[:numkeys]))
+        return min(count, limit) if limit else count
+
+    async def sunion(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]:
+        return set().union(*self._sets(_flatten(keys, args)))
+
+    async def sinterstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int:
+        result = await self.sinter(keys, *args)
+        await self.delete(dest)
+        if result:
+            self._data[dest] = result
+        return len(result)
+
+    async def sunionstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int:
+        result = await self.sunion(keys, *args)
+        await self.delete(dest)
+        if result:
+            self._data[dest] = result
+        return len(result)
+
+    # Sorted sets
+
+    async def zadd(self, key: str, mapping: Mapping[str, Number], nx: bool = False, xx: bool = False) -> int:
+        target = self._create(key, _SortedSet)
+        added = 0
+        for member, score in mapping.items():
+            exists = member in target.scores
+            if (nx and exists) or (xx and not exists):
+                continue
+            added += target.add(member, float(score))
+        self._drop_if_empty(key)
+        return added
+
+    async def zrem(self, key: str, *members: str) -> int:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return 0
+        removed = sum(1 for m in members if target.remove(m))
+        self._drop_if_empty(key)
+        return removed
+
+    async def zscore(self, key: str, member: str) -> Optional[float]:
+        target = self._lookup(key, _SortedSet)
+        return target.scores.get(member) if target else None
+
+    async def zincrby(self, key: str, amount: Number, member: str) -> float:
+        target = self._create(key, _SortedSet)
+        score = target.scores.get(member, 0.0) + float(amount)
+        target.add(member, score)
+        return score
+
+    async def zcard(self, key: str) -> int:
+        target = self._lookup(key, _SortedSet)
+        return len(target.scores) if target else 0
+
+    async def zcount(self, key: str, min: ScoreBound, max: ScoreBound) -> int:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return 0
+        start, end = target.score_slice(min, max)
+        return end - start
+
+    @staticmethod
+    def _window(items: List[Any], start: Optional[int], num: Optional[int]) -> List[Any]:
+        if start is None:
+            return items
+        if num is None or num < 0:
+            return items[start:]
+        return items[start:start + num]
+
+    @staticmethod
+    def _with_scores(items: List[Tuple[float, str]], withscores: bool) -> List[Any]:
+        if withscores:
+            return [(member, score) for score, member in items]
+        return [member for _, member in items]
+
+    async def zrange(
+        self, key: str, start: int, end: int, desc: bool = False, withscores: bool = False
+    ) -> List[Any]:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return []
+        items = target.items[::-1] if desc else target.items
+        size = len(items)
+        first = start + size if start < 0 else start
+        last = end + size if end < 0 else end
+        return self._with_scores(items[max(first, 0):last + 1], withscores)
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        min: ScoreBound,
+        max: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return []
+        low, high = target.score_slice(min, max)
+        return self._with_scores(self._window(target.items[low:high], start, num), withscores)
+
+    async def zrevrangebyscore(
+        self,
+        key: str,
+        max: ScoreBound,
+        min: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return []
+        low, high = target.score_slice(min, max)
+        return self._with_scores(self._window(target.items[low:high][::-1], start, num), withscores)
+
+    async def zrangebylex(
+        self, key: str, min: str, max: str, start: Optional[int] = None, num: Optional[int] = None
+    ) -> List[str]:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return []
+        low, high = target.lex_slice(min, max)
+        return [member for _, member in self._window(target.items[low:high], start, num)]
+
+    async def zremrangebyscore(self, key: str, min: ScoreBound, max: ScoreBound) -> int:
+        target = self._lookup(key, _SortedSet)
+        if not target:
+            return 0
+        low, high = target.score_slice(min, max)
+        doomed = [member for _, member in target.items[low:high]]
+        for member in doomed:
+            target.remove(member)
+        self._drop_if_empty(key)
+        return len(doomed)
+
+    # Lists
+
+    async def rpush(self, key: str, *values: str) -> int:
+        target = self._create(key, list)
+        target.extend(str(v) for v in values)
+        return len(target)
+
+    async def lpop(self, key: str) -> Optional[str]:
+        target = self._lookup(key, list)
+        if not target:
+            return None
+        value = target.pop(0)
+        self._drop_if_empty(key)
+        return value
+
+    async def lrange(self, key: str, start: int, end: int) -> List[str]:
+        target = self._lookup(key, list) or []
+        size = len(target)
+        first = start + size if start < 0 else start
+        last = end + size if end < 0 else end
+        return target[max(first, 0):last + 1]
+
+    # Streams
+
+    async def xadd(
+        self,
+        name: str,
+        fields: Mapping[str, str],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        stream = self._create(name, _Stream)
+        if id == "*":
+            stream_id = stream.next_id()
+        else:
+            stream_id = _parse_stream_id(id, 0)
+            if stream_id <= stream.last_id:
+                raise ResponseError(
+                    "The ID specified in XADD is equal or smaller than the target stream top item"
+                )
+        stream.last_id = stream_id
+        stream.entries_added += 1
+        text_id = _format_stream_id(stream_id)
+        stream.entries.append((stream_id, text_id, {k: str(v) for k, v in fields.items()}))
+        if maxlen is not None:
+            stream.trim(maxlen)
+        return text_id
+
+    def _stream_range(self, name: str, min: str, max: str) -> List[Tuple[str, Dict[str, str]]]:
+        stream = self._lookup(name, _Stream)
+        if not stream:
+            return []
+
+        def lower(bound: str) -> Tuple[StreamId, bool]:
+            if bound == "-":
+                return (0, 0), False
+            if bound.startswith("("):
+                return _parse_stream_id(bound[1:], 0), True
+            return _parse_stream_id(bound, 0), False
+
+        def upper(bound: str) -> Tuple[StreamId, bool]:
+            if bound == "+":
+                return (2 ** 64, 0), False
+            if bound.startswith("("):
+                return _parse_stream_id(bound[1:], 2 ** 64), True
+            return _parse_stream_id(bound, 2 ** 64), False
+
+        low, low_exclusive = lower(min)
+        high, high_exclusive = upper(max)
+        ids = [entry[0] for entry in stream.entries]
+        start = (bisect.bisect_right if low_exclusive else bisect.bisect_left)(ids, low)
+        end = (bisect.bisect_left if high_exclusive else bisect.bisect_right)(ids, high)
+        return [(text_id, dict(data)) for _, text_id, data in stream.entries[start:end]]
+
+    async def xrange(
+        self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        entries = self._stream_range(name, min, max)
+        return entries[:count] if count is not None else entries
+
+    async def xrevrange(
+        self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        entries = self._stream_range(name, min, max)[::-1]
+        return entries[:count] if count is not None else entries
+
+    async def xlen(self, name: str) -> int:
+        stream = self._lookup(name, _Stream)
+        return len(stream.entries) if stream else 0
+
+    async def xtrim(self, name: str, maxlen: Optional[int] = None, approximate: bool = True) -> int:
+        stream = self._lookup(name, _Stream)
+        if not stream or maxlen is None:
+            return 0
+        return stream.trim(maxlen)
+
+    async def xinfo_stream(self, name: str) -> Dict[str, Any]:
+        stream = self._lookup(name, _Stream)
+        if stream is None:
+            raise ResponseError("no such key")
+        first = stream.entries[0] if stream.entries else None
+        last = stream.entries[-1] if stream.entries else None
+        return {
+            "length": len(stream.entries),
+            "last-generated-id": _format_stream_id(stream.last_id),
+            "max-deleted-entry-id": _format_stream_id(stream.max_deleted_id),
+            "entries-added": stream.entries_added,
+            "first-entry": (first[1], dict(first[2])) if first else None,
+            "last-entry": (last[1], dict(last[2])) if last else None,
+        }
+
+    # Pub/sub
+
+    async def publish(self, channel: str, message: str) -> int:
+        subscribers = self._subscribers.get(channel, set())
+        for subscriber in subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self) -> MemoryPubSub:
+        return MemoryPubSub(self)
+
+    # Batching and scripting
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        return MemoryPipeline(self, transaction)
+
+    async def run_script(self, script: Script, keys: List[str], args: List[Any]) -> Any:
+        return await script.python(self, keys, args)
+
+    async def flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional,
+    Protocol, Set, Tuple, Union, runtime_checkable,
+)
+
+Number = Union[int, float]
+ScoreBound = Union[Number, str]
+
+
+def is_node_hash(key: str) -> bool:
+    """True for a user's node hash (urlife:<user>:node), which engines may store specially."""
+    return key.startswith("urlife:") and key.endswith(":node")
+
+
+@dataclass(frozen=True)
+class Script:
+    """
+    A server-side script with a Lua body for Redis and an equivalent Python body
+    for engines that cannot run Lua. Both must implement the same semantics.
+
+    The Python body is called as `await python(backend, keys, args)` and must not
+    await anything other than backend commands, so it runs atomically on the
+    in-memory engine.
+    """
+    name: str
+    lua: str
+    python: Callable[["StorageBackend", List[str], List[Any]], Awaitable[Any]]
+
+
+class Pipeline(Protocol):
+    """
+    Batches commands into a single round trip. Command methods queue the call and
+    return the pipeline; `execute` returns the results in order. With
+    `transaction=True` the batch is applied atomically (MULTI/EXEC).
+    """
+
+    def __getattr__(self, name: str) -> Callable[..., "Pipeline"]: ...
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]: ...
+
+    async def __aenter__(self) -> "Pipeline": ...
+
+    async def __aexit__(self, *exc_info: Any) -> None: ...
+
+
+class PubSub(Protocol):
+    async def subscribe(self, *channels: str) -> None: ...
+
+    async def unsubscribe(self, *channels: str) -> None: ...
+
+    def listen(self) -> AsyncIterator[Dict[str, Any]]: ...
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0
+    ) -> Optional[Dict[str, Any]]: ...
+
+    async def aclose(self) -> None: ...
+
+
+class StorageBackend(Protocol):
+    """
+    The subset of Redis semantics the storage layer is written against.
+
+    Method names, arguments and return values follow redis-py's asyncio client with
+    `decode_responses=True`, so a Redis client satisfies this protocol directly and
+    other engines (see MemoryBackend) mirror it.
+    """
+
+    # Keys
+
+    async def delete(self, *keys: str) -> int: ...
+
+    async def exists(self, *keys: str) -> int: ...
+
+    async def keys(self, pattern: str = "*") -> List[str]: ...
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator[str]: ...
+
+    async def expire(self, key: str, seconds: int) -> bool: ...
+
+    # Strings and counters
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]: ...
+
+    async def mget(self, keys: Iterable[str], *args: str) -> List[Optional[str]]: ...
+
+    async def incr(self, key: str, amount: int = 1) -> int: ...
+
+    async def incrby(self, key: str, amount: int = 1) -> int: ...
+
+    # Hashes
+
+    async def hget(self, key: str, field: str) -> Optional[str]: ...
+
+    async def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Mapping[str, Any]] = None,
+    ) -> int: ...
+
+    async def hdel(self, key: str, *fields: str) -> int: ...
+
+    async def hmget(self, key: str, keys: Iterable[str], *args: str) -> List[Optional[str]]: ...
+
+    async def hgetall(self, key: str) -> Dict[str, str]: ...
+
+    async def hkeys(self, key: str) -> List[str]: ...
+
+    async def hvals(self, key: str) -> List[str]: ...
+
+    async def hlen(self, key: str) -> int: ...
+
+    async def hexists(self, key: str, field: str) -> bool: ...
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int: ...
+
+    def hscan_iter(
+        self, key: str, match: Optional[str] = None, count: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, str]]: ...
+
+    # Sets
+
+    async def sadd(self, key: str, *members: str) -> int: ...
+
+    async def srem(self, key: str, *members: str) -> int: ...
+
+    async def smembers(self, key: str) -> Set[str]: ...
+
+    async def sismember(self, key: str, member: str) -> bool: ...
+
+    async def smismember(self, key: str, members: Iterable[str], *args: str) -> List[bool]: ...
+
+    async def scard(self, key: str) -> int: ...
+
+    async def sinter(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]: ...
+
+    async def sintercard(self, numkeys: int, keys: List[str], limit: int = 0) -> int: ...
+
+    async def sunion(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]: ...
+
+    async def sinterstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int: ...
+
+    async def sunionstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int: ...
+
+    # Sorted sets
+
+    async def zadd(self, key: str, mapping: Mapping[str, Number], nx: bool = False, xx: bool = False) -> int: ...
+
+    async def zrem(self, key: str, *members: str) -> int: ...
+
+    async def zscore(self, key: str, member: str) -> Optional[float]: ...
+
+    async def zincrby(self, key: str, amount: Number, member: str) -> float: ...
+
+    async def zcard(self, key: str) -> int: ...
+
+    async def zcount(self, key: str, min: ScoreBound, max: ScoreBound) -> int: ...
+
+    async def zrange(
+        self, key: str, start: int, end: int, desc: bool = False, withscores: bool = False
+    ) -> List[Any]: ...
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        min: ScoreBound,
+        max: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]: ...
+
+    async def zrevrangebyscore(
+        self,
+        key: str,
+        max: ScoreBound,
+        min: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]: ...
+
+    async def zrangebylex(
+        self, key: str, min: str, max: str, start: Optional[int] = None, num: Optional[int] = None
+    ) -> List[str]: ...
+
+    async def zremrangebyscore(self, key: str, min: ScoreBound, max: ScoreBound) -> int: ...
+
+    # Lists
+
+    async def rpush(self, key: str, *values: str) -> int: ...
+
+    async def lpop(self, key: str) -> Optional[str]: ...
+
+    async def lrange(self, key: str, start: int, end: int) -> List[str]: ...
+
+    # Streams
+
+    async def xadd(
+        self,
+        name: str,
+        fields: Mapping[str, str],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str: ...
+
+    async def xrange(
+        self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]: ...
+
+    async def xrevrange(
+        self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]: ...
+
+    async def xlen(self, name: str) -> int: ...
+
+    async def xtrim(self, name: str, maxlen: Optional[int] = None, approximate: bool = True) -> int: ...
+
+    async def xinfo_stream(self, name: str) -> Dict[str, Any]: ...
+
+    # Pub/sub
+
+    async def publish(self, channel: str, message: str) -> int: ...
+
+    def pubsub(self) -> PubSub: ...
+
+    # Batching and scripting
+
+    def pipeline(self, transaction: bool = True) -> Pipeline: ...
+
+    async def run_script(self, script: Script, keys: List[str], args: List[Any]) -> Any: ...
+
+    async def close(self) -> None: ...
+
+
+@runtime_checkable
+class TreeQueries(Protocol):
+    """
+    Optional capability of engines that index node parent links (see SqliteBackend).
+    `key` is the user's node hash; results are node IDs.
+    """
+
+    async def ancestors(self, key: str, node_id: str) -> List[str]:
+        """Parents of `node_id` up to the root, nearest first."""
+        ...
+
+    async def children(self, key: str, parent_id: str) -> List[str]:
+        """Nodes whose parent is `parent_id`, oldest first."""
+        ...
@@ -0,0 +1,21 @@
+from typing import Any, Dict, List
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from pyserver.storage.backend.protocol import Script
+
+
+class RedisBackend(Redis):
+    """
+    Redis client that satisfies the StorageBackend protocol.
+
+    Redis already speaks every command natively; this only adds `run_script`, which
+    runs a Script's Lua body with EVALSHA and reloads it if the server lost it.
+    """
+
+    async def run_script(self, script: Script, keys: List[str], args: List[Any]) -> Any:
+        registered: Dict[str, AsyncScript] = self.__dict__.setdefault("_registered_scripts", {})
+        if script.name not in registered:
+            registered[script.name] = self.register_script(script.lua)
+        return await registered[script.name](keys=keys, args=args)
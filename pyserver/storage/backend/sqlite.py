@@ -0,0 +1,1011 @@
+import asyncio
+import fnmatch
+import json
+import logging
+import math
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple,
+    TypeVar, Union,
+)
+
+from redis.exceptions import ResponseError
+
+from pyserver.storage.backend.memory import WRONGTYPE, MemoryPubSub
+from pyserver.storage.backend.protocol import Number, ScoreBound, Script, is_node_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyspace (
+    key TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    expires_at REAL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS strings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS hashes (
+    key TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, field)
+) WITHOUT ROWID;
+
+-- Node hashes (urlife:<user>:node): field is the node ID, value the node JSON.
+-- A rowid table, so the planner weighs the secondary indexes against the key.
+CREATE TABLE IF NOT EXISTS nodes (
+    key TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL CHECK (json_valid(value)),
+    parent_id TEXT GENERATED ALWAYS AS (json_extract(value, '$.parent.parent_id')) VIRTUAL,
+    object_type TEXT GENERATED ALWAYS AS (json_extract(value, '$.object_type')) VIRTUAL,
+    caption TEXT GENERATED ALWAYS AS (json_extract(value, '$.caption')) VIRTUAL,
+    creation_time INTEGER GENERATED ALWAYS AS (json_extract(value, '$.creation_time')) VIRTUAL,
+    PRIMARY KEY (key, field)
+);
+CREATE INDEX IF NOT EXISTS nodes_parent_id ON nodes (key, parent_id);
+CREATE INDEX IF NOT EXISTS nodes_object_type ON nodes (key, object_type);
+CREATE INDEX IF NOT EXISTS nodes_caption ON nodes (key, caption);
+CREATE INDEX IF NOT EXISTS nodes_creation_time ON nodes (key, creation_time);
+
+CREATE TABLE IF NOT EXISTS sets (
+    key TEXT NOT NULL,
+    member TEXT NOT NULL,
+    PRIMARY KEY (key, member)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS zsets (
+    key TEXT NOT NULL,
+    member TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (key, member)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS zsets_score ON zsets (key, score, member);
+
+CREATE TABLE IF NOT EXISTS lists (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS streams (
+    key TEXT NOT NULL,
+    ms INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (key, ms, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stream_meta (
+    key TEXT PRIMARY KEY,
+    last_ms INTEGER NOT NULL DEFAULT 0,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    deleted_ms INTEGER NOT NULL DEFAULT 0,
+    deleted_seq INTEGER NOT NULL DEFAULT 0,
+    entries_added INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+# Tables holding each Redis type's data, keyed by `key`
+TYPE_TABLES = {
+    "string": ("strings",),
+    "hash": ("hashes", "nodes"),
+    "set": ("sets",),
+    "zset": ("zsets",),
+    "list": ("lists",),
+    "stream": ("streams", "stream_meta"),
+}
+
+# Upper bound on parent-link walks, in case of a cycle
+MAX_TREE_DEPTH = 1000
+
+
+def _flatten(keys: Union[str, Iterable[str]], args: Tuple[str, ...]) -> List[str]:
+    if isinstance(keys, str):
+        return [keys, *args]
+    return [*keys, *args]
+
+
+def _hash_table(key: str) -> str:
+    return "nodes" if is_node_hash(key) else "hashes"
+
+
+def _score_clause(bound: ScoreBound, upper: bool) -> Tuple[str, float]:
+    text = str(bound)
+    exclusive = text.startswith("(")
+    value = float(text[1:] if exclusive else text)
+    if upper:
+        return ("score < ?" if exclusive else "score <= ?"), value
+    return ("score > ?" if exclusive else "score >= ?"), value
+
+
+def _lex_clause(bound: str, upper: bool) -> Tuple[str, List[str]]:
+    if bound == ("+" if upper else "-"):
+        return "1", []
+    if bound[:1] not in ("[", "("):
+        raise ResponseError("min or max not valid string range item")
+    exclusive = bound.startswith("(")
+    op = ("<" if exclusive else "<=") if upper else (">" if exclusive else ">=")
+    return f"member {op} ?", [bound[1:]]
+
+
+def _limit(start: Optional[int], num: Optional[int]) -> str:
+    if start is None:
+        return ""
+    return f" LIMIT {int(num) if num is not None and num >= 0 else -1} OFFSET {int(start)}"
+
+
+def _stream_bound(bound: str, upper: bool) -> Tuple[str, Tuple[int, int]]:
+    if bound in ("-", "+"):
+        return "1", (0, 0)
+    exclusive = bound.startswith("(")
+    text = bound[1:] if exclusive else bound
+    ms, _, seq = text.partition("-")
+    point = (int(ms), int(seq) if seq else (2 ** 63 - 1 if upper else 0))
+    if upper:
+        return ("(ms, seq) < (?, ?)" if exclusive else "(ms, seq) <= (?, ?)"), point
+    return ("(ms, seq) > (?, ?)" if exclusive else "(ms, seq) >= (?, ?)"), point
+
+
+class _Commands:
+    def __init__(self, conn: sqlite3.Connection, writable: bool):
+        """
+        Redis command semantics over one SQLite connection. Synchronous: callers run
+        it on the pool's threads, inside a transaction for writes.
+        """
+        self.conn = conn
+        self.writable = writable
+
+    # Keyspace
+
+    def _type(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT type, expires_at FROM keyspace WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            if self.writable:
+                self._drop(key, row[0])
+            return None
+        return row[0]
+
+    def _check(self, key: str, kind: str) -> bool:
+        """True if `key` exists with type `kind`; raises WRONGTYPE for other types."""
+        actual = self._type(key)
+        if actual is None:
+            return False
+        if actual != kind:
+            raise ResponseError(WRONGTYPE)
+        return True
+
+    def _claim(self, key: str, kind: str) -> None:
+        if not self._check(key, kind):
+            self.conn.execute("INSERT INTO keyspace (key, type) VALUES (?, ?)", (key, kind))
+
+    def _drop(self, key: str, kind: str) -> None:
+        for table in TYPE_TABLES[kind]:
+            self.conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+        self.conn.execute("DELETE FROM keyspace WHERE key = ?", (key,))
+
+    def _drop_if_empty(self, key: str, table: str) -> None:
+        # Redis deletes emptied collections, but keeps empty streams
+        if self.conn.execute(f"SELECT 1 FROM {table} WHERE key = ? LIMIT 1", (key,)).fetchone() is None:
+            self.conn.execute("DELETE FROM keyspace WHERE key = ?", (key,))
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            kind = self._type(key)
+            if kind is not None:
+                self._drop(key, kind)
+                removed += 1
+        return removed
+
+    def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._type(key) is not None)
+
+    def keys(self, pattern: str = "*") -> List[str]:
+        rows = self.conn.execute(
+            "SELECT key FROM keyspace WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)
+        )
+        return [key for (key,) in rows if fnmatch.fnmatchcase(key, pattern)]
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if self._type(key) is None:
+            return False
+        self.conn.execute(
+            "UPDATE keyspace SET expires_at = ? WHERE key = ?", (time.time() + seconds, key)
+        )
+        return True
+
+    # Strings and counters
+
+    def get(self, key: str) -> Optional[str]:
+        if not self._check(key, "string"):
+            return None
+        row = self.conn.execute("SELECT value FROM strings WHERE key = ?", (key,)).fetchone()
+        return row[0]
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        kind = self._type(key)
+        if nx and kind is not None:
+            return None
+        if kind is not None:
+            self._drop(key, kind)
+        expires_at = time.time() + ex if ex is not None else None
+        self.conn.execute(
+            "INSERT INTO keyspace (key, type, expires_at) VALUES (?, 'string', ?)", (key, expires_at)
+        )
+        self.conn.execute("INSERT INTO strings (key, value) VALUES (?, ?)", (key, str(value)))
+        return True
+
+    def mget(self, keys: Iterable[str], *args: str) -> List[Optional[str]]:
+        results = []
+        for key in _flatten(keys, args):
+            results.append(self.get(key) if self._type(key) == "string" else None)
+        return results
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        current = self.get(key)
+        try:
+            value = int(current or 0) + amount
+        except ValueError:
+            raise ResponseError("value is not an integer or out of range")
+        self._claim(key, "string")
+        self.conn.execute(
+            "INSERT INTO strings (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+        return value
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self.incrby(key, amount)
+
+    # Hashes
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        if not self._check(key, "hash"):
+            return None
+        row = self.conn.execute(
+            f"SELECT value FROM {_hash_table(key)} WHERE key = ? AND field = ?", (key, field)
+        ).fetchone()
+        return row[0] if row else None
+
+    def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Mapping[str, Any]] = None,
+    ) -> int:
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        self._claim(key, "hash")
+        table = _hash_table(key)
+        added = 0
+        for f, v in items.items():
+            existed = self.conn.execute(
+                f"SELECT 1 FROM {table} WHERE key = ? AND field = ?", (key, f)
+            ).fetchone()
+            self.conn.execute(
+                f"INSERT INTO {table} (key, field, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (key, field) DO UPDATE SET value = excluded.value",
+                (key, f, str(v)),
+            )
+            added += existed is None
+        return added
+
+    def hdel(self, key: str, *fields: str) -> int:
+        if not self._check(key, "hash"):
+            return 0
+        table = _hash_table(key)
+        removed = 0
+        for f in fields:
+            removed += self.conn.execute(
+                f"DELETE FROM {table} WHERE key = ? AND field = ?", (key, f)
+            ).rowcount
+        self._drop_if_empty(key, table)
+        return removed
+
+    def hmget(self, key: str, keys: Iterable[str], *args: str) -> List[Optional[str]]:
+        fields = _flatten(keys, args)
+        if not self._check(key, "hash"):
+            return [None] * len(fields)
+        found: Dict[str, str] = {}
+        table = _hash_table(key)
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(fields), 500):
+            chunk = fields[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT field, value FROM {table} WHERE key = ? "
+                f"AND field IN ({','.join('?' * len(chunk))})",
+                (key, *chunk),
+            )
+            found.update(rows)
+        return [found.get(f) for f in fields]
+
+    def hgetall(self, key: str) -> Dict[str, str]:
+        if not self._check(key, "hash"):
+            return {}
+        return dict(self.conn.execute(
+            f"SELECT field, value FROM {_hash_table(key)} WHERE key = ?", (key,)
+        ))
+
+    def hkeys(self, key: str) -> List[str]:
+        return list(self.hgetall(key))
+
+    def hvals(self, key: str) -> List[str]:
+        return list(self.hgetall(key).values())
+
+    def hlen(self, key: str) -> int:
+        if not self._check(key, "hash"):
+            return 0
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM {_hash_table(key)} WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+    def hexists(self, key: str, field: str) -> bool:
+        return self.hget(key, field) is not None
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        value = int(self.hget(key, field) or 0) + amount
+        self.hset(key, field, str(value))
+        return value
+
+    # Sets
+
+    def sadd(self, key: str, *members: str) -> int:
+        self._claim(key, "set")
+        return sum(
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sets (key, member) VALUES (?, ?)", (key, str(m))
+            ).rowcount
+            for m in members
+        )
+
+    def srem(self, key: str, *members: str) -> int:
+        if not self._check(key, "set"):
+            return 0
+        removed = sum(
+            self.conn.execute("DELETE FROM sets WHERE key = ? AND member = ?", (key, m)).rowcount
+            for m in members
+        )
+        self._drop_if_empty(key, "sets")
+        return removed
+
+    def smembers(self, key: str) -> Set[str]:
+        if not self._check(key, "set"):
+            return set()
+        return {m for (m,) in self.conn.execute("SELECT member FROM sets WHERE key = ?", (key,))}
+
+    def sismember(self, key: str, member: str) -> bool:
+        if not self._check(key, "set"):
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM sets WHERE key = ? AND member = ?", (key, member)
+        ).fetchone() is not None
+
+    def smismember(self, key: str, members: Iterable[str], *args: str) -> List[bool]:
+        return [self.sismember(key, m) for m in _flatten(members, args)]
+
+    def scard(self, key: str) -> int:
+        if not self._check(key, "set"):
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM sets WHERE key = ?", (key,)).fetchone()[0]
+
+    def sinter(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]:
+        names = _flatten(keys, args)
+        if not all(self._check(key, "set") for key in names):
+            return set()
+        # Drive the join from the smallest set; the rest are primary-key probes
+        names.sort(key=self.scard)
+        query = "SELECT s0.member FROM sets s0"
+        for i in range(1, len(names)):
+            query += f" JOIN sets s{i} ON s{i}.key = ? AND s{i}.member = s0.member"
+        query += " WHERE s0.key = ?"
+        return {m for (m,) in self.conn.execute(query, (*names[1:], names[0]))}
+
+    def sintercard(self, numkeys: int, keys: List[str], limit: int = 0) -> int:
+        count = len(self.sinter(list(keys)[:numkeys]))
+        return min(count, limit) if limit else count
+
+    def sunion(self, keys: Union[str, Iterable[str]], *args: str) -> Set[str]:
+        result: Set[str] = set()
+        for key in _flatten(keys, args):
+            result |= self.smembers(key)
+        return result
+
+    def _store_set(self, dest: str, members: Set[str]) -> int:
+        self.delete(dest)
+        if members:
+            self.sadd(dest, *members)
+        return len(members)
+
+    def sinterstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int:
+        return self._store_set(dest, self.sinter(keys, *args))
+
+    def sunionstore(self, dest: str, keys: Union[str, Iterable[str]], *args: str) -> int:
+        return self._store_set(dest, self.sunion(keys, *args))
+
+    # Sorted sets
+
+    def zadd(self, key: str, mapping: Mapping[str, Number], nx: bool = False, xx: bool = False) -> int:
+        self._claim(key, "zset")
+        added = 0
+        for member, score in mapping.items():
+            exists = self.zscore(key, member) is not None
+            if (nx and exists) or (xx and not exists):
+                continue
+            self.conn.execute(
+                "INSERT INTO zsets (key, member, score) VALUES (?, ?, ?) "
+                "ON CONFLICT (key, member) DO UPDATE SET score = excluded.score",
+                (key, member, float(score)),
+            )
+            added += not exists
+        self._drop_if_empty(key, "zsets")
+        return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        if not self._check(key, "zset"):
+            return 0
+        removed = sum(
+            self.conn.execute("DELETE FROM zsets WHERE key = ? AND member = ?", (key, m)).rowcount
+            for m in members
+        )
+        self._drop_if_empty(key, "zsets")
+        return removed
+
+    def zscore(self, key: str, member: str) -> Optional[float]:
+        if not self._check(key, "zset"):
+            return None
+        row = self.conn.execute(
+            "SELECT score FROM zsets WHERE key = ? AND member = ?", (key, member)
+        ).fetchone()
+        return row[0] if row else None
+
+    def zincrby(self, key: str, amount: Number, member: str) -> float:
+        score = (self.zscore(key, member) or 0.0) + float(amount)
+        self.zadd(key, {member: score})
+        return score
+
+    def zcard(self, key: str) -> int:
+        if not self._check(key, "zset"):
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM zsets WHERE key = ?", (key,)).fetchone()[0]
+
+    def _score_range(
+        self,
+        key: str,
+        min_bound: ScoreBound,
+        max_bound: ScoreBound,
+        select: str,
+        desc: bool = False,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+    ) -> List[Tuple[Any, ...]]:
+        if not self._check(key, "zset"):
+            return []
+        low, low_value = _score_clause(min_bound, upper=False)
+        high, high_value = _score_clause(max_bound, upper=True)
+        order = "score DESC, member DESC" if desc else "score, member"
+        return self.conn.execute(
+            f"SELECT {select} FROM zsets WHERE key = ? AND {low} AND {high} "
+            f"ORDER BY {order}{_limit(start, num)}",
+            (key, low_value, high_value),
+        ).fetchall()
+
+    @staticmethod
+    def _members(rows: List[Tuple[str, float]], withscores: bool) -> List[Any]:
+        return [(m, s) for m, s in rows] if withscores else [m for m, _ in rows]
+
+    def zcount(self, key: str, min: ScoreBound, max: ScoreBound) -> int:
+        rows = self._score_range(key, min, max, "COUNT(*)")
+        return rows[0][0] if rows else 0
+
+    def zrange(self, key: str, start: int, end: int, desc: bool = False, withscores: bool = False) -> List[Any]:
+        size = self.zcard(key)
+        first = max(start + size if start < 0 else start, 0)
+        last = min(end + size if end < 0 else end, size - 1)
+        if first > last:
+            return []
+        order = "score DESC, member DESC" if desc else "score, member"
+        rows = self.conn.execute(
+            f"SELECT member, score FROM zsets WHERE key = ? ORDER BY {order} LIMIT ? OFFSET ?",
+            (key, last - first + 1, first),
+        ).fetchall()
+        return self._members(rows, withscores)
+
+    def zrangebyscore(
+        self,
+        key: str,
+        min: ScoreBound,
+        max: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        rows = self._score_range(key, min, max, "member, score", start=start, num=num)
+        return self._members(rows, withscores)
+
+    def zrevrangebyscore(
+        self,
+        key: str,
+        max: ScoreBound,
+        min: ScoreBound,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        rows = self._score_range(key, min, max, "member, score", desc=True, start=start, num=num)
+        return self._members(rows, withscores)
+
+    def zrangebylex(
+        self, key: str, min: str, max: str, start: Optional[int] = None, num: Optional[int] = None
+    ) -> List[str]:
+        if not self._check(key, "zset"):
+            return []
+        low, low_args = _lex_clause(min, upper=False)
+        high, high_args = _lex_clause(max, upper=True)
+        rows = self.conn.execute(
+            f"SELECT member FROM zsets WHERE key = ? AND {low} AND {high} "
+            f"ORDER BY member{_limit(start, num)}",
+            (key, *low_args, *high_args),
+        )
+        return [m for (m,) in rows]
+
+    def zremrangebyscore(self, key: str, min: ScoreBound, max: ScoreBound) -> int:
+        if not self._check(key, "zset"):
+            return 0
+        low, low_value = _score_clause(min, upper=False)
+        high, high_value = _score_clause(max, upper=True)
+        removed = self.conn.execute(
+            f"DELETE FROM zsets WHERE key = ? AND {low} AND {high}", (key, low_value, high_value)
+        ).rowcount
+        self._drop_if_empty(key, "zsets")
+        return removed
+
+    # Lists
+
+    def rpush(self, key: str, *values: str) -> int:
+        self._claim(key, "list")
+        (last,) = self.conn.execute("SELECT MAX(seq) FROM lists WHERE key = ?", (key,)).fetchone()
+        seq = 0 if last is None else last + 1
+        self.conn.executemany(
+            "INSERT INTO lists (key, seq, value) VALUES (?, ?, ?)",
+            [(key, seq + i, str(v)) for i, v in enumerate(values)],
+        )
+        return self.conn.execute("SELECT COUNT(*) FROM lists WHERE key = ?", (key,)).fetchone()[0]
+
+    def lpop(self, key: str) -> Optional[str]:
+        if not self._check(key, "list"):
+            return None
+        row = self.conn.execute(
+            "SELECT seq, value FROM lists WHERE key = ? ORDER BY seq LIMIT 1", (key,)
+        ).fetchone()
+        self.conn.execute("DELETE FROM lists WHERE key = ? AND seq = ?", (key, row[0]))
+        self._drop_if_empty(key, "lists")
+        return row[1]
+
+    def lrange(self, key: str, start: int, end: int) -> List[str]:
+        if not self._check(key, "list"):
+            return []
+        values = [v for (v,) in self.conn.execute(
+            "SELECT value FROM lists WHERE key = ? ORDER BY seq", (key,)
+        )]
+        size = len(values)
+        first = start + size if start < 0 else start
+        last = end + size if end < 0 else end
+        return values[max(first, 0):last + 1]
+
+    # Streams
+
+    def _stream_meta(self, name: str) -> Tuple[int, int, int, int, int]:
+        row = self.conn.execute(
+            "SELECT last_ms, last_seq, deleted_ms, deleted_seq, entries_added "
+            "FROM stream_meta WHERE key = ?", (name,)
+        ).fetchone()
+        return row or (0, 0, 0, 0, 0)
+
+    def xadd(
+        self,
+        name: str,
+        fields: Mapping[str, str],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        self._claim(name, "stream")
+        last_ms, last_seq, _, _, _ = self._stream_meta(name)
+        if id == "*":
+            now = int(time.time() * 1000)
+            ms, seq = (now, 0) if now > last_ms else (last_ms, last_seq + 1)
+        else:
+            ms_text, _, seq_text = id.partition("-")
+            ms, seq = int(ms_text), int(seq_text or 0)
+            if (ms, seq) <= (last_ms, last_seq):
+                raise ResponseError(
+                    "The ID specified in XADD is equal or smaller than the target stream top item"
+                )
+        self.conn.execute(
+            "INSERT INTO streams (key, ms, seq, fields) VALUES (?, ?, ?, ?)",
+            (name, ms, seq, json.dumps({k: str(v) for k, v in fields.items()})),
+        )
+        self.conn.execute(
+            "INSERT INTO stream_meta (key, last_ms, last_seq, entries_added) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET last_ms = excluded.last_ms, "
+            "last_seq = excluded.last_seq, entries_added = entries_added + 1",
+            (name, ms, seq),
+        )
+        if maxlen is not None:
+            self.xtrim(name, maxlen)
+        return f"{ms}-{seq}"
+
+    def _stream_range(
+        self, name: str, min: str, max: str, desc: bool, count: Optional[int]
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        if not self._check(name, "stream"):
+            return []
+        low, low_point = _stream_bound(min, upper=False)
+        high, high_point = _stream_bound(max, upper=True)
+        params: List[Any] = [name]
+        if low != "1":
+            params.extend(low_point)
+        if high != "1":
+            params.extend(high_point)
+        order = "ms DESC, seq DESC" if desc else "ms, seq"
+        rows = self.conn.execute(
+            f"SELECT ms, seq, fields FROM streams WHERE key = ? AND {low} AND {high} "
+            f"ORDER BY {order}{_limit(0, count) if count is not None else ''}",
+            params,
+        )
+        return [(f"{ms}-{seq}", json.loads(fields)) for ms, seq, fields in rows]
+
+    def xrange(
+        self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        return self._stream_range(name, min, max, desc=False, count=count)
+
+    def xrevrange(
+        self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        return self._stream_range(name, min, max, desc=True, count=count)
+
+    def xlen(self, name: str) -> int:
+        if not self._check(name, "stream"):
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM streams WHERE key = ?", (name,)).fetchone()[0]
+
+    def xtrim(self, name: str, maxlen: Optional[int] = None, approximate: bool = True) -> int:
+        excess = self.xlen(name) - (maxlen if maxlen is not None else math.inf)
+        if excess <= 0:
+            return 0
+        doomed = self.conn.execute(
+            "SELECT ms, seq FROM streams WHERE key = ? ORDER BY ms, seq LIMIT ?", (name, excess)
+        ).fetchall()
+        last_ms, last_seq = doomed[-1]
+        self.conn.execute(
+            "DELETE FROM streams WHERE key = ? AND (ms, seq) <= (?, ?)", (name, last_ms, last_seq)
+        )
+        self.conn.execute(
+            "UPDATE stream_meta SET deleted_ms = ?, deleted_seq = ? WHERE key = ?",
+            (last_ms, last_seq, name),
+        )
+        return len(doomed)
+
+    def xinfo_stream(self, name: str) -> Dict[str, Any]:
+        if not self._check(name, "stream"):
+            raise ResponseError("no such key")
+        last_ms, last_seq, deleted_ms, deleted_seq, entries_added = self._stream_meta(name)
+        first = self.xrange(name, count=1)
+        last = self.xrevrange(name, count=1)
+        return {
+            "length": self.xlen(name),
+            "last-generated-id": f"{last_ms}-{last_seq}",
+            "max-deleted-entry-id": f"{deleted_ms}-{deleted_seq}",
+            "entries-added": entries_added,
+            "first-entry": first[0] if first else None,
+            "last-entry": last[0] if last else None,
+        }
+
+    # Tree queries over the nodes table
+
+    def ancestors(self, key: str, node_id: str) -> List[str]:
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE chain (id, depth) AS (
+                SELECT parent_id, 1 FROM nodes WHERE key = ?1 AND field = ?2
+                UNION ALL
+                SELECT n.parent_id, c.depth + 1
+                FROM nodes n JOIN chain c ON n.key = ?1 AND n.field = c.id
+                WHERE c.depth < ?3
+            )
+            SELECT c.id FROM chain c JOIN nodes n ON n.key = ?1 AND n.field = c.id
+            ORDER BY c.depth
+            """,
+            (key, node_id, MAX_TREE_DEPTH),
+        )
+        return [node for (node,) in rows]
+
+    def children(self, key: str, parent_id: str) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT field FROM nodes WHERE key = ? AND parent_id = ? ORDER BY creation_time",
+            (key, parent_id),
+        )
+        return [node for (node,) in rows]
+
+
+READ_COMMANDS = (
+    "exists", "keys", "get", "mget", "hget", "hmget", "hgetall", "hkeys", "hvals", "hlen",
+    "hexists", "smembers", "sismember", "smismember", "scard", "sinter", "sintercard", "sunion",
+    "zscore", "zcard", "zcount", "zrange", "zrangebyscore", "zrevrangebyscore", "zrangebylex",
+    "lrange", "xrange", "xrevrange", "xlen", "xinfo_stream", "ancestors", "children",
+)
+
+WRITE_COMMANDS = (
+    "delete", "expire", "set", "incr", "incrby", "hset", "hdel", "hincrby", "sadd", "srem",
+    "sinterstore", "sunionstore", "zadd", "zrem", "zincrby", "zremrangebyscore", "rpush", "lpop",
+    "xadd", "xtrim",
+)
+
+
+class SqlitePool:
+    def __init__(self, path: str, readers: int = 4):
+        """
+        Connection pool for one SQLite database in WAL mode.
+
+        SQLite allows a single writer, so all writes go through one connection on a
+        dedicated thread, each job in its own IMMEDIATE transaction. Reads use a
+        separate set of connections on worker threads and see the last committed
+        state without blocking the writer. Blocking calls never run on the event loop.
+
+        Args:
+            path: Database file
+            readers: Number of read connections (and read threads)
+        """
+        self.path = path
+        self.writer = self._connect()
+        self.writer.executescript(SCHEMA)
+        self._write_lock = asyncio.Lock()
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._read_executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._readers = [self._connect() for _ in range(readers)]
+        self._idle: Optional[asyncio.Queue] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _run_transaction(self, job: Callable[[sqlite3.Connection], T]) -> T:
+        self.writer.execute("BEGIN IMMEDIATE")
+        try:
+            result = job(self.writer)
+        except BaseException:
+            self.writer.execute("ROLLBACK")
+            raise
+        self.writer.execute("COMMIT")
+        return result
+
+    async def write(self, job: Callable[[sqlite3.Connection], T]) -> T:
+        async with self._write_lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._write_executor, self._run_transaction, job)
+
+    async def read(self, job: Callable[[sqlite3.Connection], T]) -> T:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for conn in self._readers:
+                self._idle.put_nowait(conn)
+        conn = await self._idle.get()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._read_executor, job, conn)
+        finally:
+            self._idle.put_nowait(conn)
+
+    def close(self) -> None:
+        self._write_executor.shutdown(wait=True)
+        self._read_executor.shutdown(wait=True)
+        for conn in [self.writer, *self._readers]:
+            conn.close()
+
+
+class _ScriptView:
+    """
+    Async facade over a transaction's commands, handed to a Script's Python body.
+    The commands run synchronously, so the body never suspends.
+    """
+
+    def __init__(self, commands: _Commands):
+        self._commands = commands
+
+    def __getattr__(self, name: str):
+        command = getattr(self._commands, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return command(*args, **kwargs)
+
+        return call
+
+
+def _run_script_body(body: Awaitable[T]) -> T:
+    # Drive the coroutine by hand on the writer thread; it only awaits _ScriptView calls
+    try:
+        body.send(None)
+    except StopIteration as done:
+        return done.value
+    body.close()
+    raise RuntimeError("Script bodies must only await backend commands")
+
+
+class SqlitePipeline:
+    def __init__(self, backend: "SqliteBackend", transaction: bool = True):
+        """Queues commands and applies them in a single SQLite transaction."""
+        self.backend = backend
+        self.transaction = transaction
+        self._commands: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+        self._publishes: List[Tuple[str, str]] = []
+
+    def __getattr__(self, name: str):
+        if name not in READ_COMMANDS and name not in WRITE_COMMANDS and name != "publish":
+            raise AttributeError(name)
+
+        def queue(*args: Any, **kwargs: Any) -> "SqlitePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        commands, self._commands = self._commands, []
+        published: List[Tuple[int, str, str]] = []
+
+        def job(conn: sqlite3.Connection) -> List[Any]:
+            sql = _Commands(conn, writable=True)
+            results: List[Any] = []
+            for i, (name, args, kwargs) in enumerate(commands):
+                if name == "publish":
+                    # Delivered after commit, like Redis does at EXEC
+                    published.append((i, *args))
+                    results.append(0)
+                    continue
+                try:
+                    results.append(getattr(sql, name)(*args, **kwargs))
+                except ResponseError as e:
+                    results.append(e)
+            return results
+
+        results = await self.backend.pool.write(job)
+        for i, channel, message in published:
+            results[i] = await self.backend.publish(channel, message)
+
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+    async def reset(self) -> None:
+        self._commands = []
+
+    async def __aenter__(self) -> "SqlitePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.reset()
+
+
+def _reader(name: str):
+    async def command(self: "SqliteBackend", *args: Any, **kwargs: Any) -> Any:
+        return await self.pool.read(
+            lambda conn: getattr(_Commands(conn, writable=False), name)(*args, **kwargs)
+        )
+
+    command.__name__ = name
+    return command
+
+
+def _writer(name: str):
+    async def command(self: "SqliteBackend", *args: Any, **kwargs: Any) -> Any:
+        return await self.pool.write(
+            lambda conn: getattr(_Commands(conn, writable=True), name)(*args, **kwargs)
+        )
+
+    command.__name__ = name
+    return command
+
+
+class SqliteBackend:
+    def __init__(self, path: str, readers: int = 4):
+        """
+        Embedded storage engine on a single SQLite file (WAL mode).
+
+        Implements the StorageBackend protocol for single-node deployments. Every
+        Redis type gets its own table; node hashes live in a `nodes` table with the
+        node JSON plus indexed generated columns (parent_id, object_type, caption,
+        creation_time), which also back the tree queries (`ancestors` via a
+        recursive CTE, `children`). Pipelines commit as one transaction.
+        Pub/sub is delivered in-process only.
+
+        Args:
+            path: Database file, created if missing
+            readers: Size of the read connection pool
+        """
+        self.path = path
+        self.pool = SqlitePool(path, readers)
+        self._subscribers: Dict[str, Set[MemoryPubSub]] = {}
+        logger.info(f"🗄️ Opened SQLite storage at {path}")
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator[str]:
+        for key in await self.keys(match or "*"):
+            yield key
+
+    async def hscan_iter(
+        self, key: str, match: Optional[str] = None, count: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, str]]:
+        for field, value in (await self.hgetall(key)).items():
+            if match is None or fnmatch.fnmatchcase(field, match):
+                yield field, value
+
+    async def publish(self, channel: str, message: str) -> int:
+        subscribers = self._subscribers.get(channel, set())
+        for subscriber in subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self) -> MemoryPubSub:
+        return MemoryPubSub(self)
+
+    def pipeline(self, transaction: bool = True) -> SqlitePipeline:
+        return SqlitePipeline(self, transaction)
+
+    async def run_script(self, script: Script, keys: List[str], args: List[Any]) -> Any:
+        # The body runs as one writer job, so it's atomic like a script on Redis
+        return await self.pool.write(
+            lambda conn: _run_script_body(
+                script.python(_ScriptView(_Commands(conn, writable=True)), keys, args)
+            )
+        )
+
+    async def flushdb(self) -> bool:
+        def job(conn: sqlite3.Connection) -> bool:
+            for tables in TYPE_TABLES.values():
+                for table in tables:
+                    conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM keyspace")
+            return True
+
+        return await self.pool.write(job)
+
+    async def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        """Close every connection. The backend can't be used afterwards."""
+        self.pool.close()
+
+
+for _name in READ_COMMANDS:
+    setattr(SqliteBackend, _name, _reader(_name))
+for _name in WRITE_COMMANDS:
+    setattr(SqliteBackend, _name, _writer(_name))
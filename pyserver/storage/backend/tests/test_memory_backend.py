@@ -0,0 +1,101 @@
+import pytest
+from redis.exceptions import ResponseError
+
+from pyserver.storage.backend import MemoryBackend, Script
+
+
+async def _incr_if_below(backend, keys, args):
+    current = int(await backend.get(keys[0]) or 0)
+    if current >= int(args[0]):
+        return current
+    return await backend.incr(keys[0])
+
+INCR_IF_BELOW = Script(
+    name="incr_if_below",
+    lua="""
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current >= tonumber(ARGV[1]) then return current end
+return redis.call('INCR', KEYS[1])
+""",
+    python=_incr_if_below,
+)
+
+@pytest.fixture
+def backend():
+    return MemoryBackend()
+
+@pytest.mark.asyncio
+async def test_hashes_and_sets(backend: MemoryBackend):
+    assert await backend.hset("h", "a", "1") == 1
+    assert await backend.hset("h", mapping={"a": "2", "b": "3"}) == 1
+    assert await backend.hmget("h", ["a", "b", "c"]) == ["2", "3", None]
+    assert await backend.hdel("h", "a", "b") == 2
+    assert await backend.exists("h") == 0  # emptied collections disappear
+
+    await backend.sadd("s1", "x", "y", "z")
+    await backend.sadd("s2", "y", "z")
+    assert await backend.sinter(["s1", "s2"]) == {"y", "z"}
+    assert await backend.sintercard(2, ["s1", "s2"], limit=1) == 1
+    assert await backend.smismember("s1", ["x", "q"]) == [True, False]
+
+@pytest.mark.asyncio
+async def test_wrong_type_raises(backend: MemoryBackend):
+    await backend.sadd("k", "member")
+    with pytest.raises(ResponseError):
+        await backend.hget("k", "field")
+
+@pytest.mark.asyncio
+async def test_sorted_set_ranges(backend: MemoryBackend):
+    await backend.zadd("z", {"a": 1, "b": 2, "c": 2, "d": 3})
+    assert await backend.zrangebyscore("z", 2, "+inf") == ["b", "c", "d"]
+    assert await backend.zrangebyscore("z", "(1", "(3") == ["b", "c"]
+    assert await backend.zrevrangebyscore("z", "+inf", "-inf", start=0, num=2) == ["d", "c"]
+    assert await backend.zrange("z", -2, -1) == ["c", "d"]
+    assert await backend.zcount("z", "-inf", 2) == 3
+
+    await backend.zadd("z", {"a": 5})  # re-scoring moves the member
+    assert await backend.zrange("z", -1, -1, withscores=True) == [("a", 5.0)]
+
+    await backend.zadd("lex", {"apple": 0, "apricot": 0, "banana": 0})
+    assert await backend.zrangebylex("lex", "[ap", "[ap\xff") == ["apple", "apricot"]
+
+@pytest.mark.asyncio
+async def test_stream_ids_trimming_and_ranges(backend: MemoryBackend):
+    ids = [await backend.xadd("st", {"n": str(i)}, maxlen=3) for i in range(5)]
+    assert ids == sorted(ids, key=lambda i: tuple(map(int, i.split("-"))))
+    assert [entry_id for entry_id, _ in await backend.xrange("st")] == ids[2:]
+    assert [entry_id for entry_id, _ in await backend.xrange("st", min=f"({ids[2]}")] == ids[3:]
+
+    info = await backend.xinfo_stream("st")
+    assert info["max-deleted-entry-id"] == ids[1]
+    with pytest.raises(ResponseError):
+        await backend.xinfo_stream("missing")
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_commands_in_order(backend: MemoryBackend):
+    pipe = backend.pipeline()
+    pipe.hset("h", "f", "v")
+    pipe.sadd("h", "oops")
+    pipe.incr("counter")
+    results = await pipe.execute(raise_on_error=False)
+
+    assert results[0] == 1
+    assert isinstance(results[1], ResponseError)
+    assert results[2] == 1
+
+@pytest.mark.asyncio
+async def test_pubsub_delivers_published_messages(backend: MemoryBackend):
+    pubsub = backend.pubsub()
+    await pubsub.subscribe("chan")
+    assert await backend.publish("chan", "hello") == 1
+
+    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+    assert message["data"] == "hello"
+    await pubsub.aclose()
+    assert await backend.publish("chan", "ignored") == 0
+
+@pytest.mark.asyncio
+async def test_scripts_run_their_python_body(backend: MemoryBackend):
+    for _ in range(5):
+        await backend.run_script(INCR_IF_BELOW, ["limited"], [3])
+    assert await backend.get("limited") == "3"
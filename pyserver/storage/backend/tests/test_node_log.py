@@ -0,0 +1,124 @@
+import pytest
+
+from pyserver.storage.backend import LogBackend, MemoryBackend, NodeLog
+
+KEY = "urlife:test_user_log:node"
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return str(tmp_path / "log")
+
+def test_index_is_rebuilt_from_segments(log_dir):
+    log = NodeLog(log_dir, segment_bytes=256)
+    for i in range(20):
+        log.put(KEY, f"n{i}", f'{{"v": {i}}}')
+    log.put(KEY, "n0", '{"v": "latest"}')
+    log.delete(KEY, "n1")
+    assert len(log.segments) > 1
+    log.close()
+
+    reopened = NodeLog(log_dir, segment_bytes=256)
+    assert reopened.get(KEY, "n0") == '{"v": "latest"}'
+    assert reopened.get(KEY, "n1") is None
+    assert len(reopened.fields(KEY)) == 19
+    reopened.close()
+
+def test_torn_tail_is_discarded(log_dir):
+    log = NodeLog(log_dir, segment_bytes=4096)
+    log.put(KEY, "kept", "1")
+    log.put(KEY, "torn", "2")
+    end = log.active.end
+    # Simulate a crash halfway through writing the last record
+    log.active.mm[end - 3:end] = b"\xff\xff\xff"
+    log.close()
+
+    reopened = NodeLog(log_dir, segment_bytes=4096)
+    assert reopened.get(KEY, "kept") == "1"
+    assert reopened.get(KEY, "torn") is None
+    reopened.put(KEY, "after", "3")
+    reopened.close()
+
+    assert NodeLog(log_dir, segment_bytes=4096).get(KEY, "after") == "3"
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_live_records_and_tombstones(log_dir):
+    log = NodeLog(log_dir, segment_bytes=256)
+    log.put(KEY, "old", "gone soon")
+    for i in range(10):
+        log.put(KEY, "hot", str(i))
+    log.delete(KEY, "old")
+    log.put(KEY, "cold", "keep me")
+    for i in range(10):
+        log.put(KEY, "hot", f"again {i}")
+
+    candidates = log.compaction_candidates()
+    assert candidates
+    for segment_id in candidates:
+        await log.compact(segment_id)
+    assert log.get(KEY, "hot") == "again 9"
+    assert log.get(KEY, "cold") == "keep me"
+    log.close()
+
+    reopened = NodeLog(log_dir, segment_bytes=256)
+    assert reopened.get(KEY, "old") is None
+    assert reopened.get(KEY, "cold") == "keep me"
+    assert reopened.get(KEY, "hot") == "again 9"
+    reopened.close()
+
+@pytest.mark.asyncio
+async def test_tombstones_are_dropped_once_nothing_older_remains(log_dir):
+    log = NodeLog(log_dir, segment_bytes=256)
+    for i in range(10):
+        log.put(KEY, f"f{i}", "value")
+    for i in range(10):
+        log.delete(KEY, f"f{i}")
+    log.put(KEY, "live", "keep me")
+
+    # A sealed segment holding only tombstones isn't garbage while older values survive
+    behind = {segment_id for segment_id, _, _ in log.tombstones.values()} - {log.active.segment_id}
+    assert behind and not behind & set(log.compaction_candidates())
+
+    rounds = 0
+    while log.compaction_candidates():
+        rounds += 1
+        assert rounds < 10, "compaction keeps re-copying the same records"
+        for segment_id in log.compaction_candidates():
+            await log.compact(segment_id)
+    # Whatever tombstones survive sit in the active segment, and only until it's sealed
+    assert {segment_id for segment_id, _, _ in log.tombstones.values()} <= {log.active.segment_id}
+    assert log.get(KEY, "f3") is None
+    assert log.get(KEY, "live") == "keep me"
+    log.close()
+
+    reopened = NodeLog(log_dir, segment_bytes=256)
+    assert reopened.get(KEY, "f3") is None
+    assert reopened.get(KEY, "live") == "keep me"
+    reopened.close()
+
+
+def test_a_directory_is_opened_by_one_log_at_a_time(log_dir):
+    log = NodeLog(log_dir, segment_bytes=256)
+    with pytest.raises(RuntimeError):
+        NodeLog(log_dir, segment_bytes=256)
+    log.close()
+    NodeLog(log_dir, segment_bytes=256).close()
+
+
+@pytest.mark.asyncio
+async def test_backend_routes_only_node_hashes_to_the_log(log_dir):
+    base = MemoryBackend()
+    backend = LogBackend(log_dir, base)
+
+    pipe = backend.pipeline()
+    pipe.hset(KEY, "n1", '{"caption": "x"}')
+    pipe.sadd("urlife:test_user_log:direct_folder:f", "n1")
+    assert await pipe.execute() == [1, 1]
+
+    assert await backend.hmget(KEY, ["n1", "n2"]) == ['{"caption": "x"}', None]
+    assert await base.hget(KEY, "n1") is None
+    assert await backend.smembers("urlife:test_user_log:direct_folder:f") == {"n1"}
+    assert sorted(await backend.keys("urlife:test_user_log:*")) == [
+        "urlife:test_user_log:direct_folder:f", KEY,
+    ]
+    assert await backend.delete(KEY, "urlife:test_user_log:direct_folder:f") == 2
+    backend.shutdown()
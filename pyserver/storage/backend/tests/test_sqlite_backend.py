@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+from redis.exceptions import ResponseError
+
+from pyserver.storage.backend import Script, SqliteBackend, TreeQueries
+
+NODE_KEY = "urlife:test_user_sqlite:node"
+
+
+async def _swap(backend, keys, args):
+    first, second = await backend.get(keys[0]), await backend.get(keys[1])
+    await backend.set(keys[0], second)
+    await backend.set(keys[1], first)
+    return [second, first]
+
+SWAP = Script(
+    name="swap",
+    lua="""
+local first, second = redis.call('GET', KEYS[1]), redis.call('GET', KEYS[2])
+redis.call('SET', KEYS[1], second)
+redis.call('SET', KEYS[2], first)
+return {second, first}
+""",
+    python=_swap,
+)
+
+def _node(node_id, parent_id=None, creation_time=0):
+    node = {"node_id": node_id, "object_type": "GOAL", "caption": node_id, "creation_time": creation_time}
+    if parent_id:
+        node["parent"] = {"edge_label": "CHILD_OF", "parent_id": parent_id}
+    return json.dumps(node)
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "test.db"), readers=2)
+    yield backend
+    backend.shutdown()
+
+@pytest.mark.asyncio
+async def test_node_hash_supports_tree_queries(backend: SqliteBackend):
+    await backend.hset(NODE_KEY, mapping={
+        "root": _node("root"),
+        "a": _node("a", "root", 1),
+        "b": _node("b", "root", 2),
+        "a1": _node("a1", "a", 3),
+    })
+
+    assert isinstance(backend, TreeQueries)
+    assert await backend.ancestors(NODE_KEY, "a1") == ["a", "root"]
+    assert await backend.children(NODE_KEY, "root") == ["a", "b"]
+    assert await backend.hmget(NODE_KEY, ["a", "missing"]) == [_node("a", "root", 1), None]
+
+@pytest.mark.asyncio
+async def test_parent_lookups_use_the_index(backend: SqliteBackend):
+    plan = backend.pool.writer.execute(
+        "EXPLAIN QUERY PLAN SELECT field FROM nodes WHERE key = ? AND parent_id = ?", (NODE_KEY, "x")
+    ).fetchall()
+    assert any("nodes_parent_id" in row[-1] for row in plan)
+
+@pytest.mark.asyncio
+async def test_pipeline_commits_as_one_transaction(backend: SqliteBackend):
+    await backend.set("counter", "not a number")
+
+    pipe = backend.pipeline()
+    pipe.sadd("s", "x")
+    pipe.incr("counter")
+    pipe.zadd("z", {"m": 1})
+    results = await pipe.execute(raise_on_error=False)
+
+    # Like MULTI/EXEC, a failing command doesn't undo the others
+    assert results[0] == 1 and isinstance(results[1], ResponseError) and results[2] == 1
+    assert await backend.smembers("s") == {"x"}
+    assert await backend.zscore("z", "m") == 1.0
+
+@pytest.mark.asyncio
+async def test_types_ranges_and_streams(backend: SqliteBackend):
+    await backend.sadd("k", "member")
+    with pytest.raises(ResponseError):
+        await backend.hget("k", "f")
+
+    await backend.zadd("z", {"a": 1, "b": 2, "c": 3})
+    assert await backend.zrevrangebyscore("z", "+inf", "(1") == ["c", "b"]
+    assert await backend.zrange("z", -1, -1, withscores=True) == [("c", 3.0)]
+
+    ids = [await backend.xadd("st", {"n": str(i)}, maxlen=2) for i in range(4)]
+    assert [entry_id for entry_id, _ in await backend.xrange("st", min=f"({ids[2]}")] == ids[3:]
+    assert (await backend.xinfo_stream("st"))["max-deleted-entry-id"] == ids[1]
+
+    assert await backend.delete("z", "st", "k") == 3
+    assert await backend.keys("*") == []
+
+@pytest.mark.asyncio
+async def test_scripts_run_inside_a_transaction(backend: SqliteBackend):
+    await backend.set("x", "1")
+    await backend.set("y", "2")
+    assert await backend.run_script(SWAP, ["x", "y"], []) == ["2", "1"]
+    assert await backend.mget(["x", "y"]) == ["2", "1"]
+
+@pytest.mark.asyncio
+async def test_script_bodies_run_on_the_writer_thread(backend: SqliteBackend):
+    threads = []
+
+    async def set_then_fail(view, keys, args):
+        threads.append(threading.current_thread().name)
+        await view.set(keys[0], "changed")
+        raise ValueError("abort")
+
+    await backend.set("x", "1")
+    with pytest.raises(ValueError):
+        await backend.run_script(Script(name="fail", lua="", python=set_then_fail), ["x"], [])
+    assert threads[0].startswith("sqlite-writer")
+    assert await backend.get("x") == "1"
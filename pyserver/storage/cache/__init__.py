@@ -0,0 +1,10 @@
+# In-process caches for decoded storage objects
+
+from .node_cache import NodeCache, node_cache
+from .invalidation import CacheInvalidationListener
+
+__all__ = [
+    'NodeCache',
+    'node_cache',
+    'CacheInvalidationListener'
+]
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Optional
+
+from pyserver.storage.cache.node_cache import NodeCache, node_cache
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "urlife:cache:invalidate"
+RECONNECT_DELAY_SECONDS = float(os.environ.get("URLIFE_NODE_CACHE_RECONNECT_SECONDS", 1.0))
+
+# Lets a process skip the invalidations it published itself
+PROCESS_ID = uuid.uuid4().hex
+
+
+def invalidation_message(user_id: str, node_id: Optional[str]) -> str:
+    """Encode an invalidation. A node_id of None invalidates everything cached for the user."""
+    return json.dumps({"origin": PROCESS_ID, "user_id": user_id, "node_id": node_id})
+
+
+class CacheInvalidationListener:
+    def __init__(self, cache: NodeCache = node_cache):
+        """
+        Background subscriber that keeps the node cache coherent across workers.
+
+        The cache is only enabled while the subscription is live. Any error on the
+        channel disables (and clears) the cache until the subscription is restored.
+
+        Args:
+            cache: The cache to enable and invalidate
+        """
+        self.cache = cache
+        self.redis_manager = RedisManager()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.cache.disable()
+        await self.redis_manager.close()
+
+    def handle_message(self, data: str) -> None:
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            # Can't tell what changed, so nothing cached can be trusted
+            logger.warning(f"⚠️ Unparseable cache invalidation: {data!r}")
+            self.cache.clear()
+            return
+
+        if payload.get("origin") == PROCESS_ID:
+            return
+        if payload.get("node_id") is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(payload["user_id"], payload["node_id"])
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                conn = await self.redis_manager.get_connection()
+                pubsub = conn.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                logger.info(f"📡 Subscribed to cache invalidations on '{INVALIDATION_CHANNEL}'")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self.cache.enable()
+                    elif message["type"] == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation channel lost: {e}")
+            finally:
+                self.cache.disable()
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
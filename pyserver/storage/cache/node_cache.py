@@ -0,0 +1,192 @@
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple, Dict, Any
+
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+
+NODE_CACHE_MAX_BYTES = int(os.environ.get("URLIFE_NODE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+NODE_CACHE_MAX_ENTRIES = int(os.environ.get("URLIFE_NODE_CACHE_MAX_ENTRIES", 50_000))
+NODE_CACHE_TTL_SECONDS = float(os.environ.get("URLIFE_NODE_CACHE_TTL_SECONDS", 300))
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class _CacheEntry:
+    node: GraphNode
+    size: int
+    expires_at: float
+    # The stored JSON, when the filler had it, for passthrough reads
+    raw: Optional[str] = None
+
+
+@dataclass
+class NodeCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class NodeCache:
+    def __init__(
+        self,
+        max_bytes: int = NODE_CACHE_MAX_BYTES,
+        max_entries: int = NODE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = NODE_CACHE_TTL_SECONDS,
+    ):
+        """
+        Bounded per-process LRU/TTL cache of decoded GraphNodes keyed by (user_id, node_id).
+
+        The cache starts disabled and is only switched on by the invalidation listener
+        once it is subscribed, so a process without a live invalidation channel never
+        serves cached (possibly stale) nodes.
+
+        Args:
+            max_bytes: Upper bound on the summed encoded size of cached nodes
+            max_entries: Upper bound on the number of cached nodes
+            ttl_seconds: Maximum age of an entry before it is re-read from storage
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = False
+        self.stats = NodeCacheStats()
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._epoch = 0
+
+    @property
+    def epoch(self) -> int:
+        """Counter bumped on every invalidation; used to reject racing read-through fills."""
+        return self._epoch
+
+    def enable(self) -> None:
+        # Anything cached before (re)subscribing may have missed invalidations
+        self.clear()
+        self.enabled = True
+        logger.info("🧠 Node cache enabled")
+
+    def disable(self) -> None:
+        if self.enabled:
+            logger.warning("⚠️ Node cache disabled, falling back to direct reads")
+        self.enabled = False
+        self.clear()
+
+    def get(self, user_id: str, node_id: str) -> Optional[GraphNode]:
+        """
+        Return a private copy of the cached node, or None on a miss.
+        Callers are free to mutate the returned node.
+        """
+        entry = self._lookup(user_id, node_id)
+        return entry.node.model_copy(deep=True) if entry else None
+
+    def get_raw(self, user_id: str, node_id: str) -> Optional[str]:
+        """Return the cached node's stored JSON, or None on a miss or if it wasn't kept."""
+        entry = self._lookup(user_id, node_id)
+        return entry.raw if entry else None
+
+    def _lookup(self, user_id: str, node_id: str) -> Optional[_CacheEntry]:
+        if not self.enabled:
+            self.stats.bypasses += 1
+            return None
+
+        key = (user_id, node_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def put(
+        self,
+        user_id: str,
+        node: GraphNode,
+        size: int,
+        epoch: Optional[int] = None,
+        raw: Optional[str] = None,
+    ) -> None:
+        """
+        Cache a node.
+
+        Args:
+            user_id: Owner of the node
+            node: The decoded node; a private copy is stored
+            size: Approximate memory cost, the length of the encoded JSON
+            epoch: The cache epoch observed before the node was read. If any
+                invalidation arrived since, the fill is dropped.
+            raw: The node's stored JSON, kept for passthrough reads
+        """
+        if not self.enabled:
+            return
+        if epoch is not None and epoch != self._epoch:
+            return
+        if raw is not None:
+            size += len(raw)
+        if size > self.max_bytes:
+            return
+
+        key = (user_id, node.node_id)
+        self._remove(key)
+        self._entries[key] = _CacheEntry(
+            node=node.model_copy(deep=True),
+            size=size,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            raw=raw,
+        )
+        self._bytes += size
+
+        while self._entries and (
+            self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    def invalidate(self, user_id: str, node_id: str) -> None:
+        self._epoch += 1
+        self.stats.invalidations += 1
+        self._remove((user_id, node_id))
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current metrics for monitoring."""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "hit_rate": (self.stats.hits / lookups) if lookups else 0.0,
+            **asdict(self.stats),
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+# Shared by every NodeStorage in this process
+node_cache = NodeCache()
@@ -0,0 +1,113 @@
+import os
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("URLIFE_SEARCH_CACHE_MAX_ENTRIES", 10_000))
+# Summed result count across entries, so a few huge result lists can't pin memory
+SEARCH_CACHE_MAX_RESULTS = int(os.environ.get("URLIFE_SEARCH_CACHE_MAX_RESULTS", 200_000))
+
+SearchKey = Tuple[Hashable, ...]
+
+
+@dataclass
+class _SearchEntry:
+    generation: int
+    results: List[Any]
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+
+
+class SearchCache:
+    def __init__(
+        self,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        max_results: int = SEARCH_CACHE_MAX_RESULTS,
+    ):
+        """
+        Bounded per-process LRU of search results.
+
+        Each entry remembers the user's write generation it was computed at (see
+        ChangeStream.generation). A lookup passes the current generation, and an
+        entry from an older one is dropped, so any write by any worker invalidates
+        that user's results without a broadcast.
+
+        Args:
+            max_entries: Upper bound on the number of cached queries (0 disables)
+            max_results: Upper bound on the summed length of cached result lists
+        """
+        self.max_entries = max_entries
+        self.max_results = max_results
+        self.stats = SearchCacheStats()
+        self._entries: "OrderedDict[SearchKey, _SearchEntry]" = OrderedDict()
+        self._results = 0
+
+    def get(self, key: SearchKey, generation: int) -> Optional[List[Any]]:
+        """Return the cached results if they were computed at `generation`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.generation != generation:
+            self._remove(key)
+            self.stats.stale += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(entry.results)
+
+    def put(self, key: SearchKey, generation: int, results: List[Any]) -> None:
+        """
+        Cache results. `generation` must have been read before the search ran, so
+        a write racing with the search leaves the entry already stale.
+        """
+        if self.max_entries <= 0 or len(results) > self.max_results:
+            return
+
+        self._remove(key)
+        self._entries[key] = _SearchEntry(generation=generation, results=list(results))
+        self._results += len(results)
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._results > self.max_results
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._results = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current metrics for monitoring."""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "entries": len(self._entries),
+            "results": self._results,
+            "max_entries": self.max_entries,
+            "max_results": self.max_results,
+            "hit_rate": (self.stats.hits / lookups) if lookups else 0.0,
+            **asdict(self.stats),
+        }
+
+    def _remove(self, key: SearchKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._results -= len(entry.results)
+
+
+# Shared by every search request in this process
+search_cache = SearchCache()
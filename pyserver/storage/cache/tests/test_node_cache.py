@@ -0,0 +1,104 @@
+import time
+import pytest
+from pyserver.storage.cache.node_cache import NodeCache
+from pyserver.storage.cache.invalidation import CacheInvalidationListener, invalidation_message
+from pyserver.system.graph_node import GraphNode, ChildRef
+
+TEST_USER_ID = "test_user_node_cache"
+
+def make_node(node_id: str, caption: str = "Node") -> GraphNode:
+    return GraphNode(node_id=node_id, object_type="GOAL", caption=caption, extra_properties={})
+
+@pytest.fixture
+def cache():
+    cache = NodeCache(max_bytes=1000, max_entries=10, ttl_seconds=60)
+    cache.enable()
+    return cache
+
+def test_disabled_cache_bypasses():
+    cache = NodeCache()
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    assert cache.get(TEST_USER_ID, "a") is None
+    assert cache.stats.bypasses == 1
+
+def test_hit_and_miss_are_counted(cache):
+    assert cache.get(TEST_USER_ID, "a") is None
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    assert cache.get(TEST_USER_ID, "a").caption == "Node"
+
+    stats = cache.snapshot()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_raw_documents_are_kept_and_counted(cache):
+    node = make_node("a")
+    cache.put(TEST_USER_ID, node, 10, raw=node.json())
+    cache.put(TEST_USER_ID, make_node("b"), 10)
+
+    assert cache.get_raw(TEST_USER_ID, "a") == node.json()
+    assert cache.get_raw(TEST_USER_ID, "b") is None
+    assert cache.snapshot()["bytes"] == 20 + len(node.json())
+
+def test_returned_nodes_are_private_copies(cache):
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+
+    node = cache.get(TEST_USER_ID, "a")
+    node.caption = "Changed"
+    node.children = {"CHILDREN": [ChildRef(edge_label="CHILDREN", child_id="b")]}
+
+    again = cache.get(TEST_USER_ID, "a")
+    assert again.caption == "Node"
+    assert again.children is None
+
+def test_users_are_isolated(cache):
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    assert cache.get("other_user", "a") is None
+
+def test_byte_limit_evicts_least_recently_used(cache):
+    cache.put(TEST_USER_ID, make_node("a"), 400)
+    cache.put(TEST_USER_ID, make_node("b"), 400)
+    cache.get(TEST_USER_ID, "a")
+    cache.put(TEST_USER_ID, make_node("c"), 400)
+
+    assert cache.get(TEST_USER_ID, "a") is not None
+    assert cache.get(TEST_USER_ID, "b") is None
+    assert cache.get(TEST_USER_ID, "c") is not None
+    assert cache.snapshot()["bytes"] == 800
+    assert cache.stats.evictions == 1
+
+def test_entries_expire_after_ttl():
+    cache = NodeCache(ttl_seconds=0.01)
+    cache.enable()
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    time.sleep(0.02)
+    assert cache.get(TEST_USER_ID, "a") is None
+    assert cache.stats.expirations == 1
+
+def test_fill_racing_an_invalidation_is_dropped(cache):
+    epoch = cache.epoch
+    cache.invalidate(TEST_USER_ID, "a")
+    cache.put(TEST_USER_ID, make_node("a"), 10, epoch=epoch)
+    assert cache.get(TEST_USER_ID, "a") is None
+
+def test_disable_clears_entries(cache):
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    cache.disable()
+    cache.enable()
+    assert cache.get(TEST_USER_ID, "a") is None
+
+def test_listener_applies_remote_invalidations(cache):
+    listener = CacheInvalidationListener(cache)
+    cache.put(TEST_USER_ID, make_node("a"), 10)
+    cache.put(TEST_USER_ID, make_node("b"), 10)
+
+    listener.handle_message('{"origin": "another-worker", "user_id": "%s", "node_id": "a"}' % TEST_USER_ID)
+    assert cache.get(TEST_USER_ID, "a") is None
+    assert cache.get(TEST_USER_ID, "b") is not None
+
+    # Our own publications were already applied locally
+    listener.handle_message(invalidation_message(TEST_USER_ID, "b"))
+    assert cache.get(TEST_USER_ID, "b") is not None
+
+    listener.handle_message("not json")
+    assert cache.get(TEST_USER_ID, "b") is None
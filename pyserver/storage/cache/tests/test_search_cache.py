@@ -0,0 +1,51 @@
+import pytest
+from pyserver.storage.cache.search_cache import SearchCache
+from pyserver.storage.change_stream import ChangeStream, ChangeOp
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_search_cache"
+
+def key(query: str):
+    return (TEST_USER_ID, "root", "GOAL", query, 10)
+
+def test_entries_expire_with_the_generation():
+    cache = SearchCache(max_entries=10, max_results=100)
+    cache.put(key("coffee"), 3, ["a", "b"])
+
+    assert cache.get(key("coffee"), 3) == ["a", "b"]
+    assert cache.get(key("coffee"), 4) is None
+    assert cache.get(key("coffee"), 3) is None
+
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 2, 1)
+
+def test_size_bounds_evict_least_recent():
+    cache = SearchCache(max_entries=2, max_results=5)
+    cache.put(key("a"), 1, ["x"])
+    cache.put(key("b"), 1, ["x"])
+    cache.get(key("a"), 1)
+    cache.put(key("c"), 1, ["x"])
+    assert cache.get(key("b"), 1) is None
+    assert cache.get(key("a"), 1) == ["x"]
+
+    cache.put(key("d"), 1, ["x"] * 4)
+    assert cache.snapshot()["results"] <= 5
+    cache.put(key("e"), 1, ["x"] * 6)
+    assert cache.get(key("e"), 1) is None
+
+@pytest.mark.asyncio
+async def test_every_write_bumps_the_generation():
+    storage = NodeStorage(TEST_USER_ID)
+    changes = ChangeStream(TEST_USER_ID)
+    await storage.clear_all_nodes()
+
+    start = await changes.generation()
+    await storage.store_node(GraphNode(node_id="n1", object_type="GOAL", caption="x"))
+    await changes.append("n1", ChangeOp.INDEX_ADD, folder_id="f1")
+    await storage.delete_node("n1")
+    assert await changes.generation() == start + 3
+
+    # Wiping the user's data must not rewind it
+    await storage.clear_all_nodes()
+    assert await changes.generation() == start + 4
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pyserver.schemas.push import PushEvent
+from pyserver.storage.change_stream import ChangeOp, ChangeRecord, ChangeStream, PUSH_CHANNEL, parse_cursor
+from pyserver.storage.index.generations import FolderGenerations
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# How long a feed waits after the first change of a burst before reading it
+PUSH_COALESCE_SECONDS = float(os.environ.get("URLIFE_PUSH_COALESCE_MS", 50)) / 1000
+# Undelivered changes (after merging) a connection may hold before it is told to resync
+PUSH_BUFFER_LIMIT = int(os.environ.get("URLIFE_PUSH_BUFFER_LIMIT", 1000))
+RECONNECT_DELAY_SECONDS = float(os.environ.get("URLIFE_PUSH_RECONNECT_SECONDS", 1.0))
+# Change records read per round trip
+READ_BATCH = 500
+
+
+def _merge(old: ChangeRecord, new: ChangeRecord) -> Optional[ChangeRecord]:
+    """What a client needs to hear about two changes to the same thing; None for nothing."""
+    if new.op == ChangeOp.DELETE and old.op == ChangeOp.CREATE:
+        return None
+    if new.op == ChangeOp.UPDATE and old.op == ChangeOp.CREATE:
+        return new.model_copy(update={"op": ChangeOp.CREATE, "fields": None})
+    if new.op == ChangeOp.UPDATE and old.op == ChangeOp.UPDATE:
+        fields = None
+        if old.fields is not None and new.fields is not None:
+            fields = list(dict.fromkeys(old.fields + new.fields))
+        return new.model_copy(update={"fields": fields})
+    return new
+
+
+class PushSubscription:
+    __slots__ = ("roots", "delivered", "latest", "_pending", "_ready", "_overflowed", "_closed")
+
+    def __init__(self, roots: Iterable[str], cursor: str):
+        """
+        One push connection's view of a user's changes: optional subtree roots
+        and the changes not yet handed to the client.
+
+        Pending changes are merged per node (and per folder membership), so a
+        client that reads slower than the user writes receives the net effect
+        in one event. Past PUSH_BUFFER_LIMIT merged changes they are dropped
+        and the next event asks the client to resync instead.
+        """
+        self.roots = frozenset(roots)
+        # Cursor of the last event handed out, and of the newest change seen
+        self.delivered = cursor
+        self.latest = cursor
+        self._pending: Dict[Tuple[str, Optional[str]], ChangeRecord] = {}
+        self._ready = asyncio.Event()
+        self._overflowed = False
+        self._closed = False
+
+    def offer(self, records: List[ChangeRecord], scopes: Optional[List[Set[str]]] = None) -> None:
+        """Queue the records this subscription hasn't seen and whose scope (if given) hits a root."""
+        latest = parse_cursor(self.latest)
+        for i, record in enumerate(records):
+            if parse_cursor(record.cursor) <= latest:
+                continue
+            self.latest = record.cursor
+            if self._overflowed or (self.roots and scopes is not None and not self.roots & scopes[i]):
+                continue
+            key = (record.node_id, record.folder_id)
+            old = self._pending.pop(key, None)
+            merged = record if old is None else _merge(old, record)
+            if merged is not None:
+                self._pending[key] = merged
+            if len(self._pending) > PUSH_BUFFER_LIMIT:
+                self._pending.clear()
+                self._overflowed = True
+        if self._pending or self._overflowed:
+            self._ready.set()
+
+    def resync(self) -> None:
+        self._pending.clear()
+        self._overflowed = True
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def next_event(self, timeout: Optional[float] = None) -> Optional[PushEvent]:
+        """
+        Wait for the next event. Returns None after `timeout` seconds without
+        one (time for a keepalive), or once the subscription is closed.
+        """
+        if not self._ready.is_set() and timeout is not None:
+            # A timer rather than wait_for, so an idle connection costs no task
+            timer = asyncio.get_running_loop().call_later(timeout, self._ready.set)
+            try:
+                await self._ready.wait()
+            finally:
+                timer.cancel()
+        else:
+            await self._ready.wait()
+        self._ready.clear()
+
+        if self._closed:
+            return None
+        if self._overflowed:
+            self._overflowed = False
+            return PushEvent(cursor=self.delivered, changes=[], resync_required=True)
+        if not self._pending:
+            return None
+        changes = list(self._pending.values())
+        self._pending.clear()
+        self.delivered = self.latest
+        return PushEvent(cursor=self.latest, changes=changes)
+
+
+class _UserFeed:
+    def __init__(self, user_id: str, cursor: str):
+        """
+        Reads one user's change stream for every subscription on this worker:
+        each burst of notifications costs one XRANGE, whatever the number of
+        connections.
+        """
+        self.user_id = user_id
+        self.changes = ChangeStream(user_id)
+        self.generations = FolderGenerations(user_id)
+        self.cursor = cursor
+        self.subscriptions: Set[PushSubscription] = set()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def rewind(self, cursor: str) -> None:
+        """Re-read from `cursor` (subscriptions skip what they have already seen)."""
+        if parse_cursor(cursor) < parse_cursor(self.cursor):
+            self.cursor = cursor
+        self.wake()
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            # Let the rest of the burst land, so it is read and sent as one
+            await asyncio.sleep(PUSH_COALESCE_SECONDS)
+            self._wake.clear()
+            try:
+                await self._deliver()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Push feed for {self.user_id} failed: {e}", exc_info=True)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                self.wake()
+
+    async def _deliver(self) -> None:
+        first = True
+        while True:
+            records, more = await self.changes.read_since(self.cursor, READ_BATCH)
+            if first and more and await self.changes.cursor_expired(self.cursor):
+                # This worker fell behind the retained history
+                self.cursor = await self.changes.latest_cursor()
+                for subscription in self.subscriptions:
+                    subscription.latest = self.cursor
+                    subscription.resync()
+                return
+            first = False
+            if not records:
+                return
+
+            scopes = None
+            if any(subscription.roots for subscription in self.subscriptions):
+                scopes = [await self._scope(record) for record in records]
+            for subscription in self.subscriptions:
+                subscription.offer(records, scopes)
+            self.cursor = records[-1].cursor
+            if not more:
+                return
+
+    async def _scope(self, record: ChangeRecord) -> Set[str]:
+        """The node and every folder/node above it, for matching subtree roots."""
+        scope = {record.node_id}
+        parent_id = record.folder_id or record.parent_id
+        if parent_id:
+            scope.update(await self.generations.chain(parent_id))
+        return scope
+
+
+class ChangePushHub:
+    def __init__(self):
+        """
+        Fans change notifications out to this worker's push connections.
+
+        One subscription to PUSH_CHANNEL serves the whole process; a
+        notification for a user without connections here is dropped. Users
+        with connections get a _UserFeed, started with the first connection
+        and stopped with the last.
+        """
+        self.redis_manager = RedisManager()
+        self._feeds: Dict[str, _UserFeed] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for feed in self._feeds.values():
+            feed.stop()
+            for subscription in feed.subscriptions:
+                subscription.close()
+        self._feeds.clear()
+        await self.redis_manager.close()
+
+    async def subscribe(
+        self, user_id: str, roots: Iterable[str] = (), since: Optional[str] = None
+    ) -> PushSubscription:
+        """
+        Register a connection for `user_id`'s changes, optionally limited to
+        the subtrees under `roots`. With `since` the connection first receives
+        what it missed after that cursor (or a resync event if it expired).
+        """
+        await self.start()
+        changes = ChangeStream(user_id)
+        expired = since is not None and await changes.cursor_expired(since)
+        start = await changes.latest_cursor() if since is None or expired else since
+
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            feed = self._feeds[user_id] = _UserFeed(user_id, start)
+        subscription = PushSubscription(roots, start)
+        feed.subscriptions.add(subscription)
+        if expired:
+            subscription.resync()
+        # The feed may have read past `start` while we were waiting
+        feed.rewind(start)
+        return subscription
+
+    def unsubscribe(self, user_id: str, subscription: PushSubscription) -> None:
+        subscription.close()
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            return
+        feed.subscriptions.discard(subscription)
+        if not feed.subscriptions:
+            feed.stop()
+            del self._feeds[user_id]
+
+    def connections(self) -> int:
+        return sum(len(feed.subscriptions) for feed in self._feeds.values())
+
+    def handle_message(self, user_id: str) -> None:
+        feed = self._feeds.get(user_id)
+        if feed is not None:
+            feed.wake()
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                conn = await self.redis_manager.get_connection()
+                pubsub = conn.pubsub()
+                await pubsub.subscribe(PUSH_CHANNEL)
+                logger.info(f"📡 Subscribed to change notifications on '{PUSH_CHANNEL}'")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Anything published while we were away is still in the streams
+                        for feed in self._feeds.values():
+                            feed.wake()
+                    elif message["type"] == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Change notification channel lost: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+# Process-wide hub shared by the push endpoints
+change_push_hub = ChangePushHub()
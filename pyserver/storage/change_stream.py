@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+from typing import Optional, List, Dict, Any, Tuple
+
+from pydantic import BaseModel
+from redis.exceptions import ResponseError
+
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# Approximate number of change records retained per user
+CHANGE_STREAM_RETENTION = int(os.environ.get("URLIFE_CHANGE_STREAM_RETENTION", 10_000))
+
+# Cursor for a client that has never synced
+INITIAL_CURSOR = "0-0"
+
+# Every write that records changes rings this once with the user's ID, so workers holding push
+# connections for the user know to read the stream (see storage/change_push.py)
+PUSH_CHANNEL = "urlife:changes:push"
+
+
+class ChangeOp:
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    INDEX_ADD = "index_add"
+    INDEX_REMOVE = "index_remove"
+
+
+class ChangeRecord(BaseModel):
+    cursor: str
+    node_id: str
+    op: str
+    fields: Optional[List[str]] = None
+    version: Optional[int] = None
+    folder_id: Optional[str] = None
+    parent_id: Optional[str] = None
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int]:
+    """Parse a stream ID ('<ms>-<seq>') into a comparable tuple."""
+    ms, _, seq = cursor.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class ChangeStream:
+    def __init__(self, user_id: str):
+        """
+        Per-user log of node and folder index mutations, kept in a Redis Stream.
+
+        Writers append records into the same pipeline as the mutation itself, so a
+        change is logged if and only if it was applied. Each such pipeline then
+        bumps the user's write generation, which read caches compare against, and
+        announces the user on PUSH_CHANNEL once (see notify), however many
+        records it carries.
+
+        Args:
+            user_id: The user ID whose changes are recorded
+        """
+        self.user_id = user_id
+        self.redis_manager = RedisManager()
+
+    def _stream_key(self) -> str:
+        return f"urlife:{self.user_id}:changes"
+
+    def generation_key(self) -> str:
+        return f"urlife:{self.user_id}:generation"
+
+    def _entry(
+        self,
+        node_id: str,
+        op: str,
+        fields: Optional[List[str]],
+        version: Optional[int],
+        folder_id: Optional[str],
+        parent_id: Optional[str],
+    ) -> Dict[str, str]:
+        entry = {"node_id": node_id, "op": op}
+        if fields is not None:
+            entry["fields"] = json.dumps(fields)
+        if version is not None:
+            entry["version"] = str(version)
+        if folder_id is not None:
+            entry["folder_id"] = folder_id
+        if parent_id is not None:
+            entry["parent_id"] = parent_id
+        return entry
+
+    def record(
+        self,
+        pipe: Any,
+        node_id: str,
+        op: str,
+        fields: Optional[List[str]] = None,
+        version: Optional[int] = None,
+        folder_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a change record on a pipeline alongside the mutation it describes.
+        `parent_id` is the parent of the written node, for subtree filtering.
+        Call notify on the pipeline once all its records are queued.
+        """
+        pipe.xadd(
+            self._stream_key(),
+            self._entry(node_id, op, fields, version, folder_id, parent_id),
+            maxlen=CHANGE_STREAM_RETENTION,
+            approximate=True,
+        )
+
+    def notify(self, pipe: Any) -> None:
+        """Queue the generation bump and push announcement for a pipeline's records."""
+        pipe.incr(self.generation_key())
+        pipe.publish(PUSH_CHANNEL, self.user_id)
+
+    async def append(
+        self,
+        node_id: str,
+        op: str,
+        fields: Optional[List[str]] = None,
+        version: Optional[int] = None,
+        folder_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> str:
+        """Append a change record directly. Returns the new cursor."""
+        conn = await self.redis_manager.get_connection()
+        pipe = conn.pipeline(transaction=True)
+        self.record(pipe, node_id, op, fields, version, folder_id, parent_id)
+        self.notify(pipe)
+        cursor, *_ = await pipe.execute()
+        return cursor
+
+    async def generation(self) -> int:
+        """Counter bumped by every recorded change; unchanged means no writes since."""
+        conn = await self.redis_manager.get_connection()
+        return int(await conn.get(self.generation_key()) or 0)
+
+    async def bump_generation(self) -> int:
+        """Bump the write generation for a change that isn't recorded in the stream."""
+        conn = await self.redis_manager.get_connection()
+        return await conn.incr(self.generation_key())
+
+    async def latest_cursor(self) -> str:
+        """Cursor pointing at the newest change; a full sync taken now is current as of it."""
+        conn = await self.redis_manager.get_connection()
+        entries = await conn.xrevrange(self._stream_key(), count=1)
+        return entries[0][0] if entries else INITIAL_CURSOR
+
+    async def cursor_expired(self, cursor: str) -> bool:
+        """
+        True if changes after `cursor` may have been trimmed, in which case the
+        client has to fall back to a full resync.
+        """
+        conn = await self.redis_manager.get_connection()
+        try:
+            info = await conn.xinfo_stream(self._stream_key())
+        except ResponseError:
+            # No stream at all: only a client that never saw a change is current
+            return cursor != INITIAL_CURSOR
+
+        max_deleted = info.get("max-deleted-entry-id")
+        if max_deleted is not None:
+            return parse_cursor(cursor) < parse_cursor(max_deleted)
+
+        # Servers before Redis 7 don't report trimming; assume it happened once full
+        first_entry = info.get("first-entry")
+        if not first_entry or info.get("length", 0) < CHANGE_STREAM_RETENTION:
+            return False
+        return parse_cursor(cursor) < parse_cursor(first_entry[0])
+
+    async def read_since(self, cursor: str, limit: int) -> Tuple[List[ChangeRecord], bool]:
+        """
+        Return up to `limit` changes strictly after `cursor`, and whether more remain.
+        """
+        conn = await self.redis_manager.get_connection()
+        entries = await conn.xrange(self._stream_key(), min=f"({cursor}", max="+", count=limit + 1)
+
+        records = []
+        for entry_id, data in entries[:limit]:
+            records.append(ChangeRecord(
+                cursor=entry_id,
+                node_id=data["node_id"],
+                op=data["op"],
+                fields=json.loads(data["fields"]) if "fields" in data else None,
+                version=int(data["version"]) if "version" in data else None,
+                folder_id=data.get("folder_id"),
+                parent_id=data.get("parent_id"),
+            ))
+        return records, len(entries) > limit
@@ -5,6 +5,7 @@ import uuid
 from pyserver.storage.node_storage import NodeStorage
 from pyserver.system.graph_node import GraphNode, ParentRef
 from pyserver.system.redis import RedisManager
+from pyserver.storage.backend.protocol import TreeQueries
 from pyserver.system.folders.folder_operations import get_folder_id_for_human_name
 
 logger = getLogger(__name__)
@@ -131,7 +132,14 @@ class FolderStorage:
         """
         try:
             logger.info(f"📂 Listing contents of folder: {folder_id}")
-            all_nodes = await self.node_storage.get_all_nodes()
+            conn = await self.redis_manager.get_connection()
+            if isinstance(conn, TreeQueries):
+                # Indexed lookup on parent_id instead of scanning every node
+                child_ids = await conn.children(self.node_storage._get_node_key(folder_id), folder_id)
+                raw_nodes = await self.node_storage.get_raw_nodes(child_ids)
+                all_nodes = [GraphNode.model_validate_json(raw) for raw in raw_nodes if raw]
+            else:
+                all_nodes = await self.node_storage.get_all_nodes()
 
             children = []
             for node in all_nodes:
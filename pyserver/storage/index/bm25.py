@@ -0,0 +1,156 @@
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# Standard BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.lower() for token in _TOKEN.findall(text)]
+
+
+def term_spans(text: str, terms: Set[str]) -> List[Tuple[int, int]]:
+    """(start, end) offsets of every token of `text` that is one of `terms`."""
+    return [match.span() for match in _TOKEN.finditer(text) if match.group().lower() in terms]
+
+
+def _document(node: Optional[GraphNode]) -> Counter:
+    return Counter(tokenize(node.caption)) if node else Counter()
+
+
+class FullTextIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        BM25 inverted index over node captions (the only text indexed).
+
+        Each term has a hash of node ID -> term frequency (its postings), and a
+        single hash holds every indexed node's length, so the index costs a few
+        bytes per posting and a write touches only the terms that changed. The
+        collection totals used for IDF and length normalisation are kept in a
+        stats hash with HINCRBY.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def _term_key(self, term: str) -> str:
+        return f"urlife:{self.user_id}:bm25:term:{term}"
+
+    def _lengths_key(self) -> str:
+        return f"urlife:{self.user_id}:bm25:doclen"
+
+    def _stats_key(self) -> str:
+        return f"urlife:{self.user_id}:bm25:stats"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:bm25:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_doc = _document(old)
+        new_doc = _document(new)
+        if old_doc == new_doc and (old is None) == (new is None):
+            return
+        node_id = (new or old).node_id
+
+        for term in old_doc.keys() - new_doc.keys():
+            pipe.hdel(self._term_key(term), node_id)
+        for term, tf in new_doc.items():
+            if old_doc.get(term) != tf:
+                pipe.hset(self._term_key(term), node_id, tf)
+
+        old_length = sum(old_doc.values())
+        new_length = sum(new_doc.values())
+        if new is None:
+            pipe.hdel(self._lengths_key(), node_id)
+        else:
+            pipe.hset(self._lengths_key(), node_id, new_length)
+        if (new is None) != (old is None):
+            pipe.hincrby(self._stats_key(), "docs", 1 if old is None else -1)
+        if new_length != old_length:
+            pipe.hincrby(self._stats_key(), "length", new_length - old_length)
+
+    async def search(
+        self, query: str, limit: int = 10, within_key: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        The `limit` best (node ID, BM25 score) pairs for `query`, optionally only
+        among members of `within_key` (e.g. a recursive folder set).
+
+        Each term's postings are read whole or, when the subtree is smaller than
+        the term's document frequency, looked up for the subtree's members only.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        conn = await self.redis_manager.get_connection()
+        pipe = conn.pipeline(transaction=False)
+        pipe.hmget(self._stats_key(), ["docs", "length"])
+        for term in terms:
+            pipe.hlen(self._term_key(term))
+        if within_key:
+            pipe.scard(within_key)
+        stats, *counts = await pipe.execute()
+        frequencies = dict(zip(terms, counts[:len(terms)]))
+        subtree_size = counts[-1] if within_key else None
+
+        docs = int(stats[0] or 0)
+        if docs == 0:
+            return []
+        average_length = int(stats[1] or 0) / docs
+
+        # Postings per term, restricted to the subtree the cheaper way round
+        members: Optional[List[str]] = None
+        pipe = conn.pipeline(transaction=False)
+        plans = []
+        for term in terms:
+            if frequencies[term] == 0:
+                continue
+            if within_key and subtree_size < frequencies[term]:
+                if members is None:
+                    members = list(await conn.smembers(within_key))
+                pipe.hmget(self._term_key(term), members)
+                plans.append((term, True))
+            else:
+                pipe.hgetall(self._term_key(term))
+                plans.append((term, False))
+        postings: Dict[str, Dict[str, int]] = {}
+        for (term, by_member), result in zip(plans, await pipe.execute()):
+            if by_member:
+                postings[term] = {m: int(tf) for m, tf in zip(members, result) if tf is not None}
+            else:
+                postings[term] = {m: int(tf) for m, tf in result.items()}
+
+        candidates = sorted(set().union(*postings.values())) if postings else []
+        if within_key and candidates and members is None:
+            inside = await conn.smismember(within_key, candidates)
+            candidates = [c for c, keep in zip(candidates, inside) if keep]
+        if not candidates:
+            return []
+
+        lengths = await conn.hmget(self._lengths_key(), candidates)
+        scores: Dict[str, float] = {}
+        for node_id, length in zip(candidates, lengths):
+            norm = K1 * (1 - B + B * int(length or 0) / (average_length or 1))
+            score = 0.0
+            for term, posting in postings.items():
+                tf = posting.get(node_id)
+                if tf:
+                    df = frequencies[term]
+                    idf = math.log(1 + (docs - df + 0.5) / (df + 0.5))
+                    score += idf * tf * (K1 + 1) / (tf + norm)
+            scores[node_id] = score
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
@@ -0,0 +1,139 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.storage.index.sorted_scan import Entry, scan_sorted_set
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+
+def date_timestamp(value: Any) -> Optional[float]:
+    """
+    Epoch seconds of a stored {"date", "time"} property, or None if it has no
+    date. A missing time means the start of the day; naive values are UTC.
+    """
+    if not isinstance(value, dict) or not value.get("date"):
+        return None
+    text = str(value["date"])
+    if value.get("time") and "T" not in text:
+        text = f"{text}T{value['time']}"
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def node_dates(node: Optional[GraphNode]) -> Dict[str, float]:
+    """The (field -> timestamp) pairs a node is indexed under."""
+    if node is None:
+        return {}
+    dates = {}
+    for field, value in (node.extra_properties or {}).items():
+        timestamp = date_timestamp(value)
+        if timestamp is not None:
+            dates[field] = timestamp
+    return dates
+
+
+class DateIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        Sorted set of node IDs scored by timestamp, per date field (due, start,
+        end, ...). Any property stored in the {"date", "time"} shape is indexed,
+        whichever type declares it.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def key(self, field: str) -> str:
+        return f"urlife:{self.user_id}:date:{field}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:date:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_dates = node_dates(old)
+        new_dates = node_dates(new)
+        node_id = (new or old).node_id
+        for field in old_dates.keys() - new_dates.keys():
+            pipe.zrem(self.key(field), node_id)
+        for field, timestamp in new_dates.items():
+            if old_dates.get(field) != timestamp:
+                pipe.zadd(self.key(field), {node_id: timestamp})
+
+    async def between(
+        self,
+        field: str,
+        start: float,
+        end: float,
+        limit: int = 100,
+        within_keys: Sequence[str] = (),
+    ) -> List[Entry]:
+        """(node ID, timestamp) pairs with `field` in [start, end], earliest first."""
+        conn = await self.redis_manager.get_connection()
+        return await scan_sorted_set(conn, self.key(field), start, end, limit, within_keys=within_keys)
+
+    async def active(
+        self,
+        start_field: str,
+        end_field: str,
+        start: float,
+        end: float,
+        limit: int = 100,
+        within_keys: Sequence[str] = (),
+    ) -> List[Tuple[str, float, float]]:
+        """
+        (node ID, start, end) of the `limit` earliest-starting spans overlapping
+        [start, end], earliest start first (the order agendas merge them in).
+
+        A span overlaps if it began by `end` and ends at `start` or later. One
+        round trip counts both candidate sets, and the smaller one is walked:
+        the start-field index in start order, stopping once `limit` spans end
+        late enough, or every span ending from `start` on, keeping those that
+        began in time and sorting them by start.
+        """
+        conn = await self.redis_manager.get_connection()
+        start_key, end_key = self.key(start_field), self.key(end_field)
+        pipe = conn.pipeline(transaction=False)
+        pipe.zcount(start_key, "-inf", end)
+        pipe.zcount(end_key, start, "+inf")
+        began_before_end, ending_after_start = await pipe.execute()
+
+        # The other end of each candidate, recorded by the accept check
+        other: Dict[str, float] = {}
+
+        def overlapping(other_key: str, fits: Callable[[float], bool]):
+            async def accept(entries: List[Entry]) -> List[bool]:
+                pipe = conn.pipeline(transaction=False)
+                for member, _ in entries:
+                    pipe.zscore(other_key, member)
+                keep = []
+                for (member, _), score in zip(entries, await pipe.execute()):
+                    if score is not None and fits(float(score)):
+                        other[member] = float(score)
+                        keep.append(True)
+                    else:
+                        keep.append(False)
+                return keep
+            return accept
+
+        if began_before_end <= ending_after_start:
+            spans = await scan_sorted_set(
+                conn, start_key, "-inf", end, limit,
+                within_keys=within_keys, accept=overlapping(end_key, lambda finish: finish >= start),
+            )
+            return [(member, began, other[member]) for member, began in spans]
+
+        spans = await scan_sorted_set(
+            conn, end_key, start, "+inf", max(ending_after_start, 1),
+            within_keys=within_keys, accept=overlapping(start_key, lambda began: began <= end),
+        )
+        found = [(member, other[member], finish) for member, finish in spans]
+        found.sort(key=lambda span: (span[1], span[0]))
+        return found[:limit]
@@ -13,6 +13,10 @@ class DirectFolderIndex:
     def _direct_key(self, folder_id: str) -> str:
         return f"urlife:{self.user_id}:direct_folder:{folder_id}"
 
+    def key(self, folder_id: str) -> str:
+        """The set of nodes directly in `folder_id`."""
+        return self._direct_key(folder_id)
+
     async def add(self, folder_id: str, node_id: str) -> None:
         key = self._direct_key(folder_id)
         conn = await self.redis_manager.get_connection()
@@ -0,0 +1,105 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyserver.schemas.type_properties import get_extra_properties_for_type
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+
+def facet_value(value: Any) -> str:
+    """Encode a checkbox or radio value the way it appears in facet keys."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@lru_cache(maxsize=None)
+def facet_fields(object_type: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    The facetable fields of a type and their possible values, from its schema:
+    every checkbox question (true/false) and every radio question (its options).
+    """
+    schema = get_extra_properties_for_type(object_type)
+    fields: Dict[str, Tuple[str, ...]] = {}
+    for checkbox in schema.checkbox_questions:
+        fields[checkbox.key_name] = ("true", "false")
+    for radio in schema.radio_questions:
+        fields[radio.key_name] = tuple(option.value for option in radio.options)
+    return fields
+
+
+def node_facets(node: Optional[GraphNode]) -> Dict[str, str]:
+    """The (field -> encoded value) pairs a node is indexed under."""
+    if node is None:
+        return {}
+    properties = node.extra_properties or {}
+    return {
+        field: facet_value(properties[field])
+        for field in facet_fields(node.object_type)
+        if properties.get(field) is not None
+    }
+
+
+class FacetIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        Set of node IDs per (type, field, value) for the checkbox and radio fields
+        declared by each type's schema.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def key(self, object_type: str, field: str, value: Any) -> str:
+        return f"urlife:{self.user_id}:facet:{object_type}:{field}:{facet_value(value)}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:facet:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_facets = node_facets(old)
+        new_facets = node_facets(new)
+        retyped = old is not None and new is not None and old.object_type != new.object_type
+        node_id = (new or old).node_id
+        for field, value in old_facets.items():
+            if retyped or new_facets.get(field) != value:
+                pipe.srem(self.key(old.object_type, field, value), node_id)
+        for field, value in new_facets.items():
+            if retyped or old_facets.get(field) != value:
+                pipe.sadd(self.key(new.object_type, field, value), node_id)
+
+    async def filter(
+        self, object_type: str, filters: Dict[str, Any], base_keys: List[str]
+    ) -> Tuple[List[str], Dict[str, Dict[str, int]]]:
+        """
+        Node IDs of `object_type` in every set in `base_keys` that match all
+        `filters` (field -> value), sorted, together with the count of matches
+        for each value of every facet field of the type.
+
+        Raises:
+            ValueError: If a filter names a field that is not a facet of the type
+        """
+        fields = facet_fields(object_type)
+        unknown = [field for field in filters if field not in fields]
+        if unknown:
+            raise ValueError(f"Not facet fields of {object_type}: {', '.join(unknown)}")
+
+        match_keys = base_keys + [self.key(object_type, f, v) for f, v in filters.items()]
+
+        # Matches and every facet count in one round trip, all computed server-side
+        conn = await self.redis_manager.get_connection()
+        pipe = conn.pipeline(transaction=False)
+        pipe.sinter(match_keys)
+        counted = [(field, value) for field, values in fields.items() for value in values]
+        for field, value in counted:
+            keys = match_keys + [self.key(object_type, field, value)]
+            pipe.sintercard(len(keys), keys)
+        matches, *counts = await pipe.execute()
+
+        facets: Dict[str, Dict[str, int]] = {field: {} for field in fields}
+        for (field, value), count in zip(counted, counts):
+            facets[field][value] = count
+        return sorted(matches), facets
@@ -0,0 +1,109 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+from pyserver.storage.backend.protocol import TreeQueries
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# Nodes never change parent, so a node's ancestor chain can be kept for the process lifetime
+CHAIN_CACHE_ENTRIES = 10_000
+_chains: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+
+
+class FolderGenerations:
+    def __init__(self, user_id: str):
+        """
+        Per-parent counters that change whenever anything a listing shows does:
+        `direct` for a parent's direct members and `subtree` for everything
+        below it. Writers bump the counters of the parent chain of every node
+        they touch in the same pipeline as the write, so readers can tell a
+        listing is unchanged from a single HGET.
+
+        Args:
+            user_id: The user ID whose folders are tracked
+        """
+        self.user_id = user_id
+        self.redis_manager = RedisManager()
+
+    def _direct_key(self) -> str:
+        return f"urlife:{self.user_id}:direct_generation"
+
+    def _subtree_key(self) -> str:
+        return f"urlife:{self.user_id}:subtree_generation"
+
+    def _node_key(self) -> str:
+        return f"urlife:{self.user_id}:node"
+
+    async def chain(self, parent_id: str) -> List[str]:
+        """`parent_id` followed by its ancestors up to the root."""
+        key = (self.user_id, parent_id)
+        chain = _chains.get(key)
+        if chain is not None:
+            _chains.move_to_end(key)
+            return chain
+
+        conn = await self.redis_manager.get_connection()
+        if isinstance(conn, TreeQueries):
+            chain = [parent_id] + await conn.ancestors(self._node_key(), parent_id)
+        else:
+            chain = [parent_id]
+            while True:
+                raw = await conn.hget(self._node_key(), chain[-1])
+                parent = GraphNode.model_validate_json(raw).parent if raw else None
+                if not parent or not parent.parent_id or parent.parent_id in chain:
+                    break
+                chain.append(parent.parent_id)
+
+        _chains[key] = chain
+        if len(_chains) > CHAIN_CACHE_ENTRIES:
+            _chains.popitem(last=False)
+        return chain
+
+    def forget_chains(self) -> None:
+        """Drop this user's cached chains, e.g. after their nodes were wiped."""
+        for key in [key for key in _chains if key[0] == self.user_id]:
+            del _chains[key]
+
+    async def chains(self, parent_ids: Iterable[Optional[str]]) -> List[List[str]]:
+        return [await self.chain(parent_id) for parent_id in dict.fromkeys(parent_ids) if parent_id]
+
+    def keys(self) -> List[str]:
+        return [self._direct_key(), self._subtree_key()]
+
+    async def bump_all(self) -> None:
+        """Bump every counter, e.g. after the user's nodes were wiped."""
+        conn = await self.redis_manager.get_connection()
+        pipe = conn.pipeline(transaction=False)
+        for key in self.keys():
+            for parent_id in await conn.hkeys(key):
+                pipe.hincrby(key, parent_id, 1)
+        await pipe.execute()
+
+    def bump(self, pipe: Any, chains: Iterable[List[str]]) -> None:
+        """Queue the counter increments for changes under each chain's first node."""
+        direct, subtree = set(), set()
+        for chain in chains:
+            direct.add(chain[0])
+            subtree.update(chain)
+        for parent_id in direct:
+            pipe.hincrby(self._direct_key(), parent_id, 1)
+        for parent_id in subtree:
+            pipe.hincrby(self._subtree_key(), parent_id, 1)
+
+    async def touch(self, parent_id: str) -> None:
+        """Bump the counters for a membership change under `parent_id`."""
+        conn = await self.redis_manager.get_connection()
+        pipe = conn.pipeline(transaction=False)
+        self.bump(pipe, [await self.chain(parent_id)])
+        await pipe.execute()
+
+    async def direct(self, parent_id: str) -> int:
+        conn = await self.redis_manager.get_connection()
+        return int(await conn.hget(self._direct_key(), parent_id) or 0)
+
+    async def subtree(self, parent_id: str) -> int:
+        conn = await self.redis_manager.get_connection()
+        return int(await conn.hget(self._subtree_key(), parent_id) or 0)
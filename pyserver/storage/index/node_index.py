@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from pyserver.system.graph_node import GraphNode
+
+
+class NodeIndex(ABC):
+    def __init__(self, user_id: str):
+        """
+        Secondary index derived from node contents.
+
+        NodeStorage calls `update` with the previously stored and the new version of
+        a node while building the write's transaction, so an index changes if and
+        only if the node does.
+
+        Args:
+            user_id: The user ID whose nodes are indexed
+        """
+        self.user_id = user_id
+
+    @abstractmethod
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        """
+        Queue the index changes for one node write on `pipe`.
+        `old` is None for a new node and `new` is None for a deletion.
+        """
+
+    @abstractmethod
+    def key_pattern(self) -> str:
+        """Pattern matching every key this index owns (used to rebuild it)."""
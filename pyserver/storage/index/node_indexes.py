@@ -0,0 +1,97 @@
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pyserver.storage.index.bm25 import FullTextIndex
+from pyserver.storage.index.dates import DateIndex
+from pyserver.storage.index.facet import FacetIndex
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.storage.index.numeric import NumericIndex
+from pyserver.storage.index.prefix import CaptionPrefixIndex
+from pyserver.storage.index.trigram import CaptionTrigramIndex
+from pyserver.storage.index.type_index import TypeIndex
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+
+class _InsertBatch:
+    """
+    Stands in for a pipeline while indexing new nodes. Index additions only
+    ever add members, fields or counts, so they commute and can be merged
+    into one command per key.
+    """
+
+    def __init__(self):
+        self.sets: Dict[str, Set[str]] = defaultdict(set)
+        self.sorted_sets: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.hashes: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self.counters: Dict[str, Counter] = defaultdict(Counter)
+
+    def sadd(self, key: str, *members: str) -> None:
+        self.sets[key].update(members)
+
+    def zadd(self, key: str, mapping: Dict[str, float]) -> None:
+        self.sorted_sets[key].update(mapping)
+
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[Dict] = None) -> None:
+        if field is not None:
+            self.hashes[key][field] = value
+        if mapping:
+            self.hashes[key].update(mapping)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> None:
+        self.counters[key][field] += amount
+
+    def replay(self, pipe: Any) -> None:
+        for key, members in self.sets.items():
+            pipe.sadd(key, *members)
+        for key, mapping in self.sorted_sets.items():
+            pipe.zadd(key, mapping)
+        for key, mapping in self.hashes.items():
+            pipe.hset(key, mapping=mapping)
+        for key, counts in self.counters.items():
+            for field, amount in counts.items():
+                pipe.hincrby(key, field, amount)
+
+
+class NodeIndexes:
+    def __init__(self, user_id: str):
+        """
+        The secondary indexes NodeStorage keeps in step with every node write.
+
+        Args:
+            user_id: The user ID whose nodes are indexed
+        """
+        self.user_id = user_id
+        self.types = TypeIndex(user_id)
+        self.captions = CaptionTrigramIndex(user_id)
+        self.facets = FacetIndex(user_id)
+        self.numbers = NumericIndex(user_id)
+        self.prefixes = CaptionPrefixIndex(user_id)
+        self.fulltext = FullTextIndex(user_id)
+        self.dates = DateIndex(user_id)
+
+    def all(self) -> List[NodeIndex]:
+        return [
+            self.types,
+            self.captions,
+            self.facets,
+            self.numbers,
+            self.prefixes,
+            self.fulltext,
+            self.dates,
+        ]
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        for index in self.all():
+            index.update(pipe, old, new)
+
+    def add_all(self, pipe: Any, nodes: Iterable[GraphNode]) -> None:
+        """
+        Index nodes that aren't indexed yet, with one command per index key
+        instead of one per node and key.
+        """
+        batch = _InsertBatch()
+        for node in nodes:
+            self.update(batch, None, node)
+        batch.replay(pipe)
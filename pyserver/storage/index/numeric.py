@@ -0,0 +1,94 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyserver.schemas.type_properties import get_extra_properties_for_type
+from pyserver.storage.backend.protocol import ScoreBound
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.storage.index.sorted_scan import scan_sorted_set
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def number_fields(object_type: str) -> Tuple[str, ...]:
+    """The number questions a type's schema declares."""
+    schema = get_extra_properties_for_type(object_type)
+    return tuple(question.key_name for question in schema.number_questions)
+
+
+def node_numbers(node: Optional[GraphNode]) -> Dict[str, float]:
+    """The (field -> value) pairs a node is indexed under."""
+    if node is None:
+        return {}
+    properties = node.extra_properties or {}
+    return {
+        field: float(properties[field])
+        for field in number_fields(node.object_type)
+        if isinstance(properties.get(field), (int, float)) and not isinstance(properties[field], bool)
+    }
+
+
+class NumericIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        Sorted set of node IDs scored by value, per (type, number field), for the
+        number questions declared by each type's schema.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def key(self, object_type: str, field: str) -> str:
+        return f"urlife:{self.user_id}:number:{object_type}:{field}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:number:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_numbers = node_numbers(old)
+        new_numbers = node_numbers(new)
+        retyped = old is not None and new is not None and old.object_type != new.object_type
+        node_id = (new or old).node_id
+        for field in old_numbers:
+            if retyped or field not in new_numbers:
+                pipe.zrem(self.key(old.object_type, field), node_id)
+        for field, value in new_numbers.items():
+            if retyped or old_numbers.get(field) != value:
+                pipe.zadd(self.key(new.object_type, field), {node_id: value})
+
+    async def query(
+        self,
+        object_type: str,
+        field: str,
+        min_value: ScoreBound = "-inf",
+        max_value: ScoreBound = "+inf",
+        limit: int = 20,
+        descending: bool = True,
+        within_key: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Up to `limit` (node ID, value) pairs with min_value <= value <= max_value, highest
+        first unless `descending` is False.
+
+        With `within_key` (e.g. a recursive folder set) the result is restricted to
+        its members, at a cost that follows the entries visited (see
+        scan_sorted_set) rather than the size of the subtree.
+
+        Raises:
+            ValueError: If `field` is not a number field of the type
+        """
+        if field not in number_fields(object_type):
+            raise ValueError(f"'{field}' is not a number field of {object_type}")
+
+        conn = await self.redis_manager.get_connection()
+        return await scan_sorted_set(
+            conn,
+            self.key(object_type, field),
+            min_value,
+            max_value,
+            limit,
+            descending=descending,
+            within_keys=[within_key] if within_key else [],
+        )
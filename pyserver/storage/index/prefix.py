@@ -0,0 +1,59 @@
+import logging
+from typing import Any, List, Optional, Tuple
+
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.storage.index.trigram import normalize_caption
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# Sorts below any caption character, so "ab" comes before "abc"
+SEPARATOR = "\x1f"
+# Highest code point; also the highest UTF-8 sequence, so it bounds every prefix
+PREFIX_END = chr(0x10FFFF)
+
+
+def _member(node: GraphNode) -> str:
+    return SEPARATOR.join((normalize_caption(node.caption), node.node_id, node.caption))
+
+
+class CaptionPrefixIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        Lexicographic caption index per type for typeahead: one sorted set with a
+        shared score, whose members are "normalized caption, node ID, caption" so
+        a prefix lookup returns ID/caption pairs without loading nodes.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def key(self, object_type: str) -> str:
+        return f"urlife:{self.user_id}:prefix:{object_type}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:prefix:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_entry = (self.key(old.object_type), _member(old)) if old else None
+        new_entry = (self.key(new.object_type), _member(new)) if new else None
+        if old_entry == new_entry:
+            return
+        if old_entry:
+            pipe.zrem(*old_entry)
+        if new_entry:
+            pipe.zadd(new_entry[0], {new_entry[1]: 0})
+
+    async def complete(self, object_type: str, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """(node ID, caption) pairs whose normalized caption starts with `prefix`."""
+        normalized = normalize_caption(prefix)
+        low, high = ("[" + normalized, "[" + normalized + PREFIX_END) if normalized else ("-", "+")
+
+        conn = await self.redis_manager.get_connection()
+        members = await conn.zrangebylex(self.key(object_type), low, high, start=0, num=limit)
+
+        results = []
+        for member in members:
+            _, node_id, caption = member.split(SEPARATOR, 2)
+            results.append((node_id, caption))
+        return results
@@ -2,6 +2,7 @@ import logging
 from typing import List
 
 from pyserver.system.redis import RedisManager
+from pyserver.storage.backend.protocol import TreeQueries
 from pyserver.storage.node_storage import NodeStorage
 from pyserver.system.graph_node import GraphNode
 
@@ -16,6 +17,10 @@ class RecursiveFolderIndex:
     def _recursive_key(self, folder_id: str) -> str:
         return f"urlife:{self.user_id}:recursive_folder:{folder_id}"
 
+    def key(self, folder_id: str) -> str:
+        """The set of every node under `folder_id`, for server-side intersections."""
+        return self._recursive_key(folder_id)
+
     async def _get_path_to_root(self, node_id: str) -> List[GraphNode]:
         """
         Follows parent links recursively to get the path to root.
@@ -36,6 +41,16 @@ class RecursiveFolderIndex:
 
         return path
 
+    async def folder_chain(self, folder_id: str) -> List[str]:
+        """The folder itself followed by its ancestors up to the root."""
+        conn = await self.redis_manager.get_connection()
+        if isinstance(conn, TreeQueries):
+            # One recursive query instead of a round trip per level
+            ancestors = await conn.ancestors(self.node_storage._get_node_key(folder_id), folder_id)
+        else:
+            ancestors = [n.node_id for n in await self._get_path_to_root(folder_id)]
+        return [folder_id] + ancestors
+
     async def add(self, folder_id: str, node_id: str) -> None:
         """
         Add node to the recursive index of its folder and all ancestor folders.
@@ -44,13 +59,14 @@ class RecursiveFolderIndex:
 
         logger.info(f"📥 Adding node '{node_id}' to recursive indexes (starting at folder: {folder_id})")
 
-        path_to_root = await self._get_path_to_root(folder_id)
-        folder_ids = [folder_id] + [n.node_id for n in path_to_root]
+        folder_ids = await self.folder_chain(folder_id)
 
+        pipe = conn.pipeline(transaction=True)
         for fid in folder_ids:
             key = self._recursive_key(fid)
-            await conn.sadd(key, node_id)
+            pipe.sadd(key, node_id)
             logger.info(f"🔗 Indexed node '{node_id}' under recursive key: {key}")
+        await pipe.execute()
 
     async def remove(self, folder_id: str, node_id: str) -> None:
         """
@@ -60,13 +76,14 @@ class RecursiveFolderIndex:
 
         logger.info(f"🗑️ Removing node '{node_id}' from recursive indexes (starting at folder: {folder_id})")
 
-        path_to_root = await self._get_path_to_root(folder_id)
-        folder_ids = [folder_id] + [n.node_id for n in path_to_root]
+        folder_ids = await self.folder_chain(folder_id)
 
+        pipe = conn.pipeline(transaction=True)
         for fid in folder_ids:
             key = self._recursive_key(fid)
-            await conn.srem(key, node_id)
+            pipe.srem(key, node_id)
             logger.info(f"❌ Removed node '{node_id}' from recursive key: {key}")
+        await pipe.execute()
 
     async def list(self, folder_id: str) -> List[str]:
         key = self._recursive_key(folder_id)
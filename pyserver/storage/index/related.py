@@ -0,0 +1,311 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from pyserver.storage.change_stream import ChangeOp, ChangeStream, INITIAL_CURSOR
+from pyserver.storage.index.bm25 import tokenize
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+
+# Where each user's matrix is saved between process starts
+RELATED_DIR = os.environ.get("URLIFE_RELATED_DIR", "urlife-related")
+# Change records read per round trip while catching up
+REFRESH_BATCH = 1000
+# Models kept in memory per process; evicted ones reload from their saved file
+RELATED_MAX_MODELS = int(os.environ.get("URLIFE_RELATED_MAX_MODELS", 64))
+
+_EMPTY_TERMS = np.zeros(0, dtype=np.int32)
+_EMPTY_COUNTS = np.zeros(0, dtype=np.float32)
+
+
+class TfidfModel:
+    def __init__(self):
+        """
+        Sparse TF-IDF rows over node captions, kept as per-row term/count arrays
+        so single nodes can be replaced cheaply. The weighted, L2-normalised CSR
+        matrix is assembled lazily after changes (O(nnz)).
+        """
+        self.vocab: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df: List[int] = []
+        self.rows: Dict[str, int] = {}
+        self.row_ids: List[Optional[str]] = []
+        self.row_terms: List[np.ndarray] = []
+        self.row_counts: List[np.ndarray] = []
+        # Position in the user's change stream this model reflects
+        self.cursor = INITIAL_CURSOR
+        self._matrix: Optional[sparse.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def set_text(self, node_id: str, text: str) -> None:
+        counts = Counter(tokenize(text))
+        for term in counts:
+            if term not in self.vocab:
+                self.vocab[term] = len(self.terms)
+                self.terms.append(term)
+                self.df.append(0)
+        terms = np.array(sorted(self.vocab[t] for t in counts), dtype=np.int32)
+        values = np.array([counts[self.terms[i]] for i in terms], dtype=np.float32)
+
+        row = self.rows.get(node_id)
+        if row is None:
+            row = len(self.row_ids)
+            self.rows[node_id] = row
+            self.row_ids.append(node_id)
+            self.row_terms.append(_EMPTY_TERMS)
+            self.row_counts.append(_EMPTY_COUNTS)
+        for i in self.row_terms[row]:
+            self.df[i] -= 1
+        for i in terms:
+            self.df[i] += 1
+        self.row_terms[row] = terms
+        self.row_counts[row] = values
+        self._matrix = None
+
+    def remove(self, node_id: str) -> None:
+        row = self.rows.pop(node_id, None)
+        if row is None:
+            return
+        for i in self.row_terms[row]:
+            self.df[i] -= 1
+        self.row_ids[row] = None
+        self.row_terms[row] = _EMPTY_TERMS
+        self.row_counts[row] = _EMPTY_COUNTS
+        self._matrix = None
+
+    def matrix(self) -> sparse.csr_matrix:
+        if self._matrix is None:
+            lengths = [len(terms) for terms in self.row_terms]
+            indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            indices = np.concatenate(self.row_terms) if self.row_terms else _EMPTY_TERMS
+            counts = np.concatenate(self.row_counts) if self.row_counts else _EMPTY_COUNTS
+
+            # Sublinear tf with smoothed idf
+            df = np.asarray(self.df, dtype=np.float32)
+            idf = np.log((1 + len(self.rows)) / (1 + df)) + 1
+            data = (1 + np.log(counts)) * idf[indices] if len(counts) else counts
+
+            matrix = sparse.csr_matrix(
+                (data, indices, indptr), shape=(len(self.row_ids), len(self.terms))
+            )
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._matrix = sparse.diags(1 / norms) @ matrix
+            self._matrix = self._matrix.tocsr()
+        return self._matrix
+
+    def similar(
+        self, node_id: str, limit: int, exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """Top `limit` (node ID, cosine similarity) pairs for a node, best first."""
+        row = self.rows.get(node_id)
+        if row is None or limit <= 0:
+            return []
+
+        matrix = self.matrix()
+        scores = (matrix @ matrix[row].T).toarray().ravel()
+        scores[row] = 0
+        for other in exclude:
+            if other in self.rows:
+                scores[self.rows[other]] = 0
+
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.row_ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def compact(self) -> None:
+        """Drop the rows of removed nodes."""
+        live = [row for row, node_id in enumerate(self.row_ids) if node_id is not None]
+        if len(live) == len(self.row_ids):
+            return
+        self.row_ids = [self.row_ids[row] for row in live]
+        self.row_terms = [self.row_terms[row] for row in live]
+        self.row_counts = [self.row_counts[row] for row in live]
+        self.rows = {node_id: row for row, node_id in enumerate(self.row_ids)}
+        self._matrix = None
+
+    def save(self, path: str) -> None:
+        """Write the model atomically as a NumPy archive (read-only, so safe off the loop)."""
+        lengths = [len(terms) for terms in self.row_terms]
+        meta = {"terms": self.terms, "row_ids": self.row_ids, "cursor": self.cursor}
+        # A unique temporary name, so concurrent saves never write into the same file
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path) or ".", prefix=os.path.basename(path), suffix=".tmp", delete=False
+        ) as f:
+            try:
+                np.savez(
+                    f,
+                    meta=np.array(json.dumps(meta)),
+                    df=np.asarray(self.df, dtype=np.int64),
+                    lengths=np.asarray(lengths, dtype=np.int64),
+                    indices=np.concatenate(self.row_terms) if self.row_terms else _EMPTY_TERMS,
+                    counts=np.concatenate(self.row_counts) if self.row_counts else _EMPTY_COUNTS,
+                )
+            except BaseException:
+                os.remove(f.name)
+                raise
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfModel":
+        model = cls()
+        with np.load(path) as archive:
+            meta = json.loads(str(archive["meta"]))
+            model.terms = meta["terms"]
+            model.vocab = {term: i for i, term in enumerate(model.terms)}
+            model.df = archive["df"].tolist()
+            model.row_ids = meta["row_ids"]
+            model.rows = {
+                node_id: row for row, node_id in enumerate(model.row_ids) if node_id is not None
+            }
+            model.cursor = meta["cursor"]
+            bounds = np.cumsum(archive["lengths"])[:-1]
+            model.row_terms = np.split(archive["indices"].astype(np.int32), bounds) if model.row_ids else []
+            model.row_counts = np.split(archive["counts"].astype(np.float32), bounds) if model.row_ids else []
+        return model
+
+
+# One model and lock per (directory, user) in this process, least recently used first
+_models: "OrderedDict[Tuple[str, str], TfidfModel]" = OrderedDict()
+_locks: "OrderedDict[Tuple[str, str], asyncio.Lock]" = OrderedDict()
+
+
+def _remember(key: Tuple[str, str], model: TfidfModel) -> None:
+    _models[key] = model
+    _models.move_to_end(key)
+    while len(_models) > RELATED_MAX_MODELS:
+        _models.popitem(last=False)
+
+
+def _lock_for(key: Tuple[str, str]) -> asyncio.Lock:
+    lock = _locks.pop(key, None) or asyncio.Lock()
+    _locks[key] = lock
+    # Held locks stay until released; dropping one would let a second refresh in
+    idle = [other for other, held in _locks.items() if other != key and not held.locked()]
+    for other in idle[:max(0, len(_locks) - RELATED_MAX_MODELS)]:
+        del _locks[other]
+    return lock
+
+
+class RelatedNodeIndex:
+    def __init__(self, user_id: str, directory: str = RELATED_DIR):
+        """
+        "Related nodes" suggestions from caption TF-IDF similarity.
+
+        The model is brought up to date from the user's change stream before each
+        query, re-reading only nodes whose caption changed, and saved to
+        `directory` so a new process resumes from its cursor instead of
+        rebuilding. Tokenizing, scoring and saving run in worker threads, under
+        the per-user lock so no two of them touch a model at once.
+        """
+        self.user_id = user_id
+        self.directory = directory
+        self.node_storage = NodeStorage(user_id)
+        self.changes = ChangeStream(user_id)
+        self._key = (directory, user_id)
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"{self.user_id}.npz")
+
+    async def _load(self) -> Optional[TfidfModel]:
+        model = _models.get(self._key)
+        if model is None and os.path.exists(self._path()):
+            try:
+                model = await asyncio.to_thread(TfidfModel.load, self._path())
+            except Exception as e:
+                logger.warning(f"⚠️ Discarding unreadable related-nodes model for {self.user_id}: {e}")
+        if model is not None:
+            _remember(self._key, model)
+        return model
+
+    async def refresh(self) -> TfidfModel:
+        """Bring the model up to date with the change stream and persist it."""
+        async with _lock_for(self._key):
+            return await self._refresh()
+
+    async def _refresh(self) -> TfidfModel:
+        model = await self._load()
+        if model is None or await self.changes.cursor_expired(model.cursor):
+            model = await self._rebuild()
+            changed = True
+        else:
+            changed = await self._catch_up(model)
+
+        if changed:
+            await asyncio.to_thread(self._persist, model)
+        return model
+
+    def _persist(self, model: TfidfModel) -> None:
+        model.compact()
+        os.makedirs(self.directory, exist_ok=True)
+        model.save(self._path())
+
+    async def _rebuild(self) -> TfidfModel:
+        # Take the cursor first: changes racing with the scan are replayed later
+        cursor = await self.changes.latest_cursor()
+        captions = [(node.node_id, node.caption) for node in await self.node_storage.get_all_nodes()]
+        model = TfidfModel()
+        await asyncio.to_thread(_apply_captions, model, captions)
+        model.cursor = cursor
+        _remember(self._key, model)
+        logger.info(f"🧮 Built related-nodes model for {self.user_id} ({len(model)} nodes)")
+        return model
+
+    async def _catch_up(self, model: TfidfModel) -> bool:
+        touched: Set[str] = set()
+        advanced = False
+        while True:
+            records, more = await self.changes.read_since(model.cursor, REFRESH_BATCH)
+            for record in records:
+                if record.op == ChangeOp.DELETE:
+                    touched.add(record.node_id)
+                elif record.op in (ChangeOp.CREATE, ChangeOp.UPDATE):
+                    if record.fields is None or "caption" in record.fields:
+                        touched.add(record.node_id)
+            if records:
+                model.cursor = records[-1].cursor
+                advanced = True
+            if not more:
+                break
+
+        if touched:
+            # Apply the current state of each node, whatever happened in between
+            node_ids = sorted(touched)
+            raw_nodes = await self.node_storage.get_raw_nodes(node_ids)
+            captions = [
+                (node_id, GraphNode.model_validate_json(raw).caption if raw else None)
+                for node_id, raw in zip(node_ids, raw_nodes)
+            ]
+            await asyncio.to_thread(_apply_captions, model, captions)
+        return advanced
+
+    async def similar(
+        self, node_id: str, limit: int = 10, exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        async with _lock_for(self._key):
+            model = await self._refresh()
+            return await asyncio.to_thread(model.similar, node_id, limit, list(exclude))
+
+
+def _apply_captions(model: TfidfModel, captions: List[Tuple[str, Optional[str]]]) -> None:
+    """Set each node's caption, or remove the node when it's None."""
+    for node_id, caption in captions:
+        if caption is None:
+            model.remove(node_id)
+        else:
+            model.set_text(node_id, caption)
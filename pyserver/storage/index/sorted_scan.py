@@ -0,0 +1,56 @@
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from pyserver.storage.backend.protocol import ScoreBound
+
+Entry = Tuple[str, float]
+
+
+async def scan_sorted_set(
+    conn: Any,
+    key: str,
+    min_value: ScoreBound,
+    max_value: ScoreBound,
+    limit: int,
+    descending: bool = False,
+    within_keys: Sequence[str] = (),
+    accept: Optional[Callable[[List[Entry]], Awaitable[List[bool]]]] = None,
+) -> List[Entry]:
+    """
+    Up to `limit` (member, score) pairs of a sorted set in score order, keeping
+    only members of every set in `within_keys` (e.g. a subtree or a type) and,
+    if given, those `accept` approves.
+
+    The sorted set is walked in windows and each window is filtered in one round
+    trip, so the cost grows with the number of entries visited rather than with
+    the size of the sets filtered against.
+    """
+    if limit <= 0:
+        return []
+
+    filtered = bool(within_keys) or accept is not None
+    window = max(limit * 4, 64) if filtered else limit
+    results: List[Entry] = []
+    offset = 0
+    while len(results) < limit:
+        if descending:
+            entries = await conn.zrevrangebyscore(key, max_value, min_value, start=offset, num=window, withscores=True)
+        else:
+            entries = await conn.zrangebyscore(key, min_value, max_value, start=offset, num=window, withscores=True)
+        entries = [(member, float(score)) for member, score in entries]
+
+        kept = entries
+        if kept and within_keys:
+            pipe = conn.pipeline(transaction=False)
+            for within_key in within_keys:
+                pipe.smismember(within_key, [member for member, _ in kept])
+            memberships = await pipe.execute()
+            kept = [entry for entry, *inside in zip(kept, *memberships) if all(inside)]
+        if kept and accept is not None:
+            kept = [entry for entry, keep in zip(kept, await accept(kept)) if keep]
+        results.extend(kept)
+
+        if len(entries) < window:
+            break
+        offset += window
+
+    return results[:limit]
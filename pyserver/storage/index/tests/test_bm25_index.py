@@ -0,0 +1,52 @@
+import pytest
+from pyserver.storage.index.bm25 import term_spans
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_bm25_index"
+
+def make_node(node_id: str, caption: str) -> GraphNode:
+    return GraphNode(node_id=node_id, object_type="THOUGHT", caption=caption)
+
+def test_term_spans():
+    assert term_spans("Coffee, more coffee!", {"coffee"}) == [(0, 6), (13, 19)]
+
+@pytest.mark.asyncio
+async def test_ranking_and_incremental_updates():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    fulltext = storage.indexes.fulltext
+
+    await storage.store_node(make_node("a", "coffee coffee beans"))
+    await storage.store_node(make_node("b", "a long note that mentions coffee once among many other words"))
+    await storage.store_node(make_node("c", "tea"))
+
+    ranked = await fulltext.search("Coffee")
+    assert [node_id for node_id, _ in ranked] == ["a", "b"]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+    node = await storage.get_node("a")
+    node.caption = "green tea"
+    await storage.store_node(node, changed_fields=["caption"])
+    assert [node_id for node_id, _ in await fulltext.search("coffee")] == ["b"]
+
+    await storage.delete_node("b")
+    assert await fulltext.search("coffee") == []
+    assert [node_id for node_id, _ in await fulltext.search("tea")] == ["c", "a"]
+
+@pytest.mark.asyncio
+async def test_subtree_restriction_both_ways():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    conn = await storage.redis_manager.get_connection()
+
+    for i in range(10):
+        await storage.store_node(make_node(f"n{i}", "shared term"))
+    small = f"urlife:{TEST_USER_ID}:recursive_folder:small"
+    large = f"urlife:{TEST_USER_ID}:recursive_folder:large"
+    await conn.sadd(small, "n1", "n2")
+    await conn.sadd(large, *[f"n{i}" for i in range(3, 10)], *[f"x{i}" for i in range(20)])
+
+    fulltext = storage.indexes.fulltext
+    assert sorted(n for n, _ in await fulltext.search("shared", 10, small)) == ["n1", "n2"]
+    assert len(await fulltext.search("shared", 10, large)) == 7
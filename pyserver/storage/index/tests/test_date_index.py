@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timezone
+from pyserver.storage.index.dates import date_timestamp
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_date_index"
+
+def ts(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+def make_node(node_id: str, **dates) -> GraphNode:
+    return GraphNode(
+        node_id=node_id,
+        object_type="GOAL",
+        caption=node_id,
+        extra_properties={field: {"date": day, "time": None} for field, day in dates.items()},
+    )
+
+def test_date_timestamp():
+    assert date_timestamp({"date": "2025-03-01", "time": "09:30"}) == ts("2025-03-01T09:30")
+    assert date_timestamp({"date": "2025-03-01", "time": None}) == ts("2025-03-01")
+    assert date_timestamp({"date": None, "time": None}) is None
+    assert date_timestamp("2025-03-01") is None
+
+@pytest.mark.asyncio
+async def test_due_window_and_active_spans():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    dates = storage.indexes.dates
+
+    await storage.store_node(make_node("early", due="2025-02-20"))
+    await storage.store_node(make_node("this_week", due="2025-03-03"))
+    await storage.store_node(make_node("later", due="2025-03-20"))
+    await storage.store_node(make_node("trip", start="2025-02-28", end="2025-03-04"))
+    await storage.store_node(make_node("course", start="2025-04-01", end="2025-05-01"))
+
+    week = (ts("2025-03-01"), ts("2025-03-07"))
+    assert [n for n, _ in await dates.between("due", *week)] == ["this_week"]
+    assert [n for n, _, _ in await dates.active("start", "end", *week)] == ["trip"]
+
+    await storage.update_properties("later", {"due": {"date": "2025-03-05", "time": "10:00"}})
+    assert [n for n, _ in await dates.between("due", *week)] == ["this_week", "later"]
+
+    subtree = f"urlife:{TEST_USER_ID}:recursive_folder:f1"
+    conn = await storage.redis_manager.get_connection()
+    await conn.sadd(subtree, "later")
+    assert [n for n, _ in await dates.between("due", *week, within_keys=[subtree])] == ["later"]
+
+    await storage.delete_node("trip")
+    assert await dates.active("start", "end", *week) == []
+
+@pytest.mark.asyncio
+async def test_limited_active_spans_are_the_earliest_starting():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    dates = storage.indexes.dates
+
+    await storage.store_node(make_node("a", start="2025-03-01", end="2025-03-10"))
+    await storage.store_node(make_node("b", start="2025-03-05", end="2025-03-06"))
+    await storage.store_node(make_node("c", start="2025-03-04", end="2025-03-07"))
+    await storage.store_node(make_node("next_month", start="2025-04-01", end="2025-04-02"))
+    window = (ts("2025-03-05"), ts("2025-03-06"))
+
+    # Fewer spans began by the window's end than end after its start: walks the starts
+    assert [n for n, _, _ in await dates.active("start", "end", *window, limit=2)] == ["a", "c"]
+    assert [n for n, _, _ in await dates.active("start", "end", *window, limit=10)] == ["a", "c", "b"]
+
+    for i in range(3):
+        await storage.store_node(make_node(f"last_year_{i}", start="2024-03-01", end="2024-03-02"))
+    # Now the spans ending after the window's start are fewer: walks the ends
+    assert [n for n, _, _ in await dates.active("start", "end", *window, limit=2)] == ["a", "c"]
@@ -0,0 +1,48 @@
+import pytest
+from pyserver.storage.index.facet import facet_fields
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_facet_index"
+
+def make_goal(node_id: str, status: str, priority: str, urgent: bool) -> GraphNode:
+    return GraphNode(
+        node_id=node_id,
+        object_type="GOAL",
+        caption=node_id,
+        extra_properties={"status": status, "priority": priority, "Urgent": urgent, "attention": 5},
+    )
+
+def test_facet_fields_come_from_schema():
+    fields = facet_fields("GOAL")
+    assert fields["status"] == ("open", "closed", "in_progress")
+    assert fields["Urgent"] == ("true", "false")
+    assert "attention" not in fields
+
+@pytest.mark.asyncio
+async def test_filter_with_counts_tracks_updates():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    facets = storage.indexes.facets
+    base = [storage.indexes.types.key("GOAL")]
+
+    await storage.store_node(make_goal("g1", "open", "high", True))
+    await storage.store_node(make_goal("g2", "open", "low", True))
+    await storage.store_node(make_goal("g3", "closed", "high", False))
+
+    ids, counts = await facets.filter("GOAL", {"status": "open", "Urgent": True}, base)
+    assert ids == ["g1", "g2"]
+    assert counts["priority"] == {"low": 1, "medium": 0, "high": 1}
+    assert counts["Critical"] == {"true": 0, "false": 0}
+
+    await storage.update_properties("g2", {"priority": "high"})
+    ids, _ = await facets.filter("GOAL", {"priority": "high"}, base)
+    assert ids == ["g1", "g2", "g3"]
+
+    await storage.delete_node("g1")
+    ids, counts = await facets.filter("GOAL", {"priority": "high"}, base)
+    assert ids == ["g2", "g3"]
+    assert counts["status"]["open"] == 1
+
+    with pytest.raises(ValueError):
+        await facets.filter("GOAL", {"attention": 5}, base)
@@ -0,0 +1,49 @@
+import pytest
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_numeric_index"
+
+def make_goal(node_id: str, attention: int) -> GraphNode:
+    return GraphNode(
+        node_id=node_id,
+        object_type="GOAL",
+        caption=node_id,
+        extra_properties={"attention": attention, "Urgent": False},
+    )
+
+@pytest.mark.asyncio
+async def test_top_k_and_range_follow_updates():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    numbers = storage.indexes.numbers
+
+    for i, attention in enumerate([10, 80, 50, 95, 70]):
+        await storage.store_node(make_goal(f"g{i}", attention))
+
+    assert await numbers.query("GOAL", "attention", limit=2) == [("g3", 95.0), ("g1", 80.0)]
+    assert [m for m, _ in await numbers.query("GOAL", "attention", min_value=70, descending=False)] == ["g4", "g1", "g3"]
+
+    await storage.update_properties("g0", {"attention": 99})
+    assert (await numbers.query("GOAL", "attention", limit=1))[0] == ("g0", 99.0)
+
+    await storage.delete_node("g0")
+    assert (await numbers.query("GOAL", "attention", limit=1))[0] == ("g3", 95.0)
+
+    with pytest.raises(ValueError):
+        await numbers.query("GOAL", "status")
+
+@pytest.mark.asyncio
+async def test_subtree_restriction_walks_windows():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    conn = await storage.redis_manager.get_connection()
+    subtree = f"urlife:{TEST_USER_ID}:recursive_folder:f1"
+
+    for i in range(200):
+        await storage.store_node(make_goal(f"g{i}", i % 100))
+    # Only a few low-scoring nodes are in the subtree, so several windows are scanned
+    await conn.sadd(subtree, "g3", "g4", "g105")
+
+    result = await storage.indexes.numbers.query("GOAL", "attention", limit=2, within_key=subtree)
+    assert result == [("g105", 5.0), ("g4", 4.0)]
@@ -0,0 +1,25 @@
+import pytest
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_prefix_index"
+
+@pytest.mark.asyncio
+async def test_complete_follows_renames():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    prefixes = storage.indexes.prefixes
+
+    for node_id, caption in [("p1", "Alice Smith"), ("p2", "alan  Turing"), ("p3", "Bob"), ("p4", "Al")]:
+        await storage.store_node(GraphNode(node_id=node_id, object_type="PERSON", caption=caption))
+    await storage.store_node(GraphNode(node_id="g1", object_type="GOAL", caption="Align team"))
+
+    assert await prefixes.complete("PERSON", "AL") == [("p4", "Al"), ("p2", "alan  Turing"), ("p1", "Alice Smith")]
+    assert await prefixes.complete("PERSON", "alan t") == [("p2", "alan  Turing")]
+    assert await prefixes.complete("PERSON", "", limit=1) == [("p4", "Al")]
+
+    node = await storage.get_node("p1")
+    node.caption = "Zoe"
+    await storage.store_node(node, changed_fields=["caption"])
+    assert await prefixes.complete("PERSON", "ali") == []
+    assert await prefixes.complete("PERSON", "z") == [("p1", "Zoe")]
@@ -0,0 +1,73 @@
+import pytest
+from pyserver.storage.index import related
+from pyserver.storage.index.related import RelatedNodeIndex, TfidfModel
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_related_index"
+
+def make_node(node_id: str, caption: str) -> GraphNode:
+    return GraphNode(node_id=node_id, object_type="GOAL", caption=caption)
+
+def test_model_ranks_by_cosine_and_round_trips(tmp_path):
+    model = TfidfModel()
+    model.set_text("a", "learn spanish grammar")
+    model.set_text("b", "spanish grammar drills")
+    model.set_text("c", "spanish food")
+    model.set_text("d", "fix the bike")
+
+    assert [n for n, _ in model.similar("a", 5)] == ["b", "c"]
+    assert [n for n, _ in model.similar("a", 5, exclude=["b"])] == ["c"]
+
+    model.remove("b")
+    model.set_text("c", "grammar of spanish")
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = TfidfModel.load(path)
+    assert loaded.similar("a", 5) == model.similar("a", 5)
+    assert [n for n, _ in loaded.similar("a", 5)] == ["c"]
+
+@pytest.mark.asyncio
+async def test_index_catches_up_from_the_change_stream(tmp_path):
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    related._models.clear()
+
+    await storage.store_node(make_node("a", "quarterly tax return"))
+    await storage.store_node(make_node("b", "tax receipts"))
+    await storage.store_node(make_node("c", "garden"))
+
+    index = RelatedNodeIndex(TEST_USER_ID, directory=str(tmp_path))
+    assert [n for n, _ in await index.similar("a")] == ["b"]
+
+    node = await storage.get_node("c")
+    node.caption = "tax deadline"
+    await storage.store_node(node, changed_fields=["caption"])
+    await storage.delete_node("b")
+    assert [n for n, _ in await index.similar("a")] == ["c"]
+
+    # A new process resumes from the saved model and cursor
+    related._models.clear()
+    await storage.store_node(make_node("d", "return the tax forms"))
+    assert [n for n, _ in await index.similar("a")][0] == "d"
+
+@pytest.mark.asyncio
+async def test_models_and_locks_are_bounded(tmp_path, monkeypatch):
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    await storage.store_node(make_node("a", "quarterly tax return"))
+    await storage.store_node(make_node("b", "tax receipts"))
+    related._models.clear()
+    related._locks.clear()
+    monkeypatch.setattr(related, "RELATED_MAX_MODELS", 2)
+
+    for i in range(4):
+        index = RelatedNodeIndex(TEST_USER_ID, directory=str(tmp_path / str(i)))
+        assert [n for n, _ in await index.similar("a")] == ["b"]
+    assert list(related._models) == [(str(tmp_path / str(i)), TEST_USER_ID) for i in (2, 3)]
+    assert len(related._locks) == 2
+
+    # An evicted model comes back from its file, and saves leave no temporary files behind
+    evicted = RelatedNodeIndex(TEST_USER_ID, directory=str(tmp_path / "0"))
+    assert [n for n, _ in await evicted.similar("a")] == ["b"]
+    assert sorted(p.name for p in (tmp_path / "0").iterdir()) == [f"{TEST_USER_ID}.npz"]
@@ -0,0 +1,50 @@
+import pytest
+from pyserver.storage.index.trigram import trigrams
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_trigram_index"
+
+def make_node(node_id: str, caption: str, object_type: str = "task") -> GraphNode:
+    return GraphNode(node_id=node_id, object_type=object_type, caption=caption)
+
+def test_trigrams_normalize_case_and_whitespace():
+    assert trigrams("Ab  CD") == {"ab ", "b c", " cd"}
+    assert trigrams("ab") == set()
+
+@pytest.mark.asyncio
+async def test_candidates_follow_caption_edits():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+
+    await storage.store_node(make_node("n1", "Buy groceries"))
+    await storage.store_node(make_node("n2", "Book flights"))
+    await storage.store_node(make_node("n3", "Groceries list", object_type="note"))
+
+    task_key = storage.indexes.types.key("task")
+    assert await storage.indexes.captions.candidates("grocer", [task_key]) == ["n1"]
+
+    # Editing the caption moves the node to its new trigrams
+    node = await storage.get_node("n1")
+    node.caption = "Walk the dog"
+    await storage.store_node(node, changed_fields=["caption"])
+    assert await storage.indexes.captions.candidates("grocer", [task_key]) == []
+    assert await storage.indexes.captions.candidates("dog", [task_key]) == ["n1"]
+
+    await storage.delete_node("n1")
+    assert await storage.indexes.captions.candidates("dog", [task_key]) == []
+    assert await storage.indexes.captions.candidates("a", [task_key]) is None
+
+@pytest.mark.asyncio
+async def test_candidates_ranked_by_overlap_and_rebuild():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+
+    await storage.store_node(make_node("close", "project plan"))
+    await storage.store_node(make_node("far", "plant care"))
+    key = storage.indexes.types.key("task")
+    assert await storage.indexes.captions.candidates("project plan", [key]) == ["close", "far"]
+    assert await storage.indexes.captions.candidates("project plan", [key], limit=1) == ["close"]
+
+    assert await storage.rebuild_indexes() == 2
+    assert await storage.indexes.types.list("task") == {"close", "far"}
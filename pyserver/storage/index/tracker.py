@@ -4,6 +4,7 @@ from typing import List
 from pyserver.storage.index.direct import DirectFolderIndex
 from pyserver.storage.index.recursive import RecursiveFolderIndex
 from pyserver.storage.node_storage import NodeStorage
+from pyserver.storage.change_stream import ChangeStream, ChangeOp
 from pyserver.system.graph_node import GraphNode
 
 logger = logging.getLogger(__name__)
@@ -16,16 +17,21 @@ class FolderTracker:
         # Initialize NodeStorage to enable recursive traversal
         self.node_storage = NodeStorage(user_id)
         self.recursive = RecursiveFolderIndex(user_id)
+        self.changes = ChangeStream(user_id)
 
     async def add_to_folder(self, folder_id: str, node_id: str) -> None:
         logger.info(f"\U0001F4E5 Adding node '{node_id}' to folder '{folder_id}' (user: {self.user_id})")
         await self.direct.add(folder_id, node_id)
         await self.recursive.add(folder_id, node_id)
+        await self.changes.append(node_id, ChangeOp.INDEX_ADD, folder_id=folder_id)
+        await self.node_storage.generations.touch(folder_id)
 
     async def remove_from_folder(self, folder_id: str, node_id: str) -> None:
         logger.info(f"\U0001F5D1️ Removing node '{node_id}' from folder '{folder_id}' (user: {self.user_id})")
         await self.direct.remove(folder_id, node_id)
         await self.recursive.remove(folder_id, node_id)
+        await self.changes.append(node_id, ChangeOp.INDEX_REMOVE, folder_id=folder_id)
+        await self.node_storage.generations.touch(folder_id)
 
     async def list_direct(self, folder_id: str) -> List[str]:
         return await self.direct.list(folder_id)
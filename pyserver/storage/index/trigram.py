@@ -0,0 +1,91 @@
+import logging
+import os
+from collections import Counter
+from typing import Any, List, Optional, Set
+
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# How many of the best-overlapping nodes are handed on for fuzzy ranking, at least
+SEARCH_CANDIDATE_LIMIT = int(os.environ.get("URLIFE_SEARCH_CANDIDATE_LIMIT", 300))
+
+
+def normalize_caption(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct 3-character windows of the normalized text (empty if shorter)."""
+    normalized = normalize_caption(text)
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+class CaptionTrigramIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """
+        Inverted index from caption trigrams to node IDs, one set per trigram.
+
+        Lets caption search start from nodes that share trigrams with the query
+        instead of every node in the subtree.
+        """
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def _trigram_key(self, trigram: str) -> str:
+        return f"urlife:{self.user_id}:trigram:{trigram}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:trigram:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_grams = trigrams(old.caption) if old else set()
+        new_grams = trigrams(new.caption) if new else set()
+        node_id = (new or old).node_id
+        for gram in old_grams - new_grams:
+            pipe.srem(self._trigram_key(gram), node_id)
+        for gram in new_grams - old_grams:
+            pipe.sadd(self._trigram_key(gram), node_id)
+
+    async def candidates(
+        self,
+        query: str,
+        constraint_keys: List[str],
+        limit: int = SEARCH_CANDIDATE_LIMIT,
+        conn: Any = None,
+        match_all: bool = False,
+    ) -> Optional[List[str]]:
+        """
+        Node IDs sharing the most trigrams with `query`, restricted to members of
+        every set in `constraint_keys` (e.g. type and subtree), best first, at
+        most `limit` of them (callers wanting N results pass at least N).
+
+        With `match_all`, only (and every one of) the nodes whose captions have
+        all of the query's trigrams come back, in ID order and uncapped, so
+        callers filtering on the caption can count the matches.
+
+        Returns None if the query is too short to have trigrams.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+
+        # The constraints are intersected server-side, so only matching IDs come back
+        conn = conn or await self.redis_manager.get_connection()
+        if match_all:
+            keys = [self._trigram_key(gram) for gram in sorted(grams)]
+            return sorted(await conn.sinter([*keys, *constraint_keys]))
+
+        pipe = conn.pipeline(transaction=False)
+        for gram in grams:
+            pipe.sinter([self._trigram_key(gram), *constraint_keys])
+        overlap = Counter()
+        for members in await pipe.execute():
+            overlap.update(members)
+
+        logger.debug(f"🔎 {len(overlap)} trigram candidates for '{query}' (user: {self.user_id})")
+        if len(overlap) > limit:
+            logger.info(f"✂️ Kept the best {limit} of {len(overlap)} trigram candidates for '{query}'")
+        return [node_id for node_id, _ in overlap.most_common(limit)]
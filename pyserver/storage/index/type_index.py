@@ -0,0 +1,35 @@
+import logging
+from typing import Any, Optional, Set
+
+from pyserver.storage.index.node_index import NodeIndex
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+class TypeIndex(NodeIndex):
+    def __init__(self, user_id: str):
+        """Set of node IDs per object type."""
+        super().__init__(user_id)
+        self.redis_manager = RedisManager()
+
+    def key(self, object_type: str) -> str:
+        return f"urlife:{self.user_id}:type:{object_type}"
+
+    def key_pattern(self) -> str:
+        return f"urlife:{self.user_id}:type:*"
+
+    def update(self, pipe: Any, old: Optional[GraphNode], new: Optional[GraphNode]) -> None:
+        old_type = old.object_type if old else None
+        new_type = new.object_type if new else None
+        if old_type == new_type:
+            return
+        node_id = (new or old).node_id
+        if old_type:
+            pipe.srem(self.key(old_type), node_id)
+        if new_type:
+            pipe.sadd(self.key(new_type), node_id)
+
+    async def list(self, object_type: str) -> Set[str]:
+        conn = await self.redis_manager.get_connection()
+        return await conn.smembers(self.key(object_type))
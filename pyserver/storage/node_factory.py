@@ -66,7 +66,7 @@ async def create_node_under_folder(
         ChildRef(edge_label=edge_label, child_id=node_id)
     )
     folder_node.children = children
-    await storage.node_storage.store_node(folder_node)
+    await storage.node_storage.store_node(folder_node, changed_fields=["children"])
 
     # Step 5: Index in folder tracker
     await storage.folder_tracker.add_to_folder(folder_id, node_id)
@@ -0,0 +1,320 @@
+import logging
+import os
+import secrets
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from pyserver.schemas.node_batch_update import FieldEdit
+from pyserver.schemas.node_import import ImportRecordError, ImportProgress, ImportRecord, ImportSummary
+from pyserver.schemas.type_properties import ExtraProperties, get_extra_properties_for_type
+from pyserver.storage.cache.invalidation import INVALIDATION_CHANNEL, invalidation_message
+from pyserver.storage.change_stream import ChangeOp
+from pyserver.storage.node_factory import generate_default_properties
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.field_edit import validate_field_edit
+from pyserver.system.graph_node import ChildRef, GraphNode, ParentRef
+
+logger = logging.getLogger(__name__)
+
+# Records validated and written per pipeline
+IMPORT_BATCH_SIZE = int(os.environ.get("URLIFE_IMPORT_BATCH_SIZE", 1000))
+# Longest accepted NDJSON line, so one bad line can't exhaust memory
+IMPORT_MAX_LINE_BYTES = 1 << 20
+# How long temp ID mappings and progress outlive the last write
+IMPORT_TTL_SECONDS = 24 * 3600
+# Errors returned in the summary; the rest are only counted
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+FOLDER_EDGE = "CHILDREN"
+_PROPERTY_KINDS = (
+    ("checkbox", "checkbox_questions"),
+    ("radio", "radio_questions"),
+    ("number", "number_questions"),
+)
+
+# (line number, record)
+Pending = Tuple[int, ImportRecord]
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Split a byte stream into numbered lines, holding at most one line in memory.
+    Over-long lines come back as None. Blank lines are skipped.
+    """
+    buffer = b""
+    number = 0
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n")
+            if end < 0:
+                break
+            line, buffer = buffer[:end], buffer[end + 1:]
+            number += 1
+            if skipping:
+                skipping = False
+                yield number, None
+            elif line.strip():
+                yield number, line.decode("utf-8", errors="replace")
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            buffer = b""
+            skipping = True
+    if skipping:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer.decode("utf-8", errors="replace")
+
+
+class NodeImporter:
+    def __init__(self, storage: StorageContext, import_id: Optional[str] = None):
+        """
+        Streams NDJSON records into the graph in batches.
+
+        Each batch is validated as a whole, parents are resolved with one HMGET
+        for temp IDs from earlier batches and one for existing nodes, and every
+        node, parent children update, secondary index entry, folder index entry
+        and change record is written in a single pipeline. Existing parents are
+        read and rewritten under their node locks, so no other writer's update
+        to them is lost. Temp ID -> real ID
+        mappings live in Redis, so memory stays bounded by the batch size
+        whatever the upload size, and an import can be resumed with its ID.
+        """
+        self.storage = storage
+        self.user_id = storage.user_id
+        self.import_id = import_id or uuid.uuid4().hex
+        self.node_storage = storage.node_storage
+        self.direct = storage.folder_tracker.direct
+        self.recursive = storage.folder_tracker.recursive
+        self.summary = ImportSummary(import_id=self.import_id, status="running")
+        # Folder -> [folder, ancestors...], read once per folder
+        self._chains: Dict[str, List[str]] = {}
+        self._schemas: Dict[str, ExtraProperties] = {}
+
+    def _ids_key(self) -> str:
+        return f"urlife:{self.user_id}:import:{self.import_id}:ids"
+
+    def _progress_key(self) -> str:
+        return f"urlife:{self.user_id}:import:{self.import_id}:progress"
+
+    async def progress(self) -> Optional[ImportProgress]:
+        """The last saved progress of this import, if it is known."""
+        conn = await self.node_storage.redis_manager.get_connection()
+        value = await conn.get(self._progress_key())
+        return ImportProgress.model_validate_json(value) if value else None
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> ImportSummary:
+        batch: List[Pending] = []
+        async for number, line in ndjson_lines(chunks):
+            self.summary.received += 1
+            if line is None:
+                self._fail(number, None, f"Line longer than {IMPORT_MAX_LINE_BYTES} bytes")
+                continue
+            try:
+                batch.append((number, ImportRecord.model_validate_json(line)))
+            except ValidationError as e:
+                self._fail(number, None, f"Invalid record: {e.errors()[0]['msg']}")
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await self._import_batch(batch)
+                batch = []
+        if batch:
+            await self._import_batch(batch)
+
+        self.summary.status = "done"
+        await self._save_progress()
+        logger.info(
+            f"📦 Import {self.import_id} for {self.user_id}: {self.summary.imported} imported, "
+            f"{self.summary.failed} failed of {self.summary.received}"
+        )
+        return self.summary
+
+    def _fail(self, line: int, temp_id: Optional[str], error: str) -> None:
+        self.summary.failed += 1
+        if len(self.summary.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.summary.errors.append(ImportRecordError(line=line, temp_id=temp_id, error=error))
+
+    async def _save_progress(self) -> None:
+        conn = await self.node_storage.redis_manager.get_connection()
+        progress = ImportProgress(**self.summary.model_dump(exclude={"errors"}))
+        pipe = conn.pipeline(transaction=False)
+        pipe.set(self._progress_key(), progress.model_dump_json(), ex=IMPORT_TTL_SECONDS)
+        pipe.expire(self._ids_key(), IMPORT_TTL_SECONDS)
+        await pipe.execute()
+
+    def _schema(self, object_type: str) -> ExtraProperties:
+        schema = self._schemas.get(object_type)
+        if schema is None:
+            schema = self._schemas[object_type] = get_extra_properties_for_type(object_type)
+        return schema
+
+    def _properties(self, record: ImportRecord) -> Dict:
+        """
+        The type's defaults overlaid with the record's properties.
+
+        Raises:
+            ValueError: If a property isn't in the type's schema or doesn't fit it
+        """
+        schema = self._schema(record.object_type)
+        kinds = {
+            question.key_name: kind
+            for kind, attribute in _PROPERTY_KINDS
+            for question in getattr(schema, attribute)
+        }
+        dates = {question.key_name for question in schema.date_questions}
+
+        properties = generate_default_properties(schema)
+        for field, value in record.extra_properties.items():
+            if field in kinds:
+                value = validate_field_edit(
+                    record.object_type,
+                    FieldEdit(node_id=record.temp_id, kind=kinds[field], field=field, value=value),
+                    schema,
+                )
+            elif field in dates:
+                if not isinstance(value, dict):
+                    raise ValueError(f"Date field '{field}' needs {{date, time}}")
+            else:
+                raise ValueError(f"Unknown property '{field}' for type {record.object_type}")
+            properties[field] = value
+        return properties
+
+    async def _resolve_parents(
+        self, conn, batch: List[Pending]
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Look up, in one round trip, the temp IDs already imported by earlier
+        batches (temp ID -> real ID), and the IDs the batch's records name as
+        parent with those resolved.
+        """
+        temp_ids = list(dict.fromkeys(
+            ref for _, record in batch for ref in (record.temp_id, record.parent)
+        ))
+        known = {
+            temp_id: node_id
+            for temp_id, node_id in zip(temp_ids, await conn.hmget(self._ids_key(), temp_ids))
+            if node_id
+        }
+        parent_ids = list(dict.fromkeys(known.get(r.parent, r.parent) for _, r in batch))
+        return known, parent_ids
+
+    async def _import_batch(self, batch: List[Pending]) -> None:
+        conn = await self.node_storage.redis_manager.get_connection()
+        known, parent_ids = await self._resolve_parents(conn, batch)
+        # Parents gaining children are rewritten whole, so they are read only once
+        # other writers are held off them, and stay locked until the rewrite ran
+        async with self.node_storage.locks.hold(parent_ids):
+            raw_parents = await self.node_storage.get_raw_nodes(parent_ids)
+            stored = {node_id: raw for node_id, raw in zip(parent_ids, raw_parents) if raw}
+            self.summary.imported += await self._write_batch(conn, batch, known, stored)
+        await self._save_progress()
+
+    async def _write_batch(
+        self, conn, batch: List[Pending], known: Dict[str, str], stored: Dict[str, str]
+    ) -> int:
+        """Validate the batch against the stored parents and write it; returns the nodes created."""
+        existing = {node_id: GraphNode.model_validate_json(raw) for node_id, raw in stored.items()}
+
+        # Nodes created in this batch, by temp ID, and parents gaining children
+        created: Dict[str, GraphNode] = {}
+        touched: Dict[str, GraphNode] = {}
+        folder_members: Dict[str, List[str]] = {}
+        now = int(time.time())
+
+        for number, record in batch:
+            if record.temp_id in known or record.temp_id in created:
+                self._fail(number, record.temp_id, f"Duplicate temp_id '{record.temp_id}'")
+                continue
+            if record.object_type.upper() == "FOLDER":
+                self._fail(number, record.temp_id, "Folders can't be imported; create them first")
+                continue
+
+            if record.parent in created:
+                parent = created[record.parent]
+            else:
+                parent = existing.get(known.get(record.parent, record.parent))
+            if parent is None:
+                self._fail(number, record.temp_id, f"Unknown parent '{record.parent}' (parents must come first)")
+                continue
+
+            is_folder = parent.object_type == "FOLDER"
+            label = FOLDER_EDGE if is_folder else record.edge_label
+            if not is_folder and label not in self._schema(parent.object_type).edge_labels:
+                self._fail(number, record.temp_id, f"Invalid edge label '{label}' for parent type '{parent.object_type}'")
+                continue
+            try:
+                properties = self._properties(record)
+            except ValueError as e:
+                self._fail(number, record.temp_id, str(e))
+                continue
+
+            node = GraphNode(
+                node_id=secrets.token_hex(16),
+                object_type=record.object_type,
+                caption=record.caption,
+                extra_properties=properties,
+                creation_time=record.creation_time or now,
+                parent=ParentRef(edge_label="CHILD_OF" if is_folder else label, parent_id=parent.node_id),
+            )
+            created[record.temp_id] = node
+            parent.children = parent.children or {}
+            parent.children.setdefault(label, []).append(ChildRef(edge_label=label, child_id=node.node_id))
+            if parent.node_id in existing:
+                touched[parent.node_id] = parent
+            if is_folder:
+                folder_members.setdefault(parent.node_id, []).append(node.node_id)
+
+        if not created:
+            return 0
+
+        for folder_id in folder_members:
+            if folder_id not in self._chains:
+                self._chains[folder_id] = await self.recursive.folder_chain(folder_id)
+
+        node_storage = self.node_storage
+        chains = await node_storage.generations.chains(list(touched) + list(folder_members))
+        for node_id in touched:
+            node_storage.cache.invalidate(self.user_id, node_id)
+
+        pipe = conn.pipeline(transaction=False)
+        for node in created.values():
+            node.version = 1
+            node_storage.changes.record(
+                pipe, node.node_id, ChangeOp.CREATE, version=1,
+                parent_id=node.parent.parent_id if node.parent else None,
+            )
+        pipe.hset(node_storage._get_node_key(""), mapping={
+            node.node_id: node.json() for node in created.values()
+        })
+        node_storage.indexes.add_all(pipe, created.values())
+
+        for node_id, parent in touched.items():
+            parent.version = (parent.version or 0) + 1
+            pipe.hset(node_storage._get_node_key(node_id), node_id, parent.json())
+            node_storage.indexes.update(pipe, GraphNode.model_validate_json(stored[node_id]), parent)
+            node_storage.changes.record(
+                pipe, node_id, ChangeOp.UPDATE, fields=["children"], version=parent.version,
+                parent_id=parent.parent.parent_id if parent.parent else None,
+            )
+            pipe.publish(INVALIDATION_CHANNEL, invalidation_message(self.user_id, node_id))
+
+        for folder_id, members in folder_members.items():
+            pipe.sadd(self.direct.key(folder_id), *members)
+            for ancestor in self._chains[folder_id]:
+                pipe.sadd(self.recursive.key(ancestor), *members)
+            for node_id in members:
+                node_storage.changes.record(pipe, node_id, ChangeOp.INDEX_ADD, folder_id=folder_id)
+
+        node_storage.generations.bump(pipe, chains)
+        node_storage.changes.notify(pipe)
+        pipe.hset(self._ids_key(), mapping={
+            temp_id: node.node_id for temp_id, node in created.items()
+        })
+        await pipe.execute()
+        # Reads of the parents that started during the commit may hold old copies
+        for node_id in touched:
+            node_storage.cache.invalidate(self.user_id, node_id)
+        return len(created)
@@ -0,0 +1,66 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from pyserver.storage.node_storage import NodeStorage
+
+
+class NodeLoader:
+    def __init__(self, node_storage: NodeStorage):
+        """
+        Request-scoped node reads for handlers that resolve several things at
+        once (see /api/batch).
+
+        Every node is read at most once per loader. IDs asked for by
+        concurrently running coroutines before any of them waits are collected
+        and fetched together with one read_raw_nodes call, so independent reads
+        share round trips without knowing about each other.
+
+        Args:
+            node_storage: Storage of the user the request belongs to
+        """
+        self.node_storage = node_storage
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+        self._queued: List[str] = []
+        # read_raw_nodes calls made, for tests and logging
+        self.round_trips = 0
+
+    def _future(self, node_id: str) -> asyncio.Future:
+        future = self._futures.get(node_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[node_id] = loop.create_future()
+            if not self._queued:
+                # Runs once every coroutine that is ready now has queued its IDs
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+            self._queued.append(node_id)
+        return future
+
+    async def _dispatch(self) -> None:
+        node_ids, self._queued = self._queued, []
+        self.round_trips += 1
+        try:
+            raw_nodes = await self.node_storage.read_raw_nodes(node_ids)
+        except Exception as e:
+            for node_id in node_ids:
+                self._futures.pop(node_id).set_exception(e)
+            return
+        for node_id, raw in zip(node_ids, raw_nodes):
+            self._futures[node_id].set_result(raw)
+
+    async def load(self, node_id: str) -> Optional[str]:
+        """The node's stored JSON (as NodeStorage.read_raw_nodes), None if missing."""
+        return await self._future(node_id)
+
+    async def load_many(self, node_ids: Iterable[str]) -> List[Optional[str]]:
+        return list(await asyncio.gather(*[self._future(node_id) for node_id in node_ids]))
+
+    async def load_decoded(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """The node as a plain dict, decoded once per loader."""
+        if node_id not in self._decoded:
+            raw = await self.load(node_id)
+            if raw is None:
+                return None
+            self._decoded.setdefault(node_id, json.loads(raw))
+        return self._decoded[node_id]
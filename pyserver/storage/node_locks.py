@@ -0,0 +1,69 @@
+import asyncio
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable
+
+from pyserver.system.redis import RedisManager
+
+# How long a lock outlives a writer that died holding it
+LOCK_TTL_SECONDS = 10
+# How long a writer waits for a node another writer holds
+LOCK_WAIT_SECONDS = float(os.environ.get("URLIFE_NODE_LOCK_WAIT_SECONDS", 5))
+
+
+class NodeLocks:
+    def __init__(self, user_id: str):
+        """
+        Short-lived per-node write locks (SET NX with a TTL), held by every
+        writer from reading a node's stored copy until its write has executed.
+        The stored copy a writer diffs the indexes against and bumps the
+        version of is therefore the one it replaces, whichever worker wrote
+        last.
+
+        Args:
+            user_id: The user ID whose nodes are locked
+        """
+        self.user_id = user_id
+        self.redis_manager = RedisManager()
+
+    def _key(self, node_id: str) -> str:
+        return f"urlife:{self.user_id}:lock:{node_id}"
+
+    @asynccontextmanager
+    async def hold(self, node_ids: Iterable[str]) -> AsyncIterator[None]:
+        """
+        Hold the locks of all `node_ids` (taken together, all or none).
+
+        Raises:
+            TimeoutError: If they couldn't be taken within URLIFE_NODE_LOCK_WAIT_SECONDS
+        """
+        keys = [self._key(node_id) for node_id in sorted(set(node_ids))]
+        if not keys:
+            yield
+            return
+
+        conn = await self.redis_manager.get_connection()
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        delay = 0.002
+        while True:
+            pipe = conn.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, token, ex=LOCK_TTL_SECONDS, nx=True)
+            acquired = [key for key, ok in zip(keys, await pipe.execute()) if ok]
+            if len(acquired) == len(keys):
+                break
+            # Give back what we got, so two writers never hold half each
+            if acquired:
+                await conn.delete(*acquired)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Nodes still locked by another writer after {LOCK_WAIT_SECONDS}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+        try:
+            yield
+        finally:
+            await conn.delete(*keys)
@@ -1,15 +1,47 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Tuple
 import logging
-from pyserver.system.redis import RedisManager, map_get, map_insert, map_get_all_values
+from datetime import datetime
+from pyserver.system.redis import RedisManager, map_get, map_get_all_values
 from pyserver.system.graph_node import GraphNode
 from pyserver.system.node_changer import NodeChanger
+from pyserver.storage.cache.node_cache import node_cache
+from pyserver.storage.cache.invalidation import INVALIDATION_CHANNEL, invalidation_message
+from pyserver.storage.write_buffer import PendingWrite, write_buffer
+from pyserver.storage.change_stream import ChangeStream, ChangeOp
+from pyserver.storage.index.generations import FolderGenerations
+from pyserver.storage.index.node_indexes import NodeIndexes
+from pyserver.storage.node_locks import NodeLocks
+from pyserver.storage.projection import project_raw
 
 logger = logging.getLogger(__name__)
 
+# Every document store_node writes starts with this, so it can be served as-is
+PASSTHROUGH_PREFIX = '{"node_id":'
+
+def stored_version(raw: str) -> Optional[int]:
+    """The version of a stored node document, read without decoding it (version is its last field)."""
+    start = raw.rfind('"version":')
+    if start < 0:
+        return None
+    digits = raw[start + len('"version":'):].rstrip("} \n")
+    return int(digits) if digits.isdigit() else None
+
+
+def _parent_ids(old: Optional[GraphNode], new: Optional[GraphNode]) -> List[str]:
+    """The parents whose listings a write changing `old` into `new` affects."""
+    return [node.parent.parent_id for node in (old, new) if node is not None and node.parent]
+
+
 class NodeStorage:
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.redis_manager = RedisManager()
+        self.cache = node_cache
+        self.write_buffer = write_buffer
+        self.changes = ChangeStream(user_id)
+        self.indexes = NodeIndexes(user_id)
+        self.generations = FolderGenerations(user_id)
+        self.locks = NodeLocks(user_id)
 
     async def clear_all_nodes(self):
         """
@@ -21,22 +53,34 @@ class NodeStorage:
         logger.debug(f"🧹 Clearing Redis keys matching: {pattern}")
 
         conn = await self.redis_manager.get_connection()
-        keys = [key async for key in conn.scan_iter(match=pattern)]
+        # The generations survive and are bumped, so results and ETags from before the wipe go stale
+        kept = {self.changes.generation_key(), *self.generations.keys()}
+        keys = [key async for key in conn.scan_iter(match=pattern) if key not in kept]
 
         for key in keys:
             await conn.delete(key)
+        await self.changes.bump_generation()
+        await self.generations.bump_all()
+
+        self.cache.clear()
+        self.generations.forget_chains()
+        await conn.publish(INVALIDATION_CHANNEL, invalidation_message(self.user_id, None))
 
         logger.info(f"✅ Cleared {len(keys)} Redis keys for user '{self.user_id}'")
 
     def _get_node_key(self, node_id: str) -> str:
         return f"urlife:{self.user_id}:node"
 
-    async def store_node(self, node: GraphNode) -> str:
+    async def store_node(self, node: GraphNode, changed_fields: Optional[List[str]] = None) -> str:
         """
         Store a node in Redis with detailed logging.
+
+        Bumps the node's version and appends a change record to the user's change
+        stream and the secondary index updates in the same transaction.
         
         Args:
             node: The GraphNode to store
+            changed_fields: Fields touched by this write, if known (recorded in the change stream)
             
         Returns:
             str: The node ID that was stored
@@ -59,12 +103,28 @@ class NodeStorage:
             node_key = self._get_node_key(node_id)
             logger.info(f"Using Redis key: {node_key}")
             
-            # Convert node to JSON
-            node_json = node.json()
-            logger.debug(f"Node JSON: {node_json}")
-            
-            # Store in Redis
-            await map_insert(conn, node_key, node_id, node_json)
+            async with self.locks.hold([node_id]):
+                # The stored copy is what the indexes currently reflect, and what
+                # the version follows on from (not the caller's possibly stale copy)
+                previous = await self._read_previous(node_id)
+                op = ChangeOp.CREATE if previous is None else ChangeOp.UPDATE
+                node.version = (previous.version or 0) + 1 if previous else 1
+                node_json = node.json()
+                logger.debug(f"Node JSON: {node_json}")
+                chains = await self.generations.chains(_parent_ids(previous, node))
+
+                # Store in Redis, log the change and tell other workers to drop their cached copy
+                self.cache.invalidate(self.user_id, node_id)
+                pipe = conn.pipeline(transaction=True)
+                self._queue_store(pipe, node, node_json, previous, op, changed_fields)
+                self.generations.bump(pipe, chains)
+                self.changes.notify(pipe)
+                await pipe.execute()
+                # Again once committed: a read that started during the commit
+                # may have seen the old copy, and must not fill the cache with it
+                self.cache.invalidate(self.user_id, node_id)
+                epoch = self.cache.epoch
+            self.cache.put(self.user_id, node, len(node_json), epoch=epoch, raw=node_json)
             logger.info(f"Successfully stored node: {node_id}")
             
             return node_id
@@ -73,12 +133,106 @@ class NodeStorage:
             logger.error(f"Error storing node {node_id}: {str(e)}", exc_info=True)
             raise
 
+    def _queue_store(
+        self,
+        pipe: Any,
+        node: GraphNode,
+        node_json: str,
+        previous: Optional[GraphNode],
+        op: str,
+        changed_fields: Optional[List[str]],
+    ) -> None:
+        pipe.hset(self._get_node_key(node.node_id), node.node_id, node_json)
+        self.indexes.update(pipe, previous, node)
+        self.changes.record(
+            pipe, node.node_id, op, fields=changed_fields, version=node.version,
+            parent_id=node.parent.parent_id if node.parent else None,
+        )
+        pipe.publish(INVALIDATION_CHANNEL, invalidation_message(self.user_id, node.node_id))
+
+    async def store_nodes(self, writes: List[Tuple[GraphNode, Optional[List[str]]]]) -> None:
+        """
+        Store several (node, changed_fields) pairs in one transaction: the stored
+        versions are read with a single HMGET and every write, index update and
+        change record goes out in one MULTI, so either all nodes change or none do.
+        """
+        if not writes:
+            return
+        node_ids = [node.node_id for node, _ in writes]
+        async with self.locks.hold(node_ids):
+            await self._store_nodes_locked(writes, node_ids)
+
+    async def _store_nodes_locked(
+        self, writes: List[Tuple[GraphNode, Optional[List[str]]]], node_ids: List[str]
+    ) -> None:
+        conn = await self.redis_manager.get_connection()
+        previous = [
+            GraphNode.model_validate_json(raw) if raw else None
+            for raw in await self.get_raw_nodes(node_ids)
+        ]
+
+        chains = await self.generations.chains(
+            parent_id for (node, _), before in zip(writes, previous) for parent_id in _parent_ids(before, node)
+        )
+
+        for node_id in node_ids:
+            self.cache.invalidate(self.user_id, node_id)
+        pipe = conn.pipeline(transaction=True)
+        stored = []
+        for (node, changed_fields), before in zip(writes, previous):
+            node.version = (before.version or 0) + 1 if before else 1
+            node_json = node.json()
+            op = ChangeOp.CREATE if before is None else ChangeOp.UPDATE
+            self._queue_store(pipe, node, node_json, before, op, changed_fields)
+            stored.append((node, node_json))
+        self.generations.bump(pipe, chains)
+        self.changes.notify(pipe)
+        await pipe.execute()
+        # Reads that started during the commit may hold old copies (see store_node)
+        for node_id in node_ids:
+            self.cache.invalidate(self.user_id, node_id)
+        epoch = self.cache.epoch
+
+        for node, node_json in stored:
+            self.cache.put(self.user_id, node, len(node_json), epoch=epoch, raw=node_json)
+        logger.info(f"✅ Stored {len(stored)} nodes in one transaction (user: {self.user_id})")
+
     async def delete_node(self, node_id: str) -> None:
+        async with self.locks.hold([node_id]):
+            await self._delete_node_locked(node_id)
+
+    async def _delete_node_locked(self, node_id: str) -> None:
         conn = await self.redis_manager.get_connection()
-        await conn.hdel(self._get_node_key(node_id), node_id)
+        previous = await self._read_previous(node_id)
+        chains = await self.generations.chains(_parent_ids(previous, None))
+        self.cache.invalidate(self.user_id, node_id)
+        pipe = conn.pipeline(transaction=True)
+        pipe.hdel(self._get_node_key(node_id), node_id)
+        if previous is not None:
+            self.indexes.update(pipe, previous, None)
+        self.generations.bump(pipe, chains)
+        self.changes.record(
+            pipe, node_id, ChangeOp.DELETE,
+            parent_id=previous.parent.parent_id if previous is not None and previous.parent else None,
+        )
+        self.changes.notify(pipe)
+        pipe.publish(INVALIDATION_CHANNEL, invalidation_message(self.user_id, node_id))
+        await pipe.execute()
+        self.cache.invalidate(self.user_id, node_id)
+
+    async def get_node(self, node_id: str, include_pending: bool = True) -> GraphNode:
+        node = await self._read_node(node_id)
+        if node is not None and include_pending:
+            self.write_buffer.overlay(self.user_id, node)
+        return node
 
-    async def get_node(self, node_id: str) -> GraphNode:
+    async def _read_node(self, node_id: str) -> Optional[GraphNode]:
         try:
+            cached = self.cache.get(self.user_id, node_id)
+            if cached is not None:
+                return cached
+
+            epoch = self.cache.epoch
             conn = await self.redis_manager.get_connection()
             node_key = self._get_node_key(node_id)
             logger.info(f"🔍 Attempting to get node with ID: {node_id}")
@@ -92,11 +246,120 @@ class NodeStorage:
             logger.info(f"✅ Found node: {node_id}")
             node = GraphNode.model_validate_json(value)
             logger.info(f"🔍 Node type: {node.object_type}")
+            self.cache.put(self.user_id, node, len(value), epoch=epoch, raw=value)
             return node
         except Exception as e:
             logger.error(f"❌ Error getting node {node_id}: {str(e)}", exc_info=True)
             raise
 
+    async def _read_previous(self, node_id: str) -> Optional[GraphNode]:
+        """
+        The stored version of a node, or None if there is none (no error logging).
+        Always read from storage: another worker's write may not have reached
+        this process's cache yet.
+        """
+        conn = await self.redis_manager.get_connection()
+        value = await map_get(conn, self._get_node_key(node_id), node_id)
+        return GraphNode.model_validate_json(value) if value else None
+
+    async def rebuild_indexes(self, batch_size: int = 500) -> int:
+        """
+        Drop and repopulate every secondary index from the stored nodes, e.g. for
+        data written before an index existed. Returns the number of nodes indexed.
+        """
+        conn = await self.redis_manager.get_connection()
+        for index in self.indexes.all():
+            keys = [key async for key in conn.scan_iter(match=index.key_pattern())]
+            if keys:
+                await conn.delete(*keys)
+
+        nodes = await self.get_all_nodes()
+        for start in range(0, len(nodes), batch_size):
+            pipe = conn.pipeline(transaction=False)
+            self.indexes.add_all(pipe, nodes[start:start + batch_size])
+            await pipe.execute()
+
+        logger.info(f"✅ Rebuilt indexes for {len(nodes)} nodes (user: {self.user_id})")
+        return len(nodes)
+
+    async def get_raw_nodes(self, node_ids: List[str]) -> List[Optional[str]]:
+        """Fetch the stored JSON of several nodes in one round trip, in order."""
+        if not node_ids:
+            return []
+        conn = await self.redis_manager.get_connection()
+        return await conn.hmget(self._get_node_key(""), node_ids)
+
+    async def read_raw_nodes(
+        self, node_ids: List[str], fields: Optional[Iterable[str]] = None
+    ) -> List[Optional[str]]:
+        """
+        The JSON of several nodes, in order (None for missing ones), for
+        responses that pass it through untouched: cached documents first, the
+        rest with one HMGET. A document is only decoded and re-encoded when it
+        doesn't start like a current GraphNode serialization or buffered
+        updates have to be applied.
+
+        With `fields`, each document is cut down to those top-level fields
+        (see project_raw). Nodes are stored as one document each, so this is
+        the closest the read can get to fetching only those fields.
+        """
+        raw_nodes = [self.cache.get_raw(self.user_id, node_id) for node_id in node_ids]
+        missing = [i for i, raw in enumerate(raw_nodes) if raw is None]
+        if missing:
+            fetched = await self.get_raw_nodes([node_ids[i] for i in missing])
+            for i, raw in zip(missing, fetched):
+                raw_nodes[i] = raw
+
+        pending = self.write_buffer.has_pending()
+        for i, raw in enumerate(raw_nodes):
+            if raw is None or (not pending and raw.startswith(PASSTHROUGH_PREFIX)):
+                continue
+            node = GraphNode.model_validate_json(raw)
+            if pending:
+                self.write_buffer.overlay(self.user_id, node)
+            raw_nodes[i] = node.json()
+        if fields is not None:
+            raw_nodes = [raw if raw is None else project_raw(raw, fields) for raw in raw_nodes]
+        return raw_nodes
+
+    async def iter_raw_nodes(
+        self, node_ids: List[str], batch_size: int = 500, fields: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[List[str]]:
+        """
+        Yield the JSON of the given nodes (as read_raw_nodes) one batch at a
+        time, skipping missing ones, so callers can stream large listings
+        without holding them.
+        """
+        for start in range(0, len(node_ids), batch_size):
+            raw_nodes = await self.read_raw_nodes(node_ids[start:start + batch_size], fields)
+            yield [raw for raw in raw_nodes if raw is not None]
+
+    async def update_properties(self, node_id: str, properties: Dict[str, Any]) -> None:
+        """
+        Set extra_properties fields on a node.
+
+        When the write buffer is enabled the update is staged and coalesced with
+        other updates to the same node; otherwise it is written immediately.
+        Callers are expected to have validated the fields against the type schema.
+        """
+        updated_at = datetime.utcnow().isoformat()
+        if self.write_buffer.enabled:
+            self.write_buffer.stage(self, node_id, properties, updated_at)
+            return
+
+        pending = PendingWrite(storage=self)
+        pending.merge(properties, updated_at)
+        await self.apply_pending_write(node_id, pending)
+
+    async def apply_pending_write(self, node_id: str, pending: PendingWrite) -> None:
+        """Apply merged property updates with a single read-modify-write."""
+        node = await self.get_node(node_id, include_pending=False)
+        if not node:
+            raise ValueError(f"Node {node_id} not found")
+
+        pending.apply(node)
+        await self.store_node(node, changed_fields=pending.changed_fields())
+
     async def change_node(self, node_id: str, node_changer: NodeChanger) -> None:
         node = await self.get_node(node_id)
         if not node:
@@ -0,0 +1,78 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import FrozenSet, Iterable, Optional
+
+from pyserver.system.graph_node import GraphNode
+
+# Top-level keys of a stored node document
+NODE_FIELDS = frozenset(GraphNode.model_fields)
+
+_scan_value = json.JSONDecoder().scan_once
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def parse_fields(spec: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    The node fields named in a comma-separated `fields=` spec, always including
+    node_id. None (or an empty spec) means the whole document.
+
+    Raises:
+        ValueError: If the spec names a field nodes don't have
+    """
+    if spec is None:
+        return None
+    fields = {field.strip() for field in spec.split(",") if field.strip()}
+    if not fields:
+        return None
+    unknown = fields - NODE_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Unknown node fields: {', '.join(sorted(unknown))} "
+            f"(expected any of {', '.join(sorted(NODE_FIELDS))})"
+        )
+    return frozenset(fields | {"node_id"})
+
+
+def project_raw(raw: str, fields: Iterable[str]) -> str:
+    """
+    Keep only `fields` of a stored node document, in one pass over it.
+
+    Kept values are copied out of the document verbatim rather than decoded
+    and re-encoded, so the work left after the scan is proportional to what
+    was asked for. Skipped values (typically the children map and
+    extra_properties) are only scanned past.
+    """
+    fields = fields if isinstance(fields, (set, frozenset)) else set(fields)
+    try:
+        parts = []
+        end = _WHITESPACE.match(raw, 0).end()
+        if raw[end] != "{":
+            raise ValueError("not a JSON object")
+        end = _WHITESPACE.match(raw, end + 1).end()
+        if raw[end] == "}":
+            return "{}"
+        while True:
+            if raw[end] != '"':
+                raise ValueError("expected a key")
+            key, end = scanstring(raw, end + 1)
+            end = _WHITESPACE.match(raw, end).end()
+            if raw[end] != ":":
+                raise ValueError("expected ':'")
+            start = _WHITESPACE.match(raw, end + 1).end()
+            _, end = _scan_value(raw, start)
+            if key in fields:
+                parts.append(json.dumps(key) + ":" + raw[start:end])
+            end = _WHITESPACE.match(raw, end).end()
+            if raw[end] == "}":
+                return "{" + ",".join(parts) + "}"
+            if raw[end] != ",":
+                raise ValueError("expected ',' or '}'")
+            end = _WHITESPACE.match(raw, end + 1).end()
+    except (IndexError, StopIteration, ValueError):
+        # Not something the scanner can walk; decode it the slow way
+        document = json.loads(raw)
+        return json.dumps(
+            {key: value for key, value in document.items() if key in fields},
+            separators=(",", ":"),
+        )
@@ -0,0 +1,210 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pyserver.schemas.graph_pattern import GraphPattern, PatternEdge
+from pyserver.storage.query.planner import QueryPlanner, QueryTrace, RangeSource, SetSource, _CountingConnection
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on partial matches held while joining
+MAX_BINDINGS = int(os.environ.get("URLIFE_PATTERN_MAX_BINDINGS", 10_000))
+# Frontier nodes loaded per HMGET while expanding an edge
+PATTERN_BATCH_SIZE = int(os.environ.get("URLIFE_PATTERN_BATCH_SIZE", 500))
+
+Binding = Dict[str, str]
+
+
+class PatternMatcher:
+    def __init__(self, user_id: str):
+        """
+        Matches small graph patterns: typed node variables with property
+        predicates, joined by labeled parent -> child edges.
+
+        Evaluation starts from the variable whose index lookup is smallest, then
+        repeatedly follows the edge into the most selective unbound variable. Each
+        hop loads the distinct frontier nodes in HMGET batches and filters each
+        batch's neighbours against the target's indexes in one more round trip, so
+        no step ever scans nodes that no index or edge led to. The seed and every
+        expansion stop at MAX_BINDINGS partial matches.
+        """
+        self.user_id = user_id
+        self.redis_manager = RedisManager()
+        self.planner = QueryPlanner(user_id)
+
+    def _validate(self, pattern: GraphPattern) -> None:
+        names = [node.var for node in pattern.nodes]
+        if len(set(names)) != len(names):
+            raise ValueError("Pattern variables must be unique")
+        for edge in pattern.edges:
+            if edge.source not in names or edge.target not in names:
+                raise ValueError(f"Edge {edge.source}-[{edge.label}]->{edge.target} uses an unknown variable")
+        if not any(node.object_type for node in pattern.nodes):
+            raise ValueError("At least one pattern node needs object_type to start from")
+
+        # Every variable must be reachable from the others through edges
+        reached, frontier = {names[0]}, [names[0]]
+        while frontier:
+            var = frontier.pop()
+            for edge in pattern.edges:
+                for a, b in ((edge.source, edge.target), (edge.target, edge.source)):
+                    if a == var and b not in reached:
+                        reached.add(b)
+                        frontier.append(b)
+        if reached != set(names):
+            raise ValueError("Pattern must be connected")
+
+    async def match(self, pattern: GraphPattern) -> Tuple[List[Binding], bool, QueryTrace]:
+        """
+        Returns up to `limit` bindings (variable -> node ID), whether the search
+        was cut short, and the trace of the evaluation order.
+
+        Raises:
+            ValueError: If the pattern is invalid
+        """
+        self._validate(pattern)
+        trace = QueryTrace()
+        conn = _CountingConnection(await self.redis_manager.get_connection(), trace)
+
+        constraints: Dict[str, Tuple[List[SetSource], List[RangeSource]]] = {
+            node.var: self.planner.constraints(pattern.root_id, node.object_type, node.where)
+            for node in pattern.nodes
+        }
+
+        # Selectivity of each variable from its own indexes, in one round trip
+        pipe = conn.pipeline(transaction=False)
+        sized = [(node.var, source) for node in pattern.nodes for source in sum(constraints[node.var], [])]
+        for _, source in sized:
+            if isinstance(source, SetSource):
+                pipe.scard(source.key)
+            else:
+                pipe.zcount(source.key, source.low, source.high)
+        estimates: Dict[str, Optional[int]] = {node.var: None for node in pattern.nodes}
+        for (var, _), count in zip(sized, await pipe.execute()):
+            estimates[var] = count if estimates[var] is None else min(estimates[var], count)
+
+        typed = {node.var for node in pattern.nodes if node.object_type}
+        start = min(typed, key=lambda var: estimates[var])
+        trace.add("start", var=start, estimate=estimates[start])
+        if estimates[start] == 0:
+            return [], False, trace
+
+        seed, truncated = await self._seed(conn, *constraints[start])
+        bindings = [{start: node_id} for node_id in seed]
+        bound = {start}
+        remaining = list(pattern.edges)
+
+        while remaining and bindings:
+            edge, forward = self._next_edge(remaining, bound, estimates)
+            remaining.remove(edge)
+            source_var, target_var = (edge.source, edge.target) if forward else (edge.target, edge.source)
+            trace.add(
+                "expand" if target_var not in bound else "check",
+                edge=f"{edge.source}-[{edge.label}]->{edge.target}",
+                frontier=len({b[source_var] for b in bindings}),
+            )
+
+            groups: Dict[str, List[Binding]] = {}
+            for binding in bindings:
+                groups.setdefault(binding[source_var], []).append(binding)
+            frontier = list(groups)
+
+            expanded: List[Binding] = []
+            for i in range(0, len(frontier), PATTERN_BATCH_SIZE):
+                batch = frontier[i:i + PATTERN_BATCH_SIZE]
+                neighbours = await self._neighbours(conn, batch, edge.label, forward)
+                if target_var in bound:
+                    expanded.extend(
+                        b for node_id in batch for b in groups[node_id]
+                        if b[target_var] in neighbours.get(node_id, ())
+                    )
+                    continue
+
+                candidates = sorted(set().union(*neighbours.values())) if neighbours else []
+                admitted = set(await self.planner.admit(conn, candidates, *constraints[target_var]))
+                expanded.extend(
+                    {**b, target_var: neighbour}
+                    for node_id in batch for b in groups[node_id]
+                    for neighbour in neighbours.get(node_id, ()) if neighbour in admitted
+                )
+                if len(expanded) > MAX_BINDINGS:
+                    expanded, truncated = expanded[:MAX_BINDINGS], True
+                    break
+            bindings = expanded
+            bound.add(target_var)
+
+        # Distinct variables bound to the same node aren't a match
+        bindings = [b for b in bindings if len(set(b.values())) == len(b)]
+        if len(bindings) > pattern.limit:
+            bindings, truncated = bindings[:pattern.limit], True
+        return bindings, truncated, trace
+
+    def _next_edge(
+        self, edges: List[PatternEdge], bound: Set[str], estimates: Dict[str, Optional[int]]
+    ) -> Tuple[PatternEdge, bool]:
+        """
+        The edge to follow next: edges closing a cycle first (pure filters), then
+        the one leading to the most selective unbound variable.
+        """
+        options = []
+        for edge in edges:
+            if edge.source in bound and edge.target in bound:
+                options.append((-1, edge, True))
+            elif edge.source in bound:
+                options.append((estimates[edge.target] if estimates[edge.target] is not None else float("inf"), edge, True))
+            elif edge.target in bound:
+                options.append((estimates[edge.source] if estimates[edge.source] is not None else float("inf"), edge, False))
+        _, edge, forward = min(options, key=lambda option: option[0])
+        return edge, forward
+
+    async def _seed(
+        self, conn: Any, sets: List[SetSource], ranges: List[RangeSource]
+    ) -> Tuple[List[str], bool]:
+        """
+        Up to MAX_BINDINGS IDs matching the start variable's indexes, admitted a
+        page at a time, and whether more were left behind.
+        """
+        seed: List[str] = []
+        if sets:
+            members = sorted(await conn.sinter([s.key for s in sets]))
+            for i in range(0, len(members), MAX_BINDINGS):
+                seed.extend(await self.planner.admit(conn, members[i:i + MAX_BINDINGS], [], ranges))
+                if len(seed) > MAX_BINDINGS or (len(seed) == MAX_BINDINGS and i + MAX_BINDINGS < len(members)):
+                    return seed[:MAX_BINDINGS], True
+            return seed, False
+
+        first, *rest = ranges
+        offset = 0
+        while True:
+            page = await conn.zrangebyscore(first.key, first.low, first.high, start=offset, num=MAX_BINDINGS)
+            seed.extend(await self.planner.admit(conn, page, [], rest))
+            offset += len(page)
+            if len(page) < MAX_BINDINGS:
+                return seed[:MAX_BINDINGS], len(seed) > MAX_BINDINGS
+            if len(seed) >= MAX_BINDINGS:
+                return seed[:MAX_BINDINGS], True
+
+    async def _neighbours(
+        self, conn: Any, node_ids: List[str], label: str, forward: bool
+    ) -> Dict[str, List[str]]:
+        """
+        Children under `label` (forward) or the parent reached through `label`
+        (backward) of a batch of frontier nodes, from one HMGET.
+        """
+        if not node_ids:
+            return {}
+        raw_nodes = await conn.hmget(self.planner.node_storage._get_node_key(""), node_ids)
+
+        neighbours: Dict[str, List[str]] = {}
+        for node_id, raw in zip(node_ids, raw_nodes):
+            if not raw:
+                continue
+            node = GraphNode.model_validate_json(raw)
+            if forward:
+                refs = (node.children or {}).get(label, [])
+                neighbours[node_id] = [ref.child_id for ref in refs]
+            elif node.parent and node.parent.edge_label == label:
+                neighbours[node_id] = [node.parent.parent_id]
+        return neighbours
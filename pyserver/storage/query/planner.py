@@ -0,0 +1,404 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from pyserver.schemas.node_query import NodeQuery, PropertyPredicate, QueryPlanStep
+from pyserver.storage.backend.protocol import ScoreBound
+from pyserver.storage.index.facet import facet_fields
+from pyserver.storage.index.node_indexes import NodeIndexes
+from pyserver.storage.index.numeric import number_fields
+from pyserver.storage.index.recursive import RecursiveFolderIndex
+from pyserver.storage.index.sorted_scan import scan_sorted_set
+from pyserver.storage.index.trigram import normalize_caption
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+from pyserver.system.redis import RedisManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SetSource:
+    key: str
+    label: str
+    estimate: int = 0
+
+
+@dataclass
+class RangeSource:
+    key: str
+    low: ScoreBound
+    high: ScoreBound
+    label: str
+    estimate: int = 0
+
+
+@dataclass
+class QueryTrace:
+    steps: List[QueryPlanStep] = field(default_factory=list)
+    round_trips: int = 0
+
+    def add(self, step: str, **detail: Any) -> None:
+        self.steps.append(QueryPlanStep(step=step, detail=detail))
+
+
+class _CountingPipeline:
+    def __init__(self, pipe: Any, trace: QueryTrace):
+        self._pipe = pipe
+        self._trace = trace
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pipe, name)
+
+    async def execute(self, *args: Any, **kwargs: Any) -> List[Any]:
+        self._trace.round_trips += 1
+        return await self._pipe.execute(*args, **kwargs)
+
+
+class _CountingConnection:
+    def __init__(self, conn: Any, trace: QueryTrace):
+        """Forwards to a backend connection, counting round trips for `explain`."""
+        self._conn = conn
+        self._trace = trace
+
+    def pipeline(self, transaction: bool = True) -> _CountingPipeline:
+        return _CountingPipeline(self._conn.pipeline(transaction=transaction), self._trace)
+
+    def __getattr__(self, name: str) -> Any:
+        command = getattr(self._conn, name)
+
+        async def counted(*args: Any, **kwargs: Any) -> Any:
+            self._trace.round_trips += 1
+            return await command(*args, **kwargs)
+
+        return counted
+
+
+def _timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _in_bounds(score: Optional[float], low: ScoreBound, high: ScoreBound) -> bool:
+    """Evaluate a Redis-style score range (with "(" exclusive bounds) in Python."""
+    if score is None:
+        return False
+    for bound, above in ((low, True), (high, False)):
+        text = str(bound)
+        if text in ("-inf", "+inf", "inf"):
+            continue
+        exclusive = text.startswith("(")
+        limit = float(text[1:] if exclusive else text)
+        if above and (score < limit or (exclusive and score == limit)):
+            return False
+        if not above and (score > limit or (exclusive and score == limit)):
+            return False
+    return True
+
+
+def _number_bounds(predicate: PropertyPredicate) -> Tuple[ScoreBound, ScoreBound]:
+    if isinstance(predicate.value, bool):
+        raise ValueError(f"'{predicate.field}' needs a numeric value")
+    value = float(predicate.value)
+    if predicate.op == "eq":
+        return value, value
+    if predicate.op == "gt":
+        return f"({value}", "+inf"
+    if predicate.op == "gte":
+        return value, "+inf"
+    if predicate.op == "lt":
+        return "-inf", f"({value}"
+    if predicate.op == "lte":
+        return "-inf", value
+    if predicate.value_to is None:
+        raise ValueError(f"'between' on '{predicate.field}' needs value_to")
+    return value, float(predicate.value_to)
+
+
+class QueryPlanner:
+    def __init__(self, user_id: str):
+        """
+        Plans and runs NodeQuery over the secondary indexes.
+
+        Every predicate becomes a set (subtree, type, facet) or a score range
+        (number field, date window). Their cardinalities are fetched in one round
+        trip and the cheapest access path is chosen:
+
+        - intersect: SINTER of the sets in Redis, then the ranges checked with
+          ZSCORE in one pipelined round trip
+        - walk: stream the smallest range (or the sort field) in score order,
+          filtering each window by set membership, and stop once the page is full
+        - scan: every member of the smallest range, then filtered and sorted like
+          an intersection (sorted queries without sets)
+        - trigram: nodes whose captions have every query trigram, already
+          intersected with the sets
+
+        Only the final page of nodes is loaded.
+        """
+        self.user_id = user_id
+        self.redis_manager = RedisManager()
+        self.indexes = NodeIndexes(user_id)
+        self.recursive = RecursiveFolderIndex(user_id)
+        self.node_storage = NodeStorage(user_id)
+
+    def constraints(
+        self, root_id: Optional[str], object_type: Optional[str], where: List[PropertyPredicate]
+    ) -> Tuple[List[SetSource], List[RangeSource]]:
+        """
+        The sets and score ranges a node must belong to for the given subtree,
+        type and property predicates.
+
+        Raises:
+            ValueError: If a predicate doesn't fit the type's schema
+        """
+        sets: List[SetSource] = []
+        ranges: List[RangeSource] = []
+
+        if root_id:
+            sets.append(SetSource(self.recursive.key(root_id), f"subtree:{root_id}"))
+        if object_type:
+            sets.append(SetSource(self.indexes.types.key(object_type), f"type:{object_type}"))
+
+        for predicate in where:
+            if not object_type:
+                raise ValueError("Property predicates need object_type")
+            if predicate.field in facet_fields(object_type):
+                if predicate.op != "eq":
+                    raise ValueError(f"'{predicate.field}' only supports eq")
+                key = self.indexes.facets.key(object_type, predicate.field, predicate.value)
+                sets.append(SetSource(key, f"{predicate.field}={predicate.value}"))
+            elif predicate.field in number_fields(object_type):
+                low, high = _number_bounds(predicate)
+                key = self.indexes.numbers.key(object_type, predicate.field)
+                ranges.append(RangeSource(key, low, high, f"{predicate.field}:[{low},{high}]"))
+            else:
+                raise ValueError(f"'{predicate.field}' is not an indexed field of {object_type}")
+        return sets, ranges
+
+    async def admit(
+        self, conn: Any, node_ids: List[str], sets: List[SetSource], ranges: List[RangeSource]
+    ) -> List[str]:
+        """The IDs that are in every set and range, checked in one round trip."""
+        if not node_ids or (not sets and not ranges):
+            return node_ids
+
+        pipe = conn.pipeline(transaction=False)
+        for source in sets:
+            pipe.smismember(source.key, node_ids)
+        for node_id in node_ids:
+            for source in ranges:
+                pipe.zscore(source.key, node_id)
+        results = await pipe.execute()
+
+        memberships, scores = results[:len(sets)], results[len(sets):]
+        width = len(ranges)
+        admitted = []
+        for i, node_id in enumerate(node_ids):
+            if not all(inside[i] for inside in memberships):
+                continue
+            row = scores[i * width:(i + 1) * width]
+            if all(_in_bounds(row[j], s.low, s.high) for j, s in enumerate(ranges)):
+                admitted.append(node_id)
+        return admitted
+
+    def _compile(self, query: NodeQuery) -> Tuple[List[SetSource], List[RangeSource], Optional[str]]:
+        sets, ranges = self.constraints(query.root_id, query.object_type, query.where)
+
+        if query.date:
+            ranges.append(RangeSource(
+                self.indexes.dates.key(query.date.field),
+                _timestamp(query.date.start),
+                _timestamp(query.date.end),
+                f"{query.date.field}:[{query.date.start.isoformat()},{query.date.end.isoformat()}]",
+            ))
+
+        sort_key = None
+        if query.sort:
+            if query.object_type and query.sort.field in number_fields(query.object_type):
+                sort_key = self.indexes.numbers.key(query.object_type, query.sort.field)
+            else:
+                sort_key = self.indexes.dates.key(query.sort.field)
+
+        if not sets and not ranges:
+            raise ValueError("A query needs root_id, object_type, a predicate or a date window")
+        return sets, ranges, sort_key
+
+    async def run(self, query: NodeQuery) -> Tuple[List[GraphNode], Optional[int], QueryTrace]:
+        """
+        Returns the requested page of nodes, the total number of matches when
+        the chosen plan knows it, and the plan trace.
+
+        Raises:
+            ValueError: If the query is invalid for the type's schema
+        """
+        trace = QueryTrace()
+        sets, ranges, sort_key = self._compile(query)
+        sort_is_date = bool(sort_key) and sort_key == self.indexes.dates.key(query.sort.field)
+        conn = _CountingConnection(await self.redis_manager.get_connection(), trace)
+        needed = query.offset + query.limit
+        descending = bool(query.sort and query.sort.descending)
+
+        # 1. Cardinalities of every access path, in one round trip
+        pipe = conn.pipeline(transaction=False)
+        for source in sets:
+            pipe.scard(source.key)
+        for source in ranges:
+            pipe.zcount(source.key, source.low, source.high)
+        if sort_key:
+            pipe.zcard(sort_key)
+        estimates = await pipe.execute()
+        for source, estimate in zip(sets + ranges, estimates):
+            source.estimate = estimate
+        if sort_is_date and not estimates[-1]:
+            # Dates aren't declared per type; a field no node has a date under is a typo
+            raise ValueError(f"'{query.sort.field}' is not a number or date field of {query.object_type or 'any type'}")
+        trace.add("estimate", **{source.label: source.estimate for source in sets + ranges})
+
+        if any(source.estimate == 0 for source in sets + ranges):
+            trace.add("empty", reason="an access path has no entries")
+            return [], 0, trace
+
+        set_keys = [source.key for source in sets]
+        total: Optional[int] = None
+
+        # 2. Pick and run the driving access path
+        if query.caption:
+            node_ids = await self.indexes.captions.candidates(
+                normalize_caption(query.caption), set_keys, conn=conn, match_all=True
+            )
+            if node_ids is None:
+                raise ValueError("caption needs at least 3 characters")
+            trace.add("trigram", candidates=len(node_ids), intersected_with=[s.label for s in sets])
+            node_ids = await self._filter_and_sort(conn, node_ids, ranges, sort_key, descending, trace)
+            total = len(node_ids)
+        else:
+            plan, cost, driver = self._choose(sets, ranges, sort_key, needed)
+            if plan == "intersect":
+                node_ids = sorted(await conn.sinter(set_keys))
+                trace.add("intersect", keys=[s.label for s in sets], matches=len(node_ids), cost=cost)
+                node_ids = await self._filter_and_sort(conn, node_ids, ranges, sort_key, descending, trace)
+                total = len(node_ids)
+            elif plan == "scan":
+                key, low, high, label = driver
+                node_ids = await conn.zrangebyscore(key, low, high)
+                trace.add("scan", index=label, matches=len(node_ids), cost=cost)
+                others = [source for source in ranges if source.key != key or (source.low, source.high) != (low, high)]
+                node_ids = await self._filter_and_sort(conn, node_ids, others, sort_key, descending, trace)
+                total = len(node_ids)
+            else:
+                key, low, high, label = driver
+                others = [source for source in ranges if source.key != key or (source.low, source.high) != (low, high)]
+                entries = await scan_sorted_set(
+                    conn, key, low, high, needed,
+                    descending=descending,
+                    within_keys=set_keys,
+                    accept=self._range_check(conn, others) if others else None,
+                )
+                node_ids = [member for member, _ in entries]
+                trace.add("walk", index=label, filters=[s.label for s in sets + others], cost=cost)
+
+        # 3. Hydrate only the requested page
+        page = node_ids[query.offset:needed]
+        raw_nodes = await self.node_storage.get_raw_nodes(page)
+        trace.round_trips += 1 if page else 0
+        trace.add("hydrate", nodes=len(page))
+        nodes = [GraphNode.model_validate_json(raw) for raw in raw_nodes if raw]
+        return nodes, total, trace
+
+    def _choose(
+        self,
+        sets: List[SetSource],
+        ranges: List[RangeSource],
+        sort_key: Optional[str],
+        needed: int,
+    ) -> Tuple[str, float, Optional[Tuple[str, ScoreBound, ScoreBound, str]]]:
+        """
+        Cheapest plan by estimated entries touched, with its driving range if any.
+
+        A walk has to see every match: the sort index only lists nodes that have
+        the sort value, so it is walked only when a range on the sort field
+        already requires one. Otherwise a sorted query intersects (or scans its
+        smallest range) and sorts the matches, missing values last.
+        """
+        sources = sets + ranges
+        smallest = min(source.estimate for source in sources)
+        options: List[Tuple[float, str, Optional[Tuple[str, ScoreBound, ScoreBound, str]]]] = []
+
+        if sets:
+            smallest_set = min(source.estimate for source in sets)
+            # SINTER touches the smallest set once per key, then every match is checked
+            cost = smallest_set * len(sets) + smallest * (len(ranges) + (1 if sort_key else 0))
+            options.append((cost, "intersect", None))
+
+        if sort_key:
+            sorted_range = next((source for source in ranges if source.key == sort_key), None)
+            if sorted_range:
+                size = sorted_range.estimate
+                # Matches are spread through the walk, so expect size/smallest entries per hit
+                cost = min(size, needed * size / max(smallest, 1))
+                label = f"sort:{sort_key.rsplit(':', 1)[-1]}"
+                options.append((cost, "walk", (sort_key, sorted_range.low, sorted_range.high, label)))
+            elif not sets:
+                driver = min(ranges, key=lambda source: source.estimate)
+                options.append((driver.estimate, "scan", (driver.key, driver.low, driver.high, driver.label)))
+        else:
+            for source in ranges:
+                cost = min(source.estimate, needed * source.estimate / max(smallest, 1))
+                options.append((cost, "walk", (source.key, source.low, source.high, source.label)))
+
+        cost, plan, driver = min(options, key=lambda option: option[0])
+        return plan, cost, driver
+
+    def _range_check(self, conn: Any, ranges: List[RangeSource]):
+        async def accept(entries: List[Tuple[str, float]]) -> List[bool]:
+            pipe = conn.pipeline(transaction=False)
+            for member, _ in entries:
+                for source in ranges:
+                    pipe.zscore(source.key, member)
+            scores = await pipe.execute()
+            width = len(ranges)
+            return [
+                all(_in_bounds(scores[i * width + j], s.low, s.high) for j, s in enumerate(ranges))
+                for i in range(len(entries))
+            ]
+        return accept
+
+    async def _filter_and_sort(
+        self,
+        conn: Any,
+        node_ids: List[str],
+        ranges: List[RangeSource],
+        sort_key: Optional[str],
+        descending: bool,
+        trace: QueryTrace,
+    ) -> List[str]:
+        """Apply range predicates and the sort to an explicit ID list in one round trip."""
+        if not node_ids or (not ranges and not sort_key):
+            return node_ids
+
+        keys = [source.key for source in ranges] + ([sort_key] if sort_key else [])
+        pipe = conn.pipeline(transaction=False)
+        for node_id in node_ids:
+            for key in keys:
+                pipe.zscore(key, node_id)
+        scores = await pipe.execute()
+
+        width = len(keys)
+        kept: List[Tuple[str, Optional[float]]] = []
+        for i, node_id in enumerate(node_ids):
+            row = scores[i * width:(i + 1) * width]
+            if all(_in_bounds(row[j], s.low, s.high) for j, s in enumerate(ranges)):
+                kept.append((node_id, row[-1] if sort_key else None))
+        if ranges:
+            trace.add("filter", ranges=[s.label for s in ranges], kept=len(kept))
+
+        if sort_key:
+            # Nodes without a value for the sort field go last
+            present = [item for item in kept if item[1] is not None]
+            missing = [item for item in kept if item[1] is None]
+            present.sort(key=lambda item: float(item[1]), reverse=descending)
+            kept = present + missing
+            trace.add("sort", key=sort_key.rsplit(":", 1)[-1], descending=descending)
+        return [node_id for node_id, _ in kept]
@@ -0,0 +1,100 @@
+import pytest
+from pyserver.schemas.graph_pattern import GraphPattern, PatternEdge, PatternNode
+from pyserver.schemas.node_query import PropertyPredicate
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.storage.query import pattern as pattern_module
+from pyserver.storage.query.pattern import PatternMatcher
+from pyserver.system.graph_node import ChildRef, GraphNode, ParentRef
+
+TEST_USER_ID = "test_user_pattern_match"
+
+async def seed() -> NodeStorage:
+    """
+    Ten goals (odd ones open), each with two STATE effects: one with polarity
+    i * 10 and one negative.
+    """
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(10):
+        goal_id = f"goal{i}"
+        effects = [f"up{i}", f"down{i}"]
+        await storage.store_node(GraphNode(
+            node_id=goal_id,
+            object_type="GOAL",
+            caption=f"goal {i}",
+            extra_properties={"status": "open" if i % 2 else "closed"},
+            children={"Effects": [ChildRef(edge_label="Effects", child_id=c) for c in effects]},
+        ))
+        for child_id, polarity in zip(effects, (i * 10, -50)):
+            await storage.store_node(GraphNode(
+                node_id=child_id,
+                object_type="STATE",
+                caption=f"state {child_id}",
+                extra_properties={"polarity": polarity},
+                parent=ParentRef(edge_label="Effects", parent_id=goal_id),
+            ))
+    return storage
+
+def goal_effects(goal_where, state_where) -> GraphPattern:
+    return GraphPattern(
+        nodes=[PatternNode(var="g", object_type="GOAL", where=goal_where),
+               PatternNode(var="s", object_type="STATE", where=state_where)],
+        edges=[PatternEdge(source="g", label="Effects", target="s")],
+    )
+
+@pytest.mark.asyncio
+async def test_forward_expansion_from_selective_parent():
+    await seed()
+    pattern = goal_effects(
+        [PropertyPredicate(field="status", value="open")],
+        [PropertyPredicate(field="polarity", op="gte", value=0)],
+    )
+    bindings, truncated, trace = await PatternMatcher(TEST_USER_ID).match(pattern)
+
+    assert sorted(b["s"] for b in bindings) == ["up1", "up3", "up5", "up7", "up9"]
+    assert all(b["g"] == "goal" + b["s"][2:] for b in bindings)
+    assert not truncated
+    assert trace.steps[0].detail["var"] == "g"
+
+@pytest.mark.asyncio
+async def test_backward_expansion_from_selective_child():
+    await seed()
+    pattern = goal_effects(
+        [PropertyPredicate(field="status", value="open")],
+        [PropertyPredicate(field="polarity", op="gte", value=70)],
+    )
+    bindings, _, trace = await PatternMatcher(TEST_USER_ID).match(pattern)
+
+    assert sorted((b["g"], b["s"]) for b in bindings) == [("goal7", "up7"), ("goal9", "up9")]
+    assert trace.steps[0].detail["var"] == "s"
+
+@pytest.mark.asyncio
+async def test_untyped_or_disconnected_patterns_are_rejected():
+    matcher = PatternMatcher(TEST_USER_ID)
+    with pytest.raises(ValueError):
+        await matcher.match(GraphPattern(
+            nodes=[PatternNode(var="a"), PatternNode(var="b")],
+            edges=[PatternEdge(source="a", label="Parts", target="b")],
+        ))
+    with pytest.raises(ValueError):
+        await matcher.match(GraphPattern(
+            nodes=[PatternNode(var="a", object_type="GOAL"), PatternNode(var="b")],
+            edges=[],
+        ))
+
+@pytest.mark.asyncio
+async def test_seed_and_expansion_stop_at_the_binding_cap(monkeypatch):
+    await seed()
+    pattern = goal_effects([], [])
+
+    monkeypatch.setattr(pattern_module, "PATTERN_BATCH_SIZE", 3)
+    bindings, truncated, _ = await PatternMatcher(TEST_USER_ID).match(pattern)
+    assert len(bindings) == 20 and not truncated
+
+    # Ten goals seed past a cap of four, and their effects expand past it again
+    monkeypatch.setattr(pattern_module, "MAX_BINDINGS", 4)
+    bindings, truncated, trace = await PatternMatcher(TEST_USER_ID).match(pattern)
+    assert truncated
+    assert len(bindings) == 4
+    assert trace.steps[1].detail["frontier"] == 4
+    assert all(b["g"] == "goal" + b["s"].lstrip("updown") for b in bindings)
@@ -0,0 +1,129 @@
+import pytest
+from datetime import datetime
+from pyserver.schemas.node_query import NodeQuery, PropertyPredicate, QuerySort, DateWindow
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.storage.query.planner import QueryPlanner
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_query_planner"
+SUBTREE = f"urlife:{TEST_USER_ID}:recursive_folder:projects"
+
+async def seed() -> NodeStorage:
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    conn = await storage.redis_manager.get_connection()
+    for i in range(40):
+        await storage.store_node(GraphNode(
+            node_id=f"g{i:02d}",
+            object_type="GOAL",
+            caption=f"goal number {i}",
+            extra_properties={
+                "status": "open" if i % 2 else "closed",
+                "priority": "high" if i % 5 == 0 else "low",
+                "Urgent": i % 10 == 0,
+                "attention": i,
+                "due": {"date": f"2025-03-{1 + i % 28:02d}", "time": None},
+            },
+        ))
+        if i < 20:
+            await conn.sadd(SUBTREE, f"g{i:02d}")
+    return storage
+
+@pytest.mark.asyncio
+async def test_intersection_pushdown_with_range_and_sort():
+    await seed()
+    query = NodeQuery(
+        root_id="projects",
+        object_type="GOAL",
+        where=[PropertyPredicate(field="Urgent", value=True),
+               PropertyPredicate(field="attention", op="gte", value=0)],
+        sort=QuerySort(field="attention"),
+        limit=10,
+        explain=True,
+    )
+    nodes, total, trace = await QueryPlanner(TEST_USER_ID).run(query)
+
+    assert [n.node_id for n in nodes] == ["g10", "g00"]
+    assert total == 2
+    assert [s.step for s in trace.steps] == ["estimate", "intersect", "filter", "sort", "hydrate"]
+    assert trace.round_trips == 4
+
+@pytest.mark.asyncio
+async def test_small_page_walks_the_sort_index():
+    await seed()
+    query = NodeQuery(
+        root_id="projects",
+        object_type="GOAL",
+        where=[PropertyPredicate(field="priority", value="high"),
+               PropertyPredicate(field="attention", op="gte", value=0)],
+        sort=QuerySort(field="attention"),
+        limit=2,
+    )
+    nodes, total, trace = await QueryPlanner(TEST_USER_ID).run(query)
+
+    assert [n.node_id for n in nodes] == ["g15", "g10"]
+    assert total is None
+    assert trace.steps[1].step == "walk"
+
+@pytest.mark.asyncio
+async def test_selective_range_drives_a_walk():
+    await seed()
+    query = NodeQuery(
+        object_type="GOAL",
+        where=[PropertyPredicate(field="attention", op="between", value=30, value_to=33),
+               PropertyPredicate(field="status", value="open")],
+        limit=10,
+    )
+    nodes, total, trace = await QueryPlanner(TEST_USER_ID).run(query)
+
+    assert [n.node_id for n in nodes] == ["g31", "g33"]
+    assert total is None
+    assert trace.steps[1].step == "walk"
+
+@pytest.mark.asyncio
+async def test_date_window_and_empty_short_circuit():
+    await seed()
+    window = DateWindow(field="due", start=datetime(2025, 3, 1), end=datetime(2025, 3, 2))
+    nodes, _, _ = await QueryPlanner(TEST_USER_ID).run(
+        NodeQuery(object_type="GOAL", date=window, sort=QuerySort(field="attention", descending=False))
+    )
+    assert [n.node_id for n in nodes] == ["g00", "g01", "g28", "g29"]
+
+    nodes, total, trace = await QueryPlanner(TEST_USER_ID).run(
+        NodeQuery(object_type="GOAL", where=[PropertyPredicate(field="status", value="in_progress")])
+    )
+    assert (nodes, total, trace.steps[-1].step) == ([], 0, "empty")
+
+    with pytest.raises(ValueError):
+        await QueryPlanner(TEST_USER_ID).run(NodeQuery(object_type="GOAL", where=[PropertyPredicate(field="nope", value=1)]))
+
+@pytest.mark.asyncio
+async def test_sort_keeps_matches_without_a_sort_value():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(40):
+        properties = {"due": {"date": f"2025-03-{1 + i:02d}", "time": None}} if i < 3 else {}
+        await storage.store_node(GraphNode(
+            node_id=f"g{i:02d}", object_type="GOAL", caption=f"goal {i}", extra_properties=properties
+        ))
+
+    for limit in (2, 30):
+        query = NodeQuery(object_type="GOAL", sort=QuerySort(field="due"), limit=limit)
+        nodes, total, _ = await QueryPlanner(TEST_USER_ID).run(query)
+        assert total == 40
+        assert len(nodes) == limit
+        assert [n.node_id for n in nodes[:2]] == ["g02", "g01"]
+    assert nodes[2].node_id == "g00"
+
+    with pytest.raises(ValueError):
+        await QueryPlanner(TEST_USER_ID).run(NodeQuery(object_type="GOAL", sort=QuerySort(field="dew")))
+
+@pytest.mark.asyncio
+async def test_caption_filter_needs_every_trigram():
+    await seed()
+    nodes, total, trace = await QueryPlanner(TEST_USER_ID).run(
+        NodeQuery(root_id="projects", object_type="GOAL", caption="number 1", explain=True)
+    )
+    assert sorted(n.node_id for n in nodes) == ["g01"] + [f"g{i}" for i in range(10, 20)]
+    assert total == 11
+    assert trace.round_trips == 3
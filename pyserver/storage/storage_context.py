@@ -5,6 +5,7 @@ from pyserver.storage.file_storage import FileStorage
 from pyserver.storage.user.user_storage import UserStorage
 from pyserver.storage.folder_storage import FolderStorage
 from pyserver.storage.index.tracker import FolderTracker
+from pyserver.storage.change_stream import ChangeStream
 
 class StorageContext:
     def __init__(self, user_id: str):
@@ -22,6 +23,7 @@ class StorageContext:
         self.user_storage = UserStorage()
         self.folder_storage = FolderStorage(user_id)
         self.folder_tracker = FolderTracker(self.user_id)
+        self.change_stream = ChangeStream(self.user_id)
 
     def node_storage(self) -> NodeStorage:
         """Get the node storage instance."""
@@ -50,3 +52,7 @@ class StorageContext:
     def folder_tracker(self) -> FolderTracker:
         """Get the folder tracker instance."""
         return self.folder_tracker
+
+    def change_stream(self) -> ChangeStream:
+        """Get the change stream instance."""
+        return self.change_stream
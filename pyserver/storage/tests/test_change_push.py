@@ -0,0 +1,72 @@
+import pytest
+from pyserver.storage import change_push
+from pyserver.storage.change_push import ChangePushHub, PushSubscription
+from pyserver.storage.change_stream import ChangeOp, ChangeRecord
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode, ParentRef
+
+TEST_USER_ID = "test_user_change_push"
+
+def _child(node_id: str, parent_id: str, object_type: str = "GOAL") -> GraphNode:
+    return GraphNode(
+        node_id=node_id, object_type=object_type, caption=node_id,
+        parent=ParentRef(edge_label="CHILD_OF", parent_id=parent_id),
+    )
+
+@pytest.mark.asyncio
+async def test_bursts_fan_out_merged_and_filtered_by_subtree(monkeypatch):
+    # Wide enough that the whole burst below lands in one read
+    monkeypatch.setattr(change_push, "PUSH_COALESCE_SECONDS", 0.3)
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    await storage.store_node(GraphNode(node_id="root", object_type="FOLDER", caption="root"))
+    await storage.store_node(_child("inbox", "root", "FOLDER"))
+    await storage.store_node(_child("archive", "root", "FOLDER"))
+    resume_from = await storage.changes.latest_cursor()
+
+    hub = ChangePushHub()
+    try:
+        everything = await hub.subscribe(TEST_USER_ID)
+        inbox = await hub.subscribe(TEST_USER_ID, roots=["inbox"])
+
+        await storage.store_node(_child("g1", "inbox"))
+        g1 = await storage.get_node("g1")
+        g1.caption = "renamed"
+        await storage.store_node(g1, ["caption"])
+        await storage.store_node(_child("g2", "archive"))
+
+        event = await everything.next_event(timeout=2)
+        assert [(c.node_id, c.op) for c in event.changes] == [("g1", ChangeOp.CREATE), ("g2", ChangeOp.CREATE)]
+        assert event.changes[0].version == 2
+        event = await inbox.next_event(timeout=2)
+        assert [(c.node_id, c.op) for c in event.changes] == [("g1", ChangeOp.CREATE)]
+        assert event.cursor == await storage.changes.latest_cursor()
+
+        # A reconnect picks up from its last cursor
+        resumed = await hub.subscribe(TEST_USER_ID, roots=["archive"], since=resume_from)
+        event = await resumed.next_event(timeout=2)
+        assert [c.node_id for c in event.changes] == ["g2"]
+
+        for subscription in (everything, inbox, resumed):
+            hub.unsubscribe(TEST_USER_ID, subscription)
+        assert hub.connections() == 0
+    finally:
+        await hub.stop()
+
+@pytest.mark.asyncio
+async def test_slow_consumers_are_told_to_resync(monkeypatch):
+    monkeypatch.setattr(change_push, "PUSH_BUFFER_LIMIT", 3)
+    subscription = PushSubscription([], "1-0")
+    subscription.offer([
+        ChangeRecord(cursor=f"2-{i}", node_id=f"n{i % 2}", op=ChangeOp.UPDATE, fields=[f"f{i}"])
+        for i in range(4)
+    ])
+    event = await subscription.next_event()
+    assert [(c.node_id, c.fields) for c in event.changes] == [("n0", ["f0", "f2"]), ("n1", ["f1", "f3"])]
+
+    subscription.offer([
+        ChangeRecord(cursor=f"3-{i}", node_id=f"n{i}", op=ChangeOp.UPDATE) for i in range(5)
+    ])
+    event = await subscription.next_event()
+    assert event.resync_required and event.cursor == "2-3" and event.changes == []
+    assert await subscription.next_event(timeout=0.01) is None
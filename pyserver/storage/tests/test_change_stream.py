@@ -0,0 +1,68 @@
+import pytest
+import pytest_asyncio
+from pyserver.storage.change_stream import ChangeOp, INITIAL_CURSOR, parse_cursor
+from pyserver.storage.node_factory import create_node_under_folder
+from pyserver.storage.storage_context import StorageContext
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_change_stream"
+
+@pytest_asyncio.fixture
+async def storage():
+    storage = StorageContext(TEST_USER_ID)
+    await storage.node_storage.clear_all_nodes()
+    await storage.folder_tracker.clear_all_indexes()
+    yield storage
+    await storage.node_storage.clear_all_nodes()
+
+def test_cursors_compare_numerically():
+    assert parse_cursor("10-0") > parse_cursor("9-5")
+    assert parse_cursor("10-2") > parse_cursor("10-1")
+    assert parse_cursor(INITIAL_CURSOR) == (0, 0)
+
+@pytest.mark.asyncio
+async def test_writes_are_logged_in_order(storage: StorageContext):
+    folder_id = await storage.folder_storage.create_folder("change_stream_folder")
+    cursor = await storage.change_stream.latest_cursor()
+
+    node = await create_node_under_folder(storage, folder_id, "GOAL", "Tracked Goal")
+    await storage.node_storage.update_properties(node.node_id, {"attention": 50})
+
+    records, has_more = await storage.change_stream.read_since(cursor, limit=100)
+    ops = [(r.node_id, r.op) for r in records]
+
+    assert ops == [
+        (node.node_id, ChangeOp.CREATE),
+        (folder_id, ChangeOp.UPDATE),
+        (node.node_id, ChangeOp.INDEX_ADD),
+        (node.node_id, ChangeOp.UPDATE),
+    ]
+    assert records[-1].fields == ["extra_properties.attention", "updated_at"]
+    assert records[-1].version == 2
+    assert not has_more
+
+@pytest.mark.asyncio
+async def test_read_is_paginated_from_cursor(storage: StorageContext):
+    folder_id = await storage.folder_storage.create_folder("paged_folder")
+    for i in range(3):
+        await create_node_under_folder(storage, folder_id, "THOUGHT", f"Thought {i}")
+
+    first, has_more = await storage.change_stream.read_since(INITIAL_CURSOR, limit=2)
+    assert has_more
+
+    rest, _ = await storage.change_stream.read_since(first[-1].cursor, limit=100)
+    assert all(parse_cursor(r.cursor) > parse_cursor(first[-1].cursor) for r in rest)
+    assert not await storage.change_stream.cursor_expired(first[-1].cursor)
+
+@pytest.mark.asyncio
+async def test_one_write_notifies_once_for_all_its_records(storage: StorageContext):
+    cursor = await storage.change_stream.latest_cursor()
+    generation = await storage.change_stream.generation()
+
+    await storage.node_storage.store_nodes([
+        (GraphNode(node_id=f"n{i}", object_type="THOUGHT", caption=f"Thought {i}"), None) for i in range(3)
+    ])
+
+    records, _ = await storage.change_stream.read_since(cursor, limit=100)
+    assert [r.node_id for r in records] == ["n0", "n1", "n2"]
+    assert await storage.change_stream.generation() == generation + 1
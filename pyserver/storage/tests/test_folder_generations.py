@@ -0,0 +1,56 @@
+import pytest
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode, ParentRef
+
+TEST_USER_ID = "test_user_folder_generations"
+
+def _child(node_id: str, parent_id: str, object_type: str = "GOAL") -> GraphNode:
+    return GraphNode(
+        node_id=node_id, object_type=object_type, caption=node_id,
+        parent=ParentRef(edge_label="CHILD_OF", parent_id=parent_id),
+    )
+
+@pytest.mark.asyncio
+async def test_writes_bump_the_parent_chain_only():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    generations = storage.generations
+    await storage.store_node(GraphNode(node_id="root", object_type="FOLDER", caption="root"))
+    await storage.store_node(_child("inbox", "root", "FOLDER"))
+    await storage.store_node(_child("archive", "root", "FOLDER"))
+
+    before = {
+        folder: (await generations.direct(folder), await generations.subtree(folder))
+        for folder in ["root", "inbox", "archive"]
+    }
+    await storage.store_node(_child("g1", "inbox"))
+
+    assert await generations.direct("inbox") > before["inbox"][0]
+    assert await generations.subtree("inbox") > before["inbox"][1]
+    assert await generations.subtree("root") > before["root"][1]
+    # Not a direct member of the root, and nowhere near the archive
+    assert await generations.direct("root") == before["root"][0]
+    assert (await generations.direct("archive"), await generations.subtree("archive")) == before["archive"]
+
+    subtree = await generations.subtree("root")
+    node = await storage.get_node("g1")
+    node.caption = "renamed"
+    await storage.store_node(node)
+    assert await generations.subtree("root") > subtree
+
+    subtree = await generations.subtree("root")
+    await storage.delete_node("g1")
+    assert await generations.subtree("root") > subtree
+
+@pytest.mark.asyncio
+async def test_wiping_nodes_moves_generations_on():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    await storage.store_node(GraphNode(node_id="root", object_type="FOLDER", caption="root"))
+    await storage.store_node(_child("g1", "root"))
+    before = (await storage.generations.direct("root"), await storage.generations.subtree("root"))
+
+    await storage.clear_all_nodes()
+    # A listing tagged before the wipe must not match the empty folder after it
+    assert await storage.generations.direct("root") > before[0]
+    assert await storage.generations.subtree("root") > before[1]
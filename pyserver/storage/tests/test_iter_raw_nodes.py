@@ -0,0 +1,24 @@
+import json
+import pytest
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.storage.write_buffer import WriteBuffer
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_iter_raw_nodes"
+
+@pytest.mark.asyncio
+async def test_batches_skip_missing_nodes_and_show_buffered_writes():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(5):
+        await storage.store_node(GraphNode(
+            node_id=f"n{i}", object_type="GOAL", caption=f"goal {i}", extra_properties={"attention": 0}
+        ))
+    storage.write_buffer = WriteBuffer(window_ms=10_000)
+    storage.write_buffer.stage(storage, "n3", {"attention": 7}, "2025-01-01T00:00:00")
+
+    batches = [batch async for batch in storage.iter_raw_nodes(["n0", "n1", "gone", "n2", "n3", "n4"], 2)]
+
+    assert [[json.loads(raw)["node_id"] for raw in batch] for batch in batches] == [["n0", "n1"], ["n2"], ["n3", "n4"]]
+    assert json.loads(batches[2][0])["extra_properties"]["attention"] == 7
+    storage.write_buffer._timers.popitem()[1].cancel()
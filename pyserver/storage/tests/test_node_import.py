@@ -0,0 +1,106 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from pyserver.storage import node_import
+from pyserver.storage.node_import import NodeImporter
+from pyserver.storage.storage_context import StorageContext
+
+TEST_USER_ID = "test_user_node_import"
+
+@pytest_asyncio.fixture
+async def storage():
+    storage = StorageContext(TEST_USER_ID)
+    await storage.node_storage.clear_all_nodes()
+    await storage.folder_tracker.clear_all_indexes()
+    yield storage
+    await storage.node_storage.clear_all_nodes()
+
+async def chunked(lines, size=7):
+    body = "\n".join(json.dumps(line) if isinstance(line, dict) else line for line in lines).encode()
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+@pytest.mark.asyncio
+async def test_stream_imports_with_temp_ids_and_reports_failures(storage, monkeypatch):
+    monkeypatch.setattr(node_import, "IMPORT_BATCH_SIZE", 2)
+    parent_folder = await storage.folder_storage.create_folder("import_root")
+    folder_id = await storage.folder_storage.create_folder("import_target", parent_id=parent_folder)
+
+    lines = [
+        {"temp_id": "g1", "object_type": "GOAL", "caption": "Ship it", "parent": folder_id,
+         "extra_properties": {"status": "in_progress"}},
+        {"temp_id": "s1", "object_type": "STATE", "caption": "Shipped", "parent": "g1",
+         "edge_label": "Effects", "extra_properties": {"polarity": 80}},
+        "{not json",
+        {"temp_id": "g2", "object_type": "GOAL", "caption": "Bad", "parent": folder_id,
+         "extra_properties": {"status": "someday"}},
+        {"temp_id": "s2", "object_type": "STATE", "caption": "Orphan", "parent": "nowhere",
+         "edge_label": "Effects"},
+        {"temp_id": "g1", "object_type": "GOAL", "caption": "Again", "parent": folder_id},
+        {"temp_id": "s3", "object_type": "STATE", "caption": "Also shipped", "parent": "g1",
+         "edge_label": "Effects"},
+    ]
+    summary = await NodeImporter(storage).run(chunked(lines))
+
+    assert (summary.received, summary.imported, summary.failed) == (7, 3, 4)
+    assert [e.line for e in summary.errors] == [3, 4, 5, 6]
+
+    goal_id = (await storage.folder_tracker.list_direct(folder_id)).pop()
+    goal = await storage.node_storage.get_node(goal_id)
+    assert goal.extra_properties["status"] == "in_progress"
+    effects = [ref.child_id for ref in goal.children["Effects"]]
+    assert len(effects) == 2
+    state = await storage.node_storage.get_node(effects[0])
+    assert (state.caption, state.parent.parent_id) == ("Shipped", goal_id)
+    assert set(await storage.folder_tracker.list_recursive(parent_folder)) == {goal_id}
+
+    folder = await storage.node_storage.get_node(folder_id)
+    assert [ref.child_id for ref in folder.children["CHILDREN"]] == [goal_id]
+    assert await storage.node_storage.indexes.types.list("STATE") == set(effects)
+
+@pytest.mark.asyncio
+async def test_resumed_import_resolves_earlier_temp_ids(storage):
+    folder_id = await storage.folder_storage.create_folder("import_resume")
+    first = await NodeImporter(storage).run(chunked([
+        {"temp_id": "g1", "object_type": "GOAL", "caption": "First", "parent": folder_id},
+    ]))
+    second = await NodeImporter(storage, first.import_id).run(chunked([
+        {"temp_id": "n1", "object_type": "THOUGHT", "caption": "Later", "parent": "g1",
+         "edge_label": "Notes"},
+    ]))
+
+    assert second.imported == 1
+    progress = await NodeImporter(storage, first.import_id).progress()
+    assert (progress.status, progress.imported) == ("done", 1)
+    goal_id = (await storage.folder_tracker.list_direct(folder_id)).pop()
+    assert len((await storage.node_storage.get_node(goal_id)).children["Notes"]) == 1
+
+@pytest.mark.asyncio
+async def test_parent_rewrite_waits_for_other_writers(storage):
+    folder_id = await storage.folder_storage.create_folder("import_locked")
+    first = await NodeImporter(storage).run(chunked([
+        {"temp_id": "g1", "object_type": "GOAL", "caption": "Parent", "parent": folder_id},
+    ]))
+    goal_id = (await storage.folder_tracker.list_direct(folder_id)).pop()
+    node_storage = storage.node_storage
+
+    async with node_storage.locks.hold([goal_id]):
+        importing = asyncio.create_task(NodeImporter(storage, first.import_id).run(chunked([
+            {"temp_id": "n1", "object_type": "THOUGHT", "caption": "Note", "parent": "g1",
+             "edge_label": "Notes"},
+        ])))
+        await asyncio.sleep(0.05)
+        assert not importing.done()
+        # Another writer's update, landing while the importer waits for the parent
+        goal = await node_storage.get_node(goal_id)
+        goal.caption = "Renamed"
+        goal.version += 1
+        conn = await node_storage.redis_manager.get_connection()
+        await conn.hset(node_storage._get_node_key(goal_id), goal_id, goal.json())
+    await importing
+
+    goal = await node_storage._read_previous(goal_id)
+    assert goal.caption == "Renamed"
+    assert len(goal.children["Notes"]) == 1
+    assert goal.version == 3
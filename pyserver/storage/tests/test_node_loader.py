@@ -0,0 +1,31 @@
+import asyncio
+import json
+import pytest
+from pyserver.storage.node_loader import NodeLoader
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_node_loader"
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_fetch_per_node():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(4):
+        await storage.store_node(GraphNode(node_id=f"n{i}", object_type="GOAL", caption=f"goal {i}"))
+
+    loader = NodeLoader(storage)
+    one, many, missing = await asyncio.gather(
+        loader.load("n0"),
+        loader.load_many(["n1", "n0", "n2"]),
+        loader.load("missing"),
+    )
+    assert json.loads(one)["caption"] == "goal 0"
+    assert [json.loads(raw)["node_id"] for raw in many] == ["n1", "n0", "n2"]
+    assert missing is None
+    assert loader.round_trips == 1
+
+    # Already loaded nodes are never fetched again
+    await loader.load_many(["n0", "n1"])
+    assert (await loader.load_decoded("n3"))["caption"] == "goal 3"
+    assert loader.round_trips == 2
@@ -0,0 +1,46 @@
+import json
+import pytest
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.storage.projection import parse_fields, project_raw
+from pyserver.system.graph_node import ChildRef, GraphNode
+
+TEST_USER_ID = "test_user_projection"
+
+def test_projection_keeps_only_requested_fields():
+    node = GraphNode(
+        node_id="n1", object_type="GOAL", caption='say "hi", {ok}',
+        extra_properties={"notes": "a}b,c", "nested": {"x": [1, 2]}},
+        children={"Effects": [ChildRef(edge_label="Effects", child_id="c1")]},
+        version=4,
+    )
+    fields = parse_fields("caption, object_type")
+    assert fields == {"node_id", "caption", "object_type"}
+
+    for raw in [node.json(), json.dumps(json.loads(node.json()), indent=2)]:
+        projected = project_raw(raw, fields)
+        assert json.loads(projected) == {"node_id": "n1", "object_type": "GOAL", "caption": 'say "hi", {ok}'}
+    assert json.loads(project_raw(node.json(), ["extra_properties"])) == {
+        "extra_properties": {"notes": "a}b,c", "nested": {"x": [1, 2]}}
+    }
+
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    with pytest.raises(ValueError):
+        parse_fields("caption,color")
+
+@pytest.mark.asyncio
+async def test_read_raw_nodes_projects_cached_and_stored_documents():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(3):
+        await storage.store_node(GraphNode(
+            node_id=f"n{i}", object_type="GOAL", caption=f"goal {i}",
+            extra_properties={"status": "open"},
+        ))
+    storage.cache.invalidate(TEST_USER_ID, "n1")
+
+    raw_nodes = await storage.read_raw_nodes(["n0", "n1", "missing", "n2"], fields={"node_id", "caption"})
+    assert raw_nodes[2] is None
+    assert [json.loads(raw) for raw in raw_nodes if raw] == [
+        {"node_id": f"n{i}", "caption": f"goal {i}"} for i in range(3)
+    ]
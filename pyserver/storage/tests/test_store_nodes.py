@@ -0,0 +1,125 @@
+import pytest
+from pyserver.schemas.node_batch_update import FieldEdit
+from pyserver.storage.cache.node_cache import NodeCache
+from pyserver.storage.change_stream import ChangeOp
+from pyserver.storage.node_storage import NodeStorage
+from pyserver.system.field_edit import FieldEditChanger, validate_field_edit
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_store_nodes"
+
+@pytest.mark.asyncio
+async def test_batched_edits_land_in_one_write_per_node():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    for i in range(3):
+        await storage.store_node(GraphNode(
+            node_id=f"g{i}", object_type="GOAL", caption=f"goal {i}",
+            extra_properties={"status": "open"},
+        ))
+    cursor = await storage.changes.latest_cursor()
+
+    writes = []
+    for node in [await storage.get_node(f"g{i}") for i in range(3)]:
+        edits = [
+            FieldEdit(node_id=node.node_id, kind="radio", field="status", value="closed"),
+            FieldEdit(node_id=node.node_id, kind="number", field="attention", value=0),
+        ]
+        changer = FieldEditChanger([(e, validate_field_edit(node.object_type, e)) for e in edits])
+        changer.change_node(node)
+        writes.append((node, changer.changed_fields()))
+    await storage.store_nodes(writes)
+
+    for i in range(3):
+        node = await storage.get_node(f"g{i}")
+        assert node.extra_properties == {"status": "closed", "attention": 0}
+        assert node.version == 2
+    closed, _ = await storage.indexes.facets.filter("GOAL", {"status": "closed"}, [])
+    assert closed == ["g0", "g1", "g2"]
+
+    records, _ = await storage.changes.read_since(cursor, limit=100)
+    assert [(r.node_id, r.op) for r in records] == [(f"g{i}", ChangeOp.UPDATE) for i in range(3)]
+    assert records[0].fields == ["extra_properties.status", "extra_properties.attention", "updated_at"]
+
+def test_edits_are_checked_against_the_type_schema():
+    ok = FieldEdit(node_id="n", kind="checkbox", field="Urgent", value=True)
+    assert validate_field_edit("GOAL", ok) is True
+
+    for bad in [
+        FieldEdit(node_id="n", kind="checkbox", field="Urgent", value="yes"),
+        FieldEdit(node_id="n", kind="radio", field="status", value="done"),
+        FieldEdit(node_id="n", kind="number", field="attention", value=1000),
+        FieldEdit(node_id="n", kind="number", field="polarity", value=1),
+        FieldEdit(node_id="n", kind="caption", value=5),
+    ]:
+        with pytest.raises(ValueError):
+            validate_field_edit("GOAL", bad)
+
+@pytest.mark.asyncio
+async def test_updates_follow_the_stored_copy_not_the_callers():
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    await storage.store_node(GraphNode(node_id="n1", object_type="GOAL", caption="old caption"))
+
+    # A document written before nodes were versioned
+    conn = await storage.redis_manager.get_connection()
+    legacy = GraphNode(node_id="n1", object_type="GOAL", caption="old caption")
+    await conn.hset(storage._get_node_key("n1"), "n1", legacy.json())
+    storage.cache.clear()
+
+    legacy.caption = "new caption"
+    await storage.store_node(legacy)
+    assert await storage.indexes.prefixes.complete("GOAL", "old") == []
+    assert await storage.indexes.prefixes.complete("GOAL", "new") == [("n1", "new caption")]
+    assert (await storage.get_node("n1")).version == 1
+
+    # Two writes from the same stale copy still move the version forward
+    stale = await storage.get_node("n1")
+    await storage.store_node(stale.model_copy())
+    await storage.store_node(stale.model_copy())
+    assert (await storage.get_node("n1")).version == 3
+
+@pytest.mark.asyncio
+async def test_a_read_racing_the_commit_does_not_cache_the_old_copy(monkeypatch):
+    storage = NodeStorage(TEST_USER_ID)
+    await storage.clear_all_nodes()
+    storage.cache = NodeCache()
+    storage.cache.enable()
+    await storage.store_node(GraphNode(node_id="n1", object_type="GOAL", caption="old"))
+    conn = await storage.redis_manager.get_connection()
+    pipeline = conn.pipeline
+    fills = []
+
+    class RacedPipeline:
+        def __init__(self, pipe):
+            self._pipe = pipe
+
+        def __getattr__(self, name):
+            return getattr(self._pipe, name)
+
+        async def execute(self):
+            # A reader misses the cache and reads the stored copy just before the commit...
+            epoch = storage.cache.epoch
+            raw, = await storage.get_raw_nodes(["n1"])
+            fills.append((epoch, raw))
+            return await self._pipe.execute()
+
+    for write in ("store_node", "store_nodes"):
+        # Only the write's MULTI races; lock pipelines don't
+        monkeypatch.setattr(
+            conn, "pipeline",
+            lambda transaction=True: RacedPipeline(pipeline()) if transaction else pipeline(transaction=False),
+        )
+        node = await storage.get_node("n1")
+        node.caption = f"new via {write}"
+        if write == "store_node":
+            await storage.store_node(node)
+        else:
+            await storage.store_nodes([(node, ["caption"])])
+        monkeypatch.setattr(conn, "pipeline", pipeline)
+
+        # ...and only fills the cache with it once the writer has cached its own copy
+        (epoch, raw), = fills
+        fills.clear()
+        storage.cache.put(TEST_USER_ID, GraphNode.model_validate_json(raw), len(raw), epoch=epoch, raw=raw)
+        assert (await storage.get_node("n1")).caption == f"new via {write}"
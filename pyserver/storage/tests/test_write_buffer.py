@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from pyserver.storage.write_buffer import WriteBuffer, PendingWrite
+from pyserver.system.graph_node import GraphNode
+
+TEST_USER_ID = "test_user_write_buffer"
+
+class RecordingStorage:
+    """Stands in for NodeStorage: applies flushed writes to in-memory nodes."""
+
+    def __init__(self, fail_times: int = 0):
+        self.user_id = TEST_USER_ID
+        self.nodes = {}
+        self.writes = 0
+        self.fail_times = fail_times
+
+    async def apply_pending_write(self, node_id: str, pending: PendingWrite) -> None:
+        if node_id not in self.nodes:
+            raise ValueError(f"Node {node_id} not found")
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("redis went away")
+        node = self.nodes[node_id]
+        pending.apply(node)
+        self.writes += 1
+
+def make_storage(**kwargs) -> RecordingStorage:
+    storage = RecordingStorage(**kwargs)
+    storage.nodes["n1"] = GraphNode(
+        node_id="n1", object_type="GOAL", caption="Goal", extra_properties={"attention": 0}
+    )
+    return storage
+
+@pytest.mark.asyncio
+async def test_burst_collapses_to_one_write():
+    buffer = WriteBuffer(window_ms=20)
+    storage = make_storage()
+
+    for value in range(10):
+        buffer.stage(storage, "n1", {"attention": value}, "2025-01-01T00:00:00")
+    buffer.stage(storage, "n1", {"Urgent": True}, "2025-01-01T00:00:01")
+
+    await asyncio.sleep(0.05)
+
+    assert storage.writes == 1
+    assert storage.nodes["n1"].extra_properties == {"attention": 9, "Urgent": True}
+    assert storage.nodes["n1"].updated_at == "2025-01-01T00:00:01"
+
+@pytest.mark.asyncio
+async def test_reads_see_staged_values():
+    buffer = WriteBuffer(window_ms=1000)
+    storage = make_storage()
+    buffer.stage(storage, "n1", {"attention": 42}, "2025-01-01T00:00:00")
+
+    stored = storage.nodes["n1"].model_copy(deep=True)
+    assert stored.extra_properties["attention"] == 0
+    assert buffer.overlay(TEST_USER_ID, stored).extra_properties["attention"] == 42
+    assert buffer.has_pending(TEST_USER_ID) and buffer.has_pending(TEST_USER_ID, "n1")
+    assert not buffer.has_pending(TEST_USER_ID, "n2") and not buffer.has_pending("someone_else")
+
+    await buffer.flush_all()
+
+@pytest.mark.asyncio
+async def test_flush_all_writes_everything_pending():
+    buffer = WriteBuffer(window_ms=60_000)
+    storage = make_storage()
+    buffer.stage(storage, "n1", {"attention": 7}, "2025-01-01T00:00:00")
+
+    await buffer.flush_all()
+
+    assert storage.writes == 1
+    assert storage.nodes["n1"].extra_properties["attention"] == 7
+    assert not buffer.has_pending()
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried():
+    buffer = WriteBuffer(window_ms=5)
+    storage = make_storage(fail_times=1)
+    buffer.stage(storage, "n1", {"attention": 3}, "2025-01-01T00:00:00")
+
+    await asyncio.sleep(0.05)
+
+    assert storage.writes == 1
+    assert storage.nodes["n1"].extra_properties["attention"] == 3
+    assert buffer.stats.failed_flushes == 1
+
+@pytest.mark.asyncio
+async def test_acknowledged_updates_outlive_a_short_outage():
+    buffer = WriteBuffer(window_ms=1)
+    storage = make_storage(fail_times=6)
+    buffer.stage(storage, "n1", {"attention": 4}, "2025-01-01T00:00:00")
+
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if storage.writes:
+            break
+
+    assert storage.nodes["n1"].extra_properties["attention"] == 4
+    assert (buffer.stats.failed_flushes, buffer.stats.dropped_updates) == (6, 0)
+
+@pytest.mark.asyncio
+async def test_only_permanent_failures_and_shutdown_drop_updates():
+    buffer = WriteBuffer(window_ms=1)
+    storage = make_storage()
+    buffer.stage(storage, "gone", {"attention": 1}, "2025-01-01T00:00:00")
+    await asyncio.sleep(0.02)
+    assert buffer.stats.failed_flushes == 1
+    assert buffer.stats.dropped_updates == 1
+    assert not buffer.has_pending()
+
+    storage.fail_times = 1_000
+    buffer.stage(storage, "n1", {"attention": 2}, "2025-01-01T00:00:00")
+    buffer.stage(storage, "n1", {"Urgent": True}, "2025-01-01T00:00:01")
+    await buffer.flush_all()
+    assert buffer.snapshot()["dropped_updates"] == 3
+    assert not buffer.has_pending()
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from pyserver.system.graph_node import GraphNode
+
+if TYPE_CHECKING:
+    from pyserver.storage.node_storage import NodeStorage
+
+logger = logging.getLogger(__name__)
+
+# 0 disables buffering: every property update is written straight through
+WRITE_BUFFER_WINDOW_MS = float(os.environ.get("URLIFE_WRITE_BUFFER_WINDOW_MS", 0))
+# Failed flushes are retried after window * 2^attempts, at most this long apart
+WRITE_BUFFER_MAX_BACKOFF_SECONDS = float(os.environ.get("URLIFE_WRITE_BUFFER_MAX_BACKOFF_SECONDS", 5))
+# Flush attempts per pending node on shutdown before its updates are given up
+WRITE_BUFFER_SHUTDOWN_ATTEMPTS = 3
+
+BufferKey = Tuple[str, str]
+
+
+@dataclass
+class PendingWrite:
+    storage: "NodeStorage"
+    properties: Dict[str, Any] = field(default_factory=dict)
+    updated_at: Optional[str] = None
+    updates: int = 0
+    attempts: int = 0
+
+    def merge(self, properties: Dict[str, Any], updated_at: str) -> None:
+        self.properties.update(properties)
+        self.updated_at = updated_at
+        self.updates += 1
+
+    def changed_fields(self) -> List[str]:
+        fields = [f"extra_properties.{key}" for key in self.properties]
+        if self.updated_at:
+            fields.append("updated_at")
+        return fields
+
+    def apply(self, node: GraphNode) -> None:
+        if node.extra_properties is None:
+            node.extra_properties = {}
+        node.extra_properties.update(self.properties)
+        if self.updated_at:
+            node.updated_at = self.updated_at
+
+
+@dataclass
+class WriteBufferStats:
+    staged: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    # Acknowledged updates that were never written
+    dropped_updates: int = 0
+
+
+class WriteBuffer:
+    def __init__(self, window_ms: float = WRITE_BUFFER_WINDOW_MS):
+        """
+        Write-behind buffer that coalesces rapid property updates to the same node.
+
+        Updates staged within `window_ms` of the first pending update for a node are
+        merged and flushed as a single read-modify-write. Reads issued through
+        NodeStorage in this process see staged values immediately.
+
+        Updates were already acknowledged, so a failed flush is retried with
+        exponential backoff for as long as the failure can pass (e.g. storage is
+        unreachable). Only permanent failures (ValueError, e.g. the node was
+        deleted) and shutdown drop updates; those are counted in
+        stats.dropped_updates.
+
+        Args:
+            window_ms: Coalescing window in milliseconds; 0 disables buffering
+        """
+        self.window_ms = window_ms
+        self.stats = WriteBufferStats()
+        self._pending: Dict[BufferKey, PendingWrite] = {}
+        self._in_flight: Dict[BufferKey, PendingWrite] = {}
+        self._flushed: Dict[BufferKey, asyncio.Event] = {}
+        self._timers: Dict[BufferKey, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_ms > 0
+
+    def stage(
+        self,
+        storage: "NodeStorage",
+        node_id: str,
+        properties: Dict[str, Any],
+        updated_at: str,
+    ) -> None:
+        """Queue property updates for a node, scheduling a flush if none is pending."""
+        key = (storage.user_id, node_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingWrite(storage=storage)
+        pending.merge(properties, updated_at)
+        self.stats.staged += 1
+
+        if key not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(
+                self.window_ms / 1000, self._start_flush, key
+            )
+
+    def overlay(self, user_id: str, node: GraphNode) -> GraphNode:
+        """Apply any unflushed updates for this node in place (read-your-writes)."""
+        key = (user_id, node.node_id)
+        for source in (self._in_flight, self._pending):
+            pending = source.get(key)
+            if pending is not None:
+                pending.apply(node)
+        return node
+
+    def has_pending(self, user_id: Optional[str] = None, node_id: Optional[str] = None) -> bool:
+        """Whether any updates are unflushed, optionally only a user's or one of their nodes'."""
+        if user_id is None:
+            return bool(self._pending or self._in_flight)
+        if node_id is not None:
+            return (user_id, node_id) in self._pending or (user_id, node_id) in self._in_flight
+        return any(key[0] == user_id for source in (self._pending, self._in_flight) for key in source)
+
+    def _start_flush(self, key: BufferKey) -> None:
+        task = asyncio.get_running_loop().create_task(self.flush(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self, key: BufferKey) -> None:
+        """Write all pending updates for one node as a single store."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        # Wait for an earlier flush of the same node so writes land in order
+        while key in self._flushed:
+            await self._flushed[key].wait()
+
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self._in_flight[key] = pending
+        self._flushed[key] = asyncio.Event()
+
+        user_id, node_id = key
+        try:
+            await pending.storage.apply_pending_write(node_id, pending)
+            self.stats.flushes += 1
+            logger.info(
+                f"💾 Flushed {pending.updates} buffered update(s) for node {node_id} (user: {user_id})"
+            )
+        except ValueError as e:
+            self.stats.failed_flushes += 1
+            self._drop(key, pending, str(e))
+        except Exception as e:
+            self.stats.failed_flushes += 1
+            pending.attempts += 1
+            logger.error(f"❌ Failed to flush buffered updates for node {node_id}: {e}", exc_info=True)
+            self._requeue(key, pending)
+        finally:
+            self._in_flight.pop(key, None)
+            self._flushed.pop(key).set()
+
+    def _requeue(self, key: BufferKey, failed: PendingWrite) -> None:
+        newer = self._pending.get(key)
+        if newer is not None:
+            # Anything staged after the failed flush started wins
+            failed.properties.update(newer.properties)
+            failed.updated_at = newer.updated_at or failed.updated_at
+            failed.updates += newer.updates
+        self._pending[key] = failed
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[key] = asyncio.get_running_loop().call_later(
+            self._backoff(failed.attempts), self._start_flush, key
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.window_ms / 1000 * 2 ** attempts, WRITE_BUFFER_MAX_BACKOFF_SECONDS)
+
+    def _drop(self, key: BufferKey, pending: PendingWrite, reason: str) -> None:
+        self.stats.dropped_updates += pending.updates
+        logger.error(
+            f"❌ Dropped {pending.updates} acknowledged update(s) "
+            f"({', '.join(pending.changed_fields())}) for node {key[1]} (user: {key[0]}): {reason}"
+        )
+
+    async def flush_all(self) -> None:
+        """
+        Flush every pending update and wait for in-flight flushes. Called on
+        shutdown, so updates still failing after WRITE_BUFFER_SHUTDOWN_ATTEMPTS
+        rounds are dropped rather than retried.
+        """
+        for attempt in range(WRITE_BUFFER_SHUTDOWN_ATTEMPTS):
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            for key in list(self._pending):
+                await self.flush(key)
+            if not self._pending:
+                return
+            await asyncio.sleep(self._backoff(attempt))
+
+        for key in list(self._pending):
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            self._drop(key, self._pending.pop(key), "still failing at shutdown")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window_ms,
+            "pending": len(self._pending),
+            "staged": self.stats.staged,
+            "flushes": self.stats.flushes,
+            "failed_flushes": self.stats.failed_flushes,
+            "dropped_updates": self.stats.dropped_updates,
+        }
+
+
+# Shared by every NodeStorage in this process
+write_buffer = WriteBuffer()
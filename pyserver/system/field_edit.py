@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from pyserver.schemas.node_batch_update import FieldEdit
+from pyserver.schemas.type_properties import ExtraProperties, get_extra_properties_for_type
+from .graph_node import GraphNode
+from .node_changer import NodeChanger
+
+def validate_field_edit(
+    object_type: str, edit: FieldEdit, schema: Optional[ExtraProperties] = None
+) -> Any:
+    """
+    Check an edit against the type's schema (looked up unless given) and
+    return the value to store.
+
+    Raises:
+        ValueError: If the field doesn't exist for the type or the value doesn't fit it
+    """
+    if edit.kind == "caption":
+        if not isinstance(edit.value, str):
+            raise ValueError("Caption must be a string")
+        return edit.value
+
+    schema = schema or get_extra_properties_for_type(object_type)
+    if edit.kind == "checkbox":
+        if edit.field not in {q.key_name for q in schema.checkbox_questions}:
+            raise ValueError(f"Invalid checkbox key: {edit.field}")
+        if not isinstance(edit.value, bool):
+            raise ValueError(f"Checkbox '{edit.field}' needs a boolean")
+        return edit.value
+
+    if edit.kind == "radio":
+        radio_fields = {q.key_name: q for q in schema.radio_questions}
+        if edit.field not in radio_fields:
+            raise ValueError(f"Invalid radio field '{edit.field}' for type {object_type}")
+        valid_options = {opt.value for opt in radio_fields[edit.field].options}
+        if edit.value not in valid_options:
+            raise ValueError(f"Invalid value '{edit.value}' for field '{edit.field}'. Valid options: {valid_options}")
+        return edit.value
+
+    num_fields = {q.key_name: q for q in schema.number_questions}
+    if edit.field not in num_fields:
+        raise ValueError(f"Field '{edit.field}' is not a valid number field for type {object_type}")
+    if isinstance(edit.value, bool) or not isinstance(edit.value, (int, float)):
+        raise ValueError(f"Field '{edit.field}' needs a number")
+    question = num_fields[edit.field]
+    if not (question.min_value <= edit.value <= question.max_value):
+        raise ValueError(f"Value must be between {question.min_value} and {question.max_value}")
+    return edit.value
+
+
+class FieldEditChanger(NodeChanger):
+    def __init__(self, edits: List[Tuple[FieldEdit, Any]]):
+        """Applies already validated (edit, value) pairs to one node, in order."""
+        self.edits = edits
+
+    def changed_fields(self) -> List[str]:
+        fields = []
+        for edit, _ in self.edits:
+            field = "caption" if edit.kind == "caption" else f"extra_properties.{edit.field}"
+            if field not in fields:
+                fields.append(field)
+        return fields + ["updated_at"]
+
+    def change_node(self, mutable_node: GraphNode) -> List[dict]:
+        updates = []
+        for edit, value in self.edits:
+            if edit.kind == "caption":
+                mutable_node.caption = value
+                updates.append({"caption": value})
+            else:
+                if mutable_node.extra_properties is None:
+                    mutable_node.extra_properties = {}
+                mutable_node.extra_properties[edit.field] = value
+                updates.append({edit.field: value})
+        mutable_node.updated_at = datetime.utcnow().isoformat()
+        return updates
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+SCORERS: Dict[str, Callable[..., float]] = {
+    "partial_ratio": fuzz.partial_ratio,
+    "token_set_ratio": fuzz.token_set_ratio,
+    "WRatio": fuzz.WRatio,
+}
+
+DEFAULT_SCORER = os.environ.get("URLIFE_SEARCH_SCORER", "partial_ratio")
+# Candidate sets at least this large are scored on a worker thread
+OFFLOAD_THRESHOLD = int(os.environ.get("URLIFE_SEARCH_OFFLOAD_THRESHOLD", 2000))
+
+
+def rank_captions(
+    query: str,
+    captions: Sequence[str],
+    limit: int,
+    scorer: str = DEFAULT_SCORER,
+    score_cutoff: int = 0,
+) -> List[Tuple[int, int]]:
+    """
+    Score every caption against the query in one batch and return the best
+    `limit` as (position in `captions`, score), highest score first.
+
+    Comparison is case-insensitive. Ties keep the order of `captions`.
+    """
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer: {scorer!r}")
+    if not captions or limit <= 0:
+        return []
+
+    # One native call across all cores; below-cutoff scores come back as 0
+    scores = process.cdist(
+        [query.lower()],
+        [caption.lower() for caption in captions],
+        scorer=SCORERS[scorer],
+        score_cutoff=score_cutoff,
+        dtype=np.uint8,
+        workers=-1,
+    )[0]
+
+    # Top-k selection instead of a full sort
+    if limit < len(scores):
+        top = np.argpartition(-scores.astype(np.int16), limit - 1)[:limit]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.lexsort((top, -scores[top].astype(np.int16)))]
+
+    return [
+        (int(i), int(scores[i]))
+        for i in top
+        if score_cutoff <= 0 or scores[i] >= score_cutoff
+    ]
+
+
+async def rank_captions_async(
+    query: str,
+    captions: Sequence[str],
+    limit: int,
+    scorer: str = DEFAULT_SCORER,
+    score_cutoff: int = 0,
+) -> List[Tuple[int, int]]:
+    """`rank_captions`, off the event loop once the candidate set is large."""
+    if len(captions) < OFFLOAD_THRESHOLD:
+        return rank_captions(query, captions, limit, scorer, score_cutoff)
+    logger.debug(f"🧵 Ranking {len(captions)} captions on a worker thread")
+    return await asyncio.to_thread(rank_captions, query, captions, limit, scorer, score_cutoff)
@@ -24,6 +24,7 @@ class GraphNode(BaseModel):
     parent: Optional[ParentRef] = None
     creation_time: Optional[int] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,30 +1,36 @@
-from redis.asyncio import Redis
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    from pyserver.storage.backend.protocol import StorageBackend
+
 logger = logging.getLogger(__name__)
 
 class RedisManager:
     def __init__(self):
-        self.client: Optional[Redis] = None
+        self.client: Optional["StorageBackend"] = None
 
     async def connect(self):
-        """Create Redis connection."""
+        """Create the backend connection (Redis unless URLIFE_STORAGE_BACKEND says otherwise)."""
+        # Imported here: the storage package imports this module
+        from pyserver.storage.backend import create_backend
+
         if not self.client:
-            self.client = Redis(
-                host='localhost',
-                port=6379,
-                db=0,
-                decode_responses=True  # Automatically returns str instead of bytes
-            )
+            self.client = create_backend()
 
     async def close(self):
-        """Close Redis connection."""
+        """Close the backend connection."""
         if self.client:
             await self.client.close()
 
-    async def get_connection(self) -> Redis:
-        """Get Redis connection."""
+    async def get_connection(self) -> "StorageBackend":
+        """Get the backend connection."""
+        from pyserver.storage.backend import shared_backend
+
+        # An in-process engine swapped in after connecting (e.g. by tests) wins
+        shared = shared_backend()
+        if shared is not None:
+            return shared
         if not self.client:
             await self.connect()
         return self.client
@@ -32,54 +38,54 @@ class RedisManager:
 
 # Hash operations
 
-async def map_insert(conn: Redis, key: str, field: str, value: str) -> None:
+async def map_insert(conn: "StorageBackend", key: str, field: str, value: str) -> None:
     """Insert a value into a hash map."""
     await conn.hset(key, field, value)
 
-async def map_get(conn: Redis, key: str, field: str) -> Optional[str]:
+async def map_get(conn: "StorageBackend", key: str, field: str) -> Optional[str]:
     """Get a value from a hash map."""
     return await conn.hget(key, field)
 
-async def map_delete(conn: Redis, key: str, field: str) -> None:
+async def map_delete(conn: "StorageBackend", key: str, field: str) -> None:
     """Delete a field from a hash map."""
     await conn.hdel(key, field)
 
-async def map_get_all_values(conn: Redis, key: str) -> List[str]:
+async def map_get_all_values(conn: "StorageBackend", key: str) -> List[str]:
     """Get all values from a Redis hash map."""
     return await conn.hvals(key)
 
 
 # Set operations
 
-async def set_add(conn: Redis, key: str, member: str) -> bool:
+async def set_add(conn: "StorageBackend", key: str, member: str) -> bool:
     """Add a member to a set."""
     logger.debug(f"set_add: key[{key}], member[{member}]")
     return await conn.sadd(key, member)
 
-async def set_delete(conn: Redis, key: str, member: str) -> bool:
+async def set_delete(conn: "StorageBackend", key: str, member: str) -> bool:
     """Remove a member from a set."""
     logger.debug(f"set_delete: key[{key}], member[{member}]")
     return await conn.srem(key, member)
 
-async def set_members(conn: Redis, key: str) -> List[str]:
+async def set_members(conn: "StorageBackend", key: str) -> List[str]:
     """Get all members of a set."""
     return await conn.smembers(key)
 
-async def set_is_member(conn: Redis, key: str, member: str) -> bool:
+async def set_is_member(conn: "StorageBackend", key: str, member: str) -> bool:
     """Check if a member exists in a set."""
     return await conn.sismember(key, member)
 
 
 # List operations
 
-async def seq_push(conn: Redis, key: str, value: str) -> int:
+async def seq_push(conn: "StorageBackend", key: str, value: str) -> int:
     """Push a value to the end of a list."""
     return await conn.rpush(key, value)
 
-async def seq_pop(conn: Redis, key: str) -> Optional[str]:
+async def seq_pop(conn: "StorageBackend", key: str) -> Optional[str]:
     """Pop a value from the start of a list."""
     return await conn.lpop(key)
 
-async def seq_get_all(conn: Redis, key: str) -> List[str]:
+async def seq_get_all(conn: "StorageBackend", key: str) -> List[str]:
     """Get all elements from a list."""
     return await conn.lrange(key, 0, -1)
@@ -0,0 +1,18 @@
+from starlette.requests import Request
+from pyserver.api.conditional import is_not_modified, node_etag, projected_etag
+
+def _request(if_none_match: str) -> Request:
+    return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+def test_projections_get_their_own_tags():
+    full = node_etag(3, "{}")
+    captions = projected_etag(full, frozenset({"node_id", "caption"}))
+
+    assert projected_etag(full, None) == full
+    assert captions.startswith('"v3;f=') and captions.endswith('"')
+    assert captions == projected_etag(full, {"caption", "node_id"})
+    assert captions != projected_etag(full, frozenset({"node_id", "children"}))
+
+    # A body cached for one projection doesn't validate another
+    assert not is_not_modified(_request(full), captions)
+    assert is_not_modified(_request(f'W/{captions}'), captions)
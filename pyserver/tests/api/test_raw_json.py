@@ -0,0 +1,16 @@
+from fastapi import FastAPI
+from pyserver.api.folders import router as folders_router
+
+def test_folder_listings_document_the_stored_shape():
+    app = FastAPI()
+    app.include_router(folders_router)
+    paths = app.openapi()["paths"]
+
+    for path in ("/folder/list_direct/{folder_id}", "/folder/list_recursive/{folder_id}"):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        node = schema["items"]
+        assert schema["type"] == "array"
+        assert "object_type" in node["properties"] and "node_type" not in node["properties"]
+        # Nested models are inlined, so nothing points into a missing $defs
+        assert "$ref" not in str(node)
+        assert node["properties"]["parent"]["anyOf"][0]["properties"]["parent_id"]
@@ -0,0 +1,27 @@
+import pytest
+from rapidfuzz import fuzz
+from pyserver.system.fuzzy_rank import rank_captions, rank_captions_async
+
+CAPTIONS = ["Buy groceries", "Book flights", "grocery list", "Walk the dog"]
+
+def test_matches_scalar_scorer_and_keeps_top_k():
+    ranked = rank_captions("GROCER", CAPTIONS, limit=2)
+    expected = sorted(
+        ((i, int(fuzz.partial_ratio("grocer", c.lower()))) for i, c in enumerate(CAPTIONS)),
+        key=lambda item: -item[1],
+    )[:2]
+    assert ranked == expected
+    assert {CAPTIONS[i] for i, _ in ranked} == {"Buy groceries", "grocery list"}
+
+def test_cutoff_and_scorer_choice():
+    ranked = rank_captions("walk dog", CAPTIONS, limit=10, scorer="token_set_ratio", score_cutoff=80)
+    assert [CAPTIONS[i] for i, _ in ranked] == ["Walk the dog"]
+    with pytest.raises(ValueError):
+        rank_captions("x", CAPTIONS, limit=1, scorer="nope")
+
+@pytest.mark.asyncio
+async def test_large_sets_rank_off_loop():
+    captions = [f"caption {i}" for i in range(5000)] + ["needle in haystack"]
+    ranked = await rank_captions_async("needle", captions, limit=3)
+    assert ranked[0] == (5000, 100)
+    assert len(ranked) == 3